@@ -0,0 +1,12 @@
+# Benchmarks for the SafeHome code base.
+#
+# Run a suite from the repository root, for example:
+#   python -m bench.storage_bench --sizes 10 100 1000 --output storage.json
+#   python -m bench.camera_bench --cameras 1 4 16 --output camera.json
+import os
+import sys
+
+# Mirror pytest.ini's pythonpath so the benchmarks import the same modules
+_SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
@@ -0,0 +1,243 @@
+"""Camera rendering benchmark.
+
+Renders camera frames through the three layers the GUI uses, for every
+combination of camera count, output size and resample quality:
+
+    view            DeviceCamera.get_view, one new frame per op, round
+                    robin over the cameras
+    thumbnail       SafeHomeCamera.display_thumbnail, one new frame per op
+    thumbnail_wall  CameraController.get_thumbnail_views after every
+                    camera got a new frame (one op renders all cameras)
+    wall_cached     the same without new frames, i.e. the cache hit path
+    pan_zoom_sweep  DeviceCamera.get_view while stepping one camera
+                    through every pan/zoom position
+
+Thumbnail scenarios always render at THUMBNAIL_SIZE. Each case starts
+from empty process-wide caches and one untimed warm-up pass, so results
+do not depend on which cases ran before. Every result has
+frames per second, latency percentiles and peak memory: peak_py_kib is
+the tracemalloc peak of a second, traced pass (Python objects only, not
+pixel buffers) and maxrss_kib the process high-water mark after the
+case. Results are printed as a table and can be saved as JSON and
+compared against a previous run.
+
+    python -m bench.camera_bench --cameras 1 4 16 --output camera.json
+    python -m bench.camera_bench --compare camera.json
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import tracemalloc
+from contextlib import ExitStack
+from typing import Callable
+
+from bench.common import compare_results, load_results, print_table, save_results, time_ops
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.safehome_camera import SafeHomeCamera
+from core.surveillance.thumbnail_cache import THUMBNAIL_SIZE
+from device.device_camera import DeviceCamera, RESAMPLE, _overlay_tile
+from device.source_cache import get_source_cache
+from storage.camera_storage_memory import CameraMemoryDB
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CAMERAS = (1, 4, 16)
+DEFAULT_SIZES = (DeviceCamera.RETURN_SIZE, THUMBNAIL_SIZE)
+DEFAULT_FRAMES = 50
+SCENARIOS = ("view", "thumbnail", "thumbnail_wall", "wall_cached", "pan_zoom_sweep")
+RESULT_FIELDS = ("scenario", "cameras", "size", "quality")
+# Source images shipped in src/img; cameras reuse them round robin
+SOURCE_IDS = (1, 2, 3)
+
+Op = Callable[[], object]
+
+
+def _new_camera(index: int) -> SafeHomeCamera:
+    hardware = DeviceCamera()
+    # Frames only change when the benchmark says so
+    hardware.stop()
+    # SafeHomeCamera loads the source of its id, so create it with a
+    # shipped one and renumber it afterwards
+    camera = SafeHomeCamera(camera_id=SOURCE_IDS[index % len(SOURCE_IDS)],
+                            location=(index, index), hardware_camera=hardware,
+                            has_password=False, enabled=True)
+    camera.camera_id = index + 1
+    return camera
+
+
+def _move_to(camera: DeviceCamera, pan: int, zoom: int) -> None:
+    while camera.pan < pan and camera.pan_right():
+        pass
+    while camera.pan > pan and camera.pan_left():
+        pass
+    while camera.zoom < zoom and camera.zoom_in():
+        pass
+    while camera.zoom > zoom and camera.zoom_out():
+        pass
+
+
+def _view_ops(stack, cameras, size, quality, frames):
+    def op(camera):
+        camera._tick()
+        camera.get_view(size, quality)
+    return [lambda c=cameras[i % len(cameras)].hardware_camera: op(c) for i in range(frames)]
+
+
+def _thumbnail_ops(stack, cameras, size, quality, frames):
+    def op(camera):
+        camera.hardware_camera._tick()
+        camera.display_thumbnail(quality)
+    return [lambda c=cameras[i % len(cameras)]: op(c) for i in range(frames)]
+
+
+def _wall(stack, cameras, quality) -> CameraController:
+    # The controller is closed, with its render workers, when the case ends
+    db = CameraMemoryDB()
+    for camera in cameras:
+        db.create_camera(camera)
+    controller = stack.enter_context(CameraController(db))
+    # The controller starts its cameras; frames only change when the
+    # benchmark says so
+    for camera in cameras:
+        camera.stop()
+    controller.set_thumbnail_quality(quality)
+    # Measure the requested quality, not what the load would degrade it to
+    controller.set_adaptive_quality(False)
+    return controller
+
+
+def _thumbnail_wall_ops(stack, cameras, size, quality, frames):
+    controller = _wall(stack, cameras, quality)
+
+    def op():
+        for camera in cameras:
+            camera.hardware_camera._tick()
+        controller.get_thumbnail_views()
+    return [op for _ in range(frames)]
+
+
+def _wall_cached_ops(stack, cameras, size, quality, frames):
+    controller = _wall(stack, cameras, quality)
+    controller.get_thumbnail_views()
+    return [controller.get_thumbnail_views for _ in range(frames)]
+
+
+def _sweep_ops(stack, cameras, size, quality, frames):
+    camera = cameras[0].hardware_camera
+    positions = itertools.cycle(itertools.product(DeviceCamera.ZOOM_RANGE, DeviceCamera.PAN_RANGE))
+
+    def op(zoom, pan):
+        _move_to(camera, pan, zoom)
+        camera.get_view(size, quality)
+    return [lambda p=next(positions): op(*p) for _ in range(frames)]
+
+
+# scenario -> (builds the ops, frames rendered per op, renders at thumbnail size)
+BUILDERS = {
+    "view": (_view_ops, lambda n: 1, False),
+    "thumbnail": (_thumbnail_ops, lambda n: 1, True),
+    "thumbnail_wall": (_thumbnail_wall_ops, lambda n: n, True),
+    "wall_cached": (_wall_cached_ops, lambda n: n, True),
+    "pan_zoom_sweep": (_sweep_ops, lambda n: 1, False),
+}
+
+
+def _maxrss_kib() -> int:
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _reset_caches() -> None:
+    # Process-wide caches would otherwise carry decoded sources and drawn
+    # overlays from one case into the next
+    get_source_cache().clear()
+    _overlay_tile.cache_clear()
+
+
+def run_case(scenario: str, count: int, size: int, quality: str, frames: int) -> dict:
+    build, frames_per_op, _ = BUILDERS[scenario]
+    _reset_caches()
+    cameras = [_new_camera(i) for i in range(count)]
+    try:
+        with ExitStack() as stack:
+            # Untimed warm-up: every case is timed from the same state, with
+            # its own sources decoded and overlays drawn, whatever ran before it
+            for op in build(stack, cameras, size, quality, count):
+                op()
+            result = time_ops(build(stack, cameras, size, quality, frames))
+            # Second pass for memory, tracing would distort the timings
+            ops = build(stack, cameras, size, quality, frames)
+            tracemalloc.start()
+            try:
+                for op in ops:
+                    op()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        for camera in cameras:
+            camera.stop()
+    return {"scenario": scenario, "cameras": count, "size": size, "quality": quality,
+            **result, "fps": result["ops_per_s"] * frames_per_op(count),
+            "peak_py_kib": peak // 1024, "maxrss_kib": _maxrss_kib()}
+
+
+def run(scenarios: list[str], counts: list[int], sizes: list[int], qualities: list[str],
+        frames: int) -> list[dict]:
+    results = []
+    for scenario in scenarios:
+        thumbnail_only = BUILDERS[scenario][2]
+        for count in counts:
+            for size in ([THUMBNAIL_SIZE] if thumbnail_only else sizes):
+                for quality in qualities:
+                    results.append(run_case(scenario, count, size, quality, frames))
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark camera view and thumbnail rendering")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--cameras", nargs="+", type=int, default=list(DEFAULT_CAMERAS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--qualities", nargs="+", choices=sorted(RESAMPLE), default=sorted(RESAMPLE))
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="Timed operations per case (default: %(default)s).")
+    parser.add_argument("--output", metavar="PATH", help="Save the results as JSON.")
+    parser.add_argument("--compare", metavar="PATH", help="Report regressions against a saved run.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown before a result counts as a regression (default: 0.2).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run(args.scenarios, args.cameras, args.sizes, args.qualities, args.frames)
+
+    print_table(results, ["scenario", "cameras", "size", "quality", "fps", "p50_ms", "p99_ms",
+                          "peak_py_kib", "maxrss_kib"])
+
+    if args.output:
+        save_results(args.output, "camera", results)
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, RESULT_FIELDS,
+                                      tolerance=args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['scenario']}/{r['cameras']}/{r['size']}/{r['quality']}: "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ms ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Iterable
+
+# Whether a larger value of a metric is an improvement. Latencies, times
+# and memory are better when smaller, which is also assumed for metrics
+# not listed here.
+HIGHER_IS_BETTER = {
+    "ops_per_s": True,
+    "fps": True,
+    "total_s": False,
+    "p50_ms": False,
+    "p90_ms": False,
+    "p99_ms": False,
+    "max_ms": False,
+    "peak_py_kib": False,
+    "maxrss_kib": False,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict:
+    # Turn a list of per-operation latencies (seconds) into a result record
+    ordered = sorted(latencies)
+    total = elapsed if elapsed is not None else sum(ordered)
+    return {
+        "ops": len(ordered),
+        "total_s": total,
+        "ops_per_s": len(ordered) / total if total > 0 else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p90_ms": percentile(ordered, 90) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+def time_ops(operations: Iterable[Callable[[], object]]) -> dict:
+    # Run every operation once and summarize their latencies
+    latencies = []
+    start = time.perf_counter()
+    for op in operations:
+        op_start = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - op_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def environment() -> dict:
+    return {
+        "date_time": datetime.now().isoformat(" "),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def save_results(path: str, suite: str, results: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"suite": suite, "environment": environment(), "results": results}, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def result_key(result: dict, fields: tuple[str, ...]) -> tuple:
+    return tuple(result[f] for f in fields)
+
+
+def compare_results(baseline: dict, current: list[dict], fields: tuple[str, ...],
+                    metric: str = "p50_ms", tolerance: float = 0.2) -> list[dict]:
+    """
+    Compare current results with a saved baseline.
+
+    Returns one entry per matching result whose metric got worse by more
+    than tolerance (0.2 means 20 %); ratio is how many times worse it got,
+    taking the metric's direction from HIGHER_IS_BETTER into account.
+    """
+    higher_is_better = HIGHER_IS_BETTER.get(metric, False)
+    previous = {result_key(r, fields): r for r in baseline["results"]}
+    regressions = []
+    for result in current:
+        old = previous.get(result_key(result, fields))
+        if old is None or old[metric] <= 0:
+            continue
+        if higher_is_better:
+            ratio = old[metric] / result[metric] if result[metric] > 0 else float("inf")
+        else:
+            ratio = result[metric] / old[metric]
+        if ratio > 1 + tolerance:
+            regressions.append({**{f: result[f] for f in fields},
+                                "metric": metric, "baseline": old[metric],
+                                "current": result[metric], "ratio": ratio})
+    return regressions
+
+
+def print_table(results: list[dict], columns: list[str]) -> None:
+    widths = [max(len(c), *(len(_fmt(r[c])) for r in results)) for c in columns] if results else []
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in results:
+        print("  ".join(_fmt(r[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
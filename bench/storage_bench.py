@@ -0,0 +1,345 @@
+"""Cross-backend storage benchmark.
+
+Drives every storage interface (cameras, logs, security, passwords and
+settings) with the same synthetic workloads against its memory and sqlite
+implementations, at growing sizes:
+
+    bulk_load     insert ``size`` new records
+    point_update  ``size`` single-record updates
+    full_scan     ``SCANS`` reads of the whole collection
+    mixed         ``size`` operations, MIXED_READS reads / the rest writes
+                  (LOG_MIXED_READS for logs, whose only read is a listing)
+
+Phases run in that order on the same fresh storage, so scans and updates
+see the records created by the bulk load. Results are printed as a table
+and can be saved as JSON and compared against a previous run.
+
+    python -m bench.storage_bench --sizes 10 100 1000 --output storage.json
+    python -m bench.storage_bench --compare storage.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from bench.common import compare_results, load_results, print_table, save_results, time_ops
+
+from core.log.log import Log
+from core.security.security_memory_database import SecurityMemoryDatabase
+from core.security.security_zone import SecurityZone
+from core.security.security_zone_geometry.area import Square
+from core.setting.setting_cache import ControlPanelSettingsCache, SystemSettingsCache
+from core.setting.system_setting import SystemSettings
+from core.surveillance.safehome_camera import SafeHomeCamera
+from device.device_camera import set_file_error_handler
+from storage.camera_storage_memory import CameraMemoryDB
+from storage.camera_storage_sqlite import CameraSqliteDB
+from storage.control_panel_setting_storage_memory import ControlPanelSettingsMemoryDB
+from storage.control_panel_setting_storage_sqlite import ControlPanelSettingsSqliteDB
+from storage.log_storage_memory import LogMemoryDB
+from storage.log_storage_sqlite import LogSqliteDB
+from storage.password_storage_memory import PasswordMemoryDB
+from storage.password_storage_sqlite import PasswordSqliteDB
+from storage.security_storage_sqlite import SecuritySqliteDB
+from storage.storage_sqlite import StorageManager
+from storage.system_setting_storage_memory import SystemSettingsMemoryDB
+from storage.system_setting_storage_sqlite import SystemSettingsSqliteDB
+
+INIT_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "init.sql")
+
+DEFAULT_SIZES = (10, 100, 1000)
+PHASES = ("bulk_load", "point_update", "full_scan", "mixed")
+SCANS = 10
+MIXED_READS = 0.8
+# Log reads are full listings, so the log mix reads far less often
+LOG_MIXED_READS = 0.1
+RESULT_FIELDS = ("interface", "backend", "size", "phase")
+
+# First camera id used by the bulk load, past the ids seeded by init.sql
+CAMERA_BASE_ID = 100
+
+Op = Callable[[], object]
+Phase = Callable[[object, int, random.Random], list[Op]]
+
+
+@dataclass
+class Target:
+    interface: str
+    backends: dict[str, Callable[[StorageManager], object]]
+    phases: dict[str, Phase]
+
+
+# ------------------------------------------------------------------ cameras
+class _StubHardware:
+    # Hardware stand-in for cameras that are only created to be stored
+    def set_id(self, id_):
+        pass
+
+    def stop(self):
+        pass
+
+
+def _new_camera(camera_id: int, rng: random.Random) -> SafeHomeCamera:
+    return SafeHomeCamera(
+        camera_id=camera_id,
+        location=(rng.randint(0, 500), rng.randint(0, 300)),
+        hardware_camera=_StubHardware(),
+        has_password=False,
+        enabled=True,
+    )
+
+
+def _scan_cameras(db) -> None:
+    # Backends hand out cameras with running DeviceCamera threads
+    for camera in db.get_all_cameras():
+        camera.stop()
+
+
+def _camera_bulk_load(db, size, rng):
+    return [lambda i=i: db.create_camera(_new_camera(CAMERA_BASE_ID + i, rng)) for i in range(size)]
+
+
+def _camera_point_update(db, size, rng):
+    cameras = [_new_camera(CAMERA_BASE_ID + rng.randrange(size), rng) for _ in range(size)]
+    return [lambda c=c: db.update_camera(c) for c in cameras]
+
+
+def _camera_full_scan(db, size, rng):
+    return [lambda: _scan_cameras(db) for _ in range(SCANS)]
+
+
+def _camera_mixed(db, size, rng):
+    ops = []
+    for _ in range(size):
+        camera_id = CAMERA_BASE_ID + rng.randrange(size)
+        if rng.random() < MIXED_READS:
+            ops.append(lambda cid=camera_id: _stop(db.get_camera_by_id(cid)))
+        else:
+            ops.append(lambda c=_new_camera(camera_id, rng): db.update_camera(c))
+    return ops
+
+
+def _stop(camera) -> None:
+    if camera is not None:
+        camera.stop()
+
+
+# --------------------------------------------------------------------- logs
+def _new_log(i: int) -> Log:
+    log = Log()
+    log.date_time = datetime.now()
+    log.description = f"[{i}]"
+    return log
+
+
+def _log_bulk_load(db, size, rng):
+    return [lambda i=i: db.save_log(_new_log(i)) for i in range(size)]
+
+
+def _log_full_scan(db, size, rng):
+    return [db.get_log_list for _ in range(SCANS)]
+
+
+def _log_mixed(db, size, rng):
+    return [db.get_log_list if rng.random() < LOG_MIXED_READS else (lambda i=i: db.save_log(_new_log(i)))
+            for i in range(size)]
+
+
+# ----------------------------------------------------------------- security
+def _new_zone(rng: random.Random) -> SecurityZone:
+    x, y = rng.randint(0, 450), rng.randint(0, 250)
+    return SecurityZone(Square(y, y + 50, x, x + 50), [])
+
+
+def _security_bulk_load(db, size, rng):
+    return [lambda: db.add_security_zone(_new_zone(rng)) for _ in range(size)]
+
+
+def _security_point_update(db, size, rng):
+    sensors = list(db.get_sensors().items())
+    ops = []
+    for _ in range(size):
+        sensor, (on, _) = rng.choice(sensors)
+        ops.append(lambda s=sensor, on=on, arm=rng.choice((True, False, None)): db.update_sensor(s, (on, arm)))
+    return ops
+
+
+def _security_full_scan(db, size, rng):
+    return [lambda: (db.get_sensors(), db.get_security_zones(), db.get_security_modes()) for _ in range(SCANS)]
+
+
+def _security_mixed(db, size, rng):
+    sensors = list(db.get_sensors().keys())
+    ops = []
+    for _ in range(size):
+        if rng.random() < MIXED_READS:
+            ops.append(db.get_now_security_mode)
+        else:
+            ops.append(lambda s=rng.choice(sensors), on=rng.choice((True, False)): db.turn_onoff_sensor(s, on))
+    return ops
+
+
+# ---------------------------------------------------------------- passwords
+def _password_bulk_load(db, size, rng):
+    # The sqlite backend only updates existing users, so this mostly
+    # measures the cost of a write that matches no row there.
+    return [lambda i=i: db.set_password(f"user{i}", str(i)) for i in range(size)]
+
+
+def _password_point_update(db, size, rng):
+    return [lambda i=i: db.set_password("admin", str(i)) for i in range(size)]
+
+
+def _password_mixed(db, size, rng):
+    return [(lambda: db.get_password("admin")) if rng.random() < MIXED_READS
+            else (lambda i=i: db.set_password("admin", str(i))) for i in range(size)]
+
+
+# ----------------------------------------------------------------- settings
+class _Settings:
+    # System settings and control panel passwords benchmarked as one unit
+    def __init__(self, system_settings_db, control_panel_db):
+        self.system_settings_db = system_settings_db
+        self.control_panel_db = control_panel_db
+
+
+def _new_settings(i: int) -> SystemSettings:
+    settings = SystemSettings()
+    settings.panic_phone_number = str(i)
+    return settings
+
+
+def _settings_point_update(db, size, rng):
+    return [lambda i=i: db.system_settings_db.update_system_settings(_new_settings(i)) for i in range(size)]
+
+
+def _settings_full_scan(db, size, rng):
+    return [db.system_settings_db.get_system_settings for _ in range(SCANS)]
+
+
+def _settings_mixed(db, size, rng):
+    ops = []
+    for i in range(size):
+        if rng.random() < MIXED_READS:
+            ops.append(rng.choice((db.control_panel_db.get_master_password,
+                                   db.system_settings_db.get_system_settings)))
+        else:
+            ops.append(lambda i=i: db.control_panel_db.set_master_password(str(i)))
+    return ops
+
+
+TARGETS = {
+    "camera": Target(
+        "camera",
+        {"memory": lambda sm: CameraMemoryDB(), "sqlite": CameraSqliteDB},
+        {"bulk_load": _camera_bulk_load, "point_update": _camera_point_update,
+         "full_scan": _camera_full_scan, "mixed": _camera_mixed},
+    ),
+    "log": Target(
+        "log",
+        {"memory": lambda sm: LogMemoryDB(), "sqlite": LogSqliteDB},
+        {"bulk_load": _log_bulk_load, "full_scan": _log_full_scan, "mixed": _log_mixed},
+    ),
+    "security": Target(
+        "security",
+        {"memory": lambda sm: SecurityMemoryDatabase(), "sqlite": SecuritySqliteDB},
+        {"bulk_load": _security_bulk_load, "point_update": _security_point_update,
+         "full_scan": _security_full_scan, "mixed": _security_mixed},
+    ),
+    "password": Target(
+        "password",
+        {"memory": lambda sm: PasswordMemoryDB(), "sqlite": PasswordSqliteDB},
+        {"bulk_load": _password_bulk_load, "point_update": _password_point_update, "mixed": _password_mixed},
+    ),
+    "settings": Target(
+        "settings",
+        {
+            "memory": lambda sm: _Settings(SystemSettingsMemoryDB(), ControlPanelSettingsMemoryDB()),
+            "sqlite": lambda sm: _Settings(SystemSettingsSqliteDB(sm), ControlPanelSettingsSqliteDB(sm)),
+            "sqlite+cache": lambda sm: _Settings(SystemSettingsCache(SystemSettingsSqliteDB(sm)),
+                                                 ControlPanelSettingsCache(ControlPanelSettingsSqliteDB(sm))),
+        },
+        {"point_update": _settings_point_update, "full_scan": _settings_full_scan, "mixed": _settings_mixed},
+    ),
+}
+
+
+@contextlib.contextmanager
+def _quiet_cameras():
+    # Cameras past the seeded ids have no source image. DeviceCamera reports
+    # that through a message box, which does not belong in a benchmark run,
+    # so it is silenced while a target runs.
+    previous = set_file_error_handler(lambda file_name: None)
+    try:
+        yield
+    finally:
+        set_file_error_handler(previous)
+
+
+def run_target(target: Target, backend: str, size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_manager = StorageManager(INIT_SCRIPT, os.path.join(tmp, "bench.db"))
+        db = target.backends[backend](storage_manager)
+        with _quiet_cameras():
+            for phase in PHASES:
+                if phase not in target.phases:
+                    continue
+                ops = target.phases[phase](db, size, rng)
+                results.append({"interface": target.interface, "backend": backend, "size": size,
+                                "phase": phase, **time_ops(ops)})
+    return results
+
+
+def run(interfaces: list[str], sizes: list[int], seed: int = 0) -> list[dict]:
+    results = []
+    for name in interfaces:
+        target = TARGETS[name]
+        for size in sizes:
+            for backend in target.backends:
+                results.extend(run_target(target, backend, size, seed))
+    return results
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the memory and sqlite storage backends")
+    parser.add_argument("--interfaces", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", metavar="PATH", help="Save the results as JSON.")
+    parser.add_argument("--compare", metavar="PATH", help="Report regressions against a saved run.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown before a result counts as a regression (default: 0.2).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run(args.interfaces, args.sizes, args.seed)
+
+    print_table(results, ["interface", "backend", "size", "phase", "ops", "ops_per_s", "p50_ms", "p99_ms"])
+
+    if args.output:
+        save_results(args.output, "storage", results)
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, RESULT_FIELDS,
+                                      tolerance=args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['interface']}/{r['backend']}/{r['size']}/{r['phase']}: "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ms ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -194,3 +194,66 @@ def test_back_to_floorplan_navigates(camera_view_page, mock_controller):
     
     # Should call show_frame (exact frame depends on import)
     assert mock_controller.show_frame.called or True  # Will be called in actual GUI
+
+
+# ============================================================
+# Frame Handoff Tests
+# ============================================================
+
+def test_on_frame_queues_view_sized_frame(camera_view_page):
+    """Test frames from the stream are resized before reaching the Tk loop."""
+    camera_view_page.camera_id = 1
+    camera_view_page._on_frame(Mock(camera_id=1, version=1, image=Image.new('L', (500, 500))))
+
+    camera_id, version, img = camera_view_page._frames.get_nowait()
+
+    assert (camera_id, version) == (1, 1)
+    assert img.size == (400, 300)
+    assert img.mode == 'RGB'
+
+
+def test_on_frame_keeps_only_newest_frame(camera_view_page):
+    """Test an unshown frame is replaced by a newer one."""
+    for version in (1, 2):
+        camera_view_page._on_frame(Mock(camera_id=1, version=version,
+                                        image=Image.new('RGB', (500, 500))))
+
+    assert camera_view_page._frames.get_nowait()[1] == 2
+    assert camera_view_page._frames.empty()
+
+
+def test_update_view_reuses_photo_image(camera_view_page):
+    """Test new frames are pasted into the existing PhotoImage."""
+    camera_view_page.camera_id = 1
+    photo = camera_view_page.photo
+    camera_view_page._on_frame(Mock(camera_id=1, version=1, image=Image.new('RGB', (500, 500))))
+
+    camera_view_page._update_view_internal()
+    camera_view_page.stop_updates()
+
+    assert camera_view_page.photo is photo
+    assert camera_view_page._shown == (1, 1)
+
+
+def test_update_view_skips_frames_of_other_camera(camera_view_page):
+    """Test a late frame of the previous camera is not shown."""
+    camera_view_page.camera_id = 2
+    camera_view_page._on_frame(Mock(camera_id=1, version=1, image=Image.new('RGB', (500, 500))))
+
+    camera_view_page._update_view_internal()
+    camera_view_page.stop_updates()
+
+    assert camera_view_page._shown is None
+
+
+@patch('gui.gui_cameraview.system')
+def test_stop_updates_closes_stream(mock_system, camera_view_page):
+    """Test stop_updates closes the camera's frame stream."""
+    stream = mock_system.current_camera_controller.subscribe.return_value
+    mock_system.current_camera_controller.get_single_view.return_value = Image.new('RGB', (500, 500))
+
+    camera_view_page.load_camera(1)
+    camera_view_page.stop_updates()
+
+    stream.close.assert_called_once()
+    assert camera_view_page._stream is None
@@ -311,3 +311,54 @@ def test_view_opens_camera_view(mock_system, floorplan_page, mock_controller):
     floorplan_page.view()
     
     mock_controller.open_camera_view.assert_called_once_with(1)
+
+
+# ============================================================
+# update_camera_colors Tests
+# ============================================================
+
+def real_controller(*locations):
+    from core.surveillance.camera_controller import CameraController
+    from storage.camera_storage_memory import CameraMemoryDB
+
+    ctrl = CameraController(CameraMemoryDB())
+    for i, location in enumerate(locations, start=1):
+        ctrl.add_camera(camera_id=i, location=location)
+    return ctrl
+
+
+@patch('gui.gui_surveillance.system')
+def test_update_camera_colors_applies_changes(mock_system, tk_root, mock_controller):
+    """Test only changed cameras are redrawn, and new ones are added."""
+    ctrl = real_controller((50, 50), (100, 100))
+    mock_system.current_camera_controller = ctrl
+    page = FloorPlanPage(tk_root, mock_controller)
+    page.update_camera_colors()
+    assert sorted(page.camera_icons.values()) == [1, 2]
+
+    ctrl.delete_camera(1)
+    ctrl.add_camera(camera_id=3, location=(150, 150))
+    page.update_camera_colors()
+
+    assert sorted(page.camera_icons.values()) == [2, 3]
+    assert page.camera_version == ctrl.camera_version
+
+
+@patch('gui.gui_surveillance.system')
+def test_update_camera_colors_rebuilds_after_controller_reset(mock_system, tk_root,
+                                                              mock_controller):
+    """Test icons are rebuilt when the controller is replaced."""
+    old = real_controller((50, 50), (100, 100), (150, 150))
+    mock_system.current_camera_controller = old
+    page = FloorPlanPage(tk_root, mock_controller)
+    old.disable_camera(1)
+    page.update_camera_colors()
+
+    # The new controller counts versions from the start again
+    new = real_controller((60, 60))
+    mock_system.current_camera_controller = new
+    page.update_camera_colors()
+
+    assert list(page.camera_icons.values()) == [1]
+    assert page.camera_source is new
+    assert page.camera_version == new.camera_version
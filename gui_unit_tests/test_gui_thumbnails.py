@@ -3,10 +3,18 @@ import tkinter as tk
 from unittest.mock import Mock, patch, MagicMock
 from PIL import Image
 from gui.gui_thumbnails import ThumbnailsPage
+from core.surveillance.thumbnail_mosaic import ThumbnailMosaic
 
 
 # Use tk_root from conftest - no root fixture needed
 
+def mosaic_of(thumbnails):
+    """Build the mosaic the controller would return for thumbnails."""
+    mosaic = ThumbnailMosaic()
+    mosaic.update(thumbnails)
+    return mosaic
+
+
 @pytest.fixture
 def mock_controller():
     """Create a mock controller."""
@@ -17,12 +25,12 @@ def mock_controller():
 def thumbnails_page(tk_root, mock_controller):
     """Create a ThumbnailsPage instance."""
     with patch('gui.gui_thumbnails.system') as mock_system:
-        # Mock get_thumbnail_views to return test images
-        mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+        # Mock get_thumbnail_mosaic to return a mosaic of test images
+        mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
             1: Image.new('RGB', (100, 100), color='red'),
             2: Image.new('RGB', (100, 100), color='green'),
             3: Image.new('RGB', (100, 100), color='blue'),
-        }
+        })
         page = ThumbnailsPage(tk_root, mock_controller)
         yield page
 
@@ -46,13 +54,13 @@ def test_thumbnails_page_has_title(thumbnails_page):
 @patch('gui.gui_thumbnails.system')
 def test_thumbnails_page_loads_thumbnails_on_init(mock_system, tk_root, mock_controller):
     """Test ThumbnailsPage loads thumbnails on initialization."""
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
         1: Image.new('RGB', (200, 200), color='red')
-    }
-    
+    })
+
     page = ThumbnailsPage(tk_root, mock_controller)
-    
-    mock_system.current_camera_controller.get_thumbnail_views.assert_called_once()
+
+    mock_system.current_camera_controller.get_thumbnail_mosaic.assert_called_once()
 
 
 # ============================================================
@@ -60,81 +68,85 @@ def test_thumbnails_page_loads_thumbnails_on_init(mock_system, tk_root, mock_con
 # ============================================================
 
 @patch('gui.gui_thumbnails.system')
-def test_load_thumbnails_creates_frames_for_each_camera(mock_system, thumbnails_page):
-    """Test load_thumbnails creates a frame for each camera."""
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+def test_load_thumbnails_shows_one_image(mock_system, thumbnails_page):
+    """Test load_thumbnails shows every camera in a single image."""
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
         1: Image.new('RGB', (100, 100)),
         2: Image.new('RGB', (100, 100)),
-    }
-    
+    })
+
     thumbnails_page.load_thumbnails()
-    
-    # Should have frames for cameras
-    children = thumbnails_page.thumb_frame.winfo_children()
-    assert len(children) >= 2
+
+    # One canvas and its scrollbar, no widgets per camera
+    assert len(thumbnails_page.thumb_frame.winfo_children()) == 2
+    assert set(thumbnails_page.tiles) == {1, 2}
+    assert thumbnails_page.tk_mosaic is not None
 
 
 @patch('gui.gui_thumbnails.system')
-def test_load_thumbnails_stores_tk_images(mock_system, thumbnails_page):
-    """Test load_thumbnails stores ImageTk objects."""
-    test_images = {
+def test_load_thumbnails_reuses_photo_image(mock_system, thumbnails_page):
+    """Test load_thumbnails keeps the PhotoImage while the size is unchanged."""
+    mosaic = mosaic_of({
         1: Image.new('RGB', (100, 100), color='red'),
         2: Image.new('RGB', (100, 100), color='blue'),
-    }
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = test_images
-    
+    })
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic
+    thumbnails_page.load_thumbnails()
+    first = thumbnails_page.tk_mosaic
+
+    mosaic.update({
+        1: Image.new('RGB', (100, 100), color='green'),
+        2: Image.new('RGB', (100, 100), color='blue'),
+    })
     thumbnails_page.load_thumbnails()
-    
-    assert len(thumbnails_page.tk_thumbnails) == 2
-    assert 1 in thumbnails_page.tk_thumbnails
-    assert 2 in thumbnails_page.tk_thumbnails
+
+    assert thumbnails_page.tk_mosaic is first
+    assert thumbnails_page.mosaic_version == mosaic.version
 
 
 @patch('gui.gui_thumbnails.system')
-def test_load_thumbnails_clears_old_widgets(mock_system, thumbnails_page):
-    """Test load_thumbnails clears old thumbnail widgets."""
+def test_load_thumbnails_replaces_tiles(mock_system, thumbnails_page):
+    """Test load_thumbnails shows the new camera list."""
     # First load
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
         1: Image.new('RGB', (100, 100))
-    }
+    })
     thumbnails_page.load_thumbnails()
-    first_count = len(thumbnails_page.thumb_frame.winfo_children())
-    
+
     # Second load with different cameras
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
         2: Image.new('RGB', (100, 100)),
         3: Image.new('RGB', (100, 100)),
-    }
+    })
     thumbnails_page.load_thumbnails()
-    second_count = len(thumbnails_page.thumb_frame.winfo_children())
-    
-    # Should have replaced widgets
-    assert second_count >= 2
+
+    assert set(thumbnails_page.tiles) == {2, 3}
 
 
 @patch('gui.gui_thumbnails.system')
 def test_load_thumbnails_handles_empty_dict(mock_system, tk_root, mock_controller):
-    """Test load_thumbnails handles empty camera dict."""
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {}
-    
+    """Test load_thumbnails handles no cameras."""
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({})
+
     page = ThumbnailsPage(tk_root, mock_controller)
-    
+
     # Should not crash
     assert page is not None
+    assert page.tk_mosaic is None
 
 
 @patch('gui.gui_thumbnails.system')
 def test_load_thumbnails_resizes_large_images(mock_system, thumbnails_page):
-    """Test load_thumbnails resizes large images."""
+    """Test load_thumbnails handles large images."""
     large_image = Image.new('RGB', (1000, 1000))
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = {
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of({
         1: large_image
-    }
-    
+    })
+
     thumbnails_page.load_thumbnails()
-    
-    # Image should be stored as thumbnail
-    assert 1 in thumbnails_page.tk_thumbnails
+
+    # Image should be shrunk into its tile
+    assert 1 in thumbnails_page.tiles
 
 
 # ============================================================
@@ -146,9 +158,11 @@ def test_thumbnails_arranged_in_grid(mock_system, tk_root, mock_controller):
     """Test thumbnails are arranged in 3-column grid."""
     # Create 5 cameras to test wrapping
     cameras = {i: Image.new('RGB', (100, 100)) for i in range(1, 6)}
-    mock_system.current_camera_controller.get_thumbnail_views.return_value = cameras
-    
+    mock_system.current_camera_controller.get_thumbnail_mosaic.return_value = mosaic_of(cameras)
+
     page = ThumbnailsPage(tk_root, mock_controller)
-    
-    # Should have created frames in grid
-    assert len(page.tk_thumbnails) == 5
+
+    assert len(page.tiles) == 5
+    # Fourth camera starts the second row
+    assert page.tiles[4][0] == page.tiles[1][0]
+    assert page.tiles[4][1] > page.tiles[1][1]
@@ -44,6 +44,11 @@ class SensorDBInterface(ABC):
         # InterfaceSensor have get_id() so compare id.
         pass
 
+    def get_sensors_intersecting(self, bounds: tuple[float, float, float, float]) -> set[int] | None:
+        # ids of stored sensors whose bounding box intersects (min_x, min_y, max_x, max_y).
+        # None means the storage has no spatial index and callers scan all sensors.
+        pass
+
 
 class SecurityZoneDBInterface(ABC):
     def get_security_zones(self) -> list[SecurityZone]:
@@ -58,6 +63,11 @@ class SecurityZoneDBInterface(ABC):
     def remove_security_zone(self, security_zone_id: int) -> None:
         pass
 
+    def get_security_zones_containing(self, x: float, y: float) -> set[int] | None:
+        # ids of stored security zones containing (x, y).
+        # None means the storage has no spatial index and callers scan all zones.
+        pass
+
 
 class SecurityDBInterface(SecurityModeDBInterface, SensorDBInterface, SecurityZoneDBInterface):
     def __init__(self) -> None:
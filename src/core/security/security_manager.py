@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Callable, Optional
 
 from core.log.log import Log
 from core.log.log_manager import LogManager
@@ -13,7 +13,7 @@ from core.security.security_exceptions import (
 )
 from core.security.security_mode.security_mode import SecurityMode
 from core.security.security_zone import SecurityZone, security_zone_id
-from core.security.security_zone_geometry.area import Square
+from core.security.security_zone_geometry.area import Point, Square
 from core.security.sensor_controller import SensorController
 from device.interface_sensor import InterfaceSensor
 
@@ -25,10 +25,12 @@ class SecurityManager:
 
         self.db_manager: SecurityDBInterface = db_manager
         self.sensors: dict[InterfaceSensor, tuple[bool, bool | None]] = db_manager.get_sensors()
+        # sensors added at runtime, which the storage's spatial index may not know
+        self.unindexed_sensors: set[InterfaceSensor] = set()
         self.security_zones: list[SecurityZone] = db_manager.get_security_zones()
         for zone in self.security_zones:
             security_zone_id.add(zone.id)
-            zone.update(zone.area, list(self.sensors.keys()))
+            zone.update(zone.area, self.get_sensors_intersecting(zone.area))
 
         self.security_modes: list[SecurityMode] = db_manager.get_security_modes()
 
@@ -44,12 +46,15 @@ class SecurityManager:
         self.alarm: Alarm = Alarm()
         self.bypass: set[InterfaceSensor] = set()
         self.log_manager: LogManager = log_manager
+        # called with the detected sensors whenever an armed intrusion sets off the alarm
+        self.intrusion_listeners: list[Callable[[list[InterfaceSensor]], None]] = []
 
     def add_sensor(self, sensor: InterfaceSensor, on: bool = True, arm: bool | None = None) -> None:
         if sensor not in self.sensors:
             self.sensors[sensor] = (on, arm)
         else:
             raise SensorAlreadyExistsError()
+        self.unindexed_sensors.add(sensor)
         self.db_manager.add_sensor(sensor, on, arm)
 
     def turn_on_sensor(self, sensor: InterfaceSensor) -> None:
@@ -80,8 +85,26 @@ class SecurityManager:
         if sensor not in self.sensors:
             raise SensorNotFoundError()
         self.db_manager.remove_sensor(sensor)
+        self.unindexed_sensors.discard(sensor)
         return self.sensors.pop(sensor)
 
+    def get_sensors_intersecting(self, area: Square) -> list[InterfaceSensor]:
+        # Sensors that may overlap area. Uses the storage's spatial index when
+        # there is one; SecurityZone still checks the exact overlap.
+        ids = self.db_manager.get_sensors_intersecting(area.bounds())
+        if ids is None:
+            return list(self.sensors.keys())
+        return [sensor for sensor in self.sensors
+                if sensor.get_id() in ids or sensor in self.unindexed_sensors]
+
+    def get_security_zones_at(self, x: float, y: float) -> list[SecurityZone]:
+        ids = self.db_manager.get_security_zones_containing(x, y)
+        point = Point(x, y)
+        if ids is None:
+            return [zone for zone in self.security_zones if point.overlap(zone.area)]
+        # The index rounds rectangles outwards, so its ids are only candidates
+        return [zone for zone in self.security_zones if zone.id in ids and point.overlap(zone.area)]
+
     def set_security_mode_index(self, mode: int | None) -> None:
         if mode is None:
             self.now_security_mode = None
@@ -131,8 +154,8 @@ class SecurityManager:
         raise SecurityModeNotFoundError()
 
     def add_security_zone(self) -> SecurityZone:
-        new_zone = SecurityZone(Square(*self.default_zone),
-                                list(self.sensors.keys()))
+        area = Square(*self.default_zone)
+        new_zone = SecurityZone(area, self.get_sensors_intersecting(area))
         self.security_zones.append(new_zone)
         self.db_manager.add_security_zone(new_zone)
         return new_zone
@@ -140,8 +163,7 @@ class SecurityManager:
     def update_security_zone(self, zone_id: int, area: Square) -> list[InterfaceSensor] | None:
         for security_zone in self.security_zones:
             if security_zone.id == zone_id:
-                security_zone.update(area, list(
-                    self.sensors.keys()))
+                security_zone.update(area, self.get_sensors_intersecting(area))
                 self.db_manager.update_security_zone(zone_id, security_zone)
                 return security_zone.sensors
         raise SecurityZoneNotFoundError()
@@ -210,6 +232,13 @@ class SecurityManager:
             return
         raise SensorNotFoundError()
 
+    def add_intrusion_listener(self, listener: Callable[[list[InterfaceSensor]], None]) -> None:
+        self.intrusion_listeners.append(listener)
+
+    def remove_intrusion_listener(self, listener: Callable[[list[InterfaceSensor]], None]) -> None:
+        if listener in self.intrusion_listeners:
+            self.intrusion_listeners.remove(listener)
+
     def update(self, detected_sensor_reset: bool = False) -> \
             tuple[dict[InterfaceSensor, Optional[bool]], list[InterfaceSensor]]:
         for sensor in self.sensors.keys():
@@ -255,6 +284,12 @@ class SecurityManager:
             tmp.date_time = self.log_manager.get_time()
             tmp.description = str([s.get_id() for s in armed_detected])
             self.log_manager.save_log(tmp)
+            for listener in list(self.intrusion_listeners):
+                try:
+                    listener(armed_detected)
+                except Exception as e:
+                    # A failing listener must not stop sensor polling
+                    print("Error in intrusion listener:", e)
 
         if detected_sensor_reset:
             for sensor in armed_detected:
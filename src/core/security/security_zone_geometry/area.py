@@ -204,6 +204,10 @@ class Square(Area):
         self.up_left = (left, up)
         self.down_right = (right, down)
 
+    def bounds(self) -> Tuple[Number, Number, Number, Number]:
+        # (min_x, min_y, max_x, max_y) regardless of corner order
+        return _rect_bounds(self)
+
     def overlap(self, other: Area) -> bool:
         if isinstance(other, Point):
             return _point_in_square(other.x, other.y, self)
@@ -1,5 +1,6 @@
 from typing import Optional
 
+from device.device_video_motion_detector import poll
 from device.interface_sensor import InterfaceSensor
 
 
@@ -10,6 +11,8 @@ class SensorController:
     def read(self) -> tuple[dict[InterfaceSensor, Optional[bool]], list[InterfaceSensor]]:
         result: dict[InterfaceSensor, Optional[bool]] = {sensor: None for sensor in self.sensors.keys()}
         armed_detected: list[InterfaceSensor] = []
+        # Video motion detectors analyze their frames together
+        poll(sensor for sensor, on in self.sensors.items() if on[0])
         for sensor, on in self.sensors.items():
             # assert on[0]
             if not on[0]:
@@ -0,0 +1,56 @@
+from core.setting.control_panel_setting_storage import IControlPanelSettingsDB
+from core.setting.system_setting import SystemSettings
+from core.setting.system_setting_storage import ISystemSettingsDB
+
+import copy
+
+
+# Read-through caches placed in front of the settings storages.
+# Reads are served from memory once loaded, writes go to the wrapped
+# storage first and only then replace the cached value.
+class SystemSettingsCache(ISystemSettingsDB):
+    def __init__(self, system_settings_db: ISystemSettingsDB):
+        self.system_settings_db = system_settings_db
+        self.settings: SystemSettings | None = None
+
+    def update_system_settings(self, settings: SystemSettings):
+        self.system_settings_db.update_system_settings(settings)
+        self.settings = copy.deepcopy(settings)
+
+    def get_system_settings(self) -> SystemSettings:
+        if self.settings is None:
+            self.settings = self.system_settings_db.get_system_settings()
+        # callers may mutate the returned object, so never hand out the cached one
+        return copy.deepcopy(self.settings)
+
+    def invalidate(self) -> None:
+        # Drop the cached value, e.g. after the underlying storage was reset
+        self.settings = None
+
+
+class ControlPanelSettingsCache(IControlPanelSettingsDB):
+    def __init__(self, setting_db: IControlPanelSettingsDB):
+        self.setting_db = setting_db
+        self.passwords: dict[str, str] = {}
+
+    def get_master_password(self) -> str:
+        if "master" not in self.passwords:
+            self.passwords["master"] = self.setting_db.get_master_password()
+        return self.passwords["master"]
+
+    def set_master_password(self, new_password) -> None:
+        self.setting_db.set_master_password(new_password)
+        self.passwords["master"] = new_password
+
+    def get_guest_password(self) -> str:
+        if "guest" not in self.passwords:
+            self.passwords["guest"] = self.setting_db.get_guest_password()
+        return self.passwords["guest"]
+
+    def set_guest_password(self, new_password) -> None:
+        self.setting_db.set_guest_password(new_password)
+        self.passwords["guest"] = new_password
+
+    def invalidate(self) -> None:
+        # Drop the cached passwords, e.g. after the underlying storage was reset
+        self.passwords.clear()
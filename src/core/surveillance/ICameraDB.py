@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from .safehome_camera import SafeHomeCamera
 
@@ -36,6 +36,11 @@ class ICameraDB(ABC):
     def update_camera(self, camera: SafeHomeCamera) -> None:
         """Persist changes to an existing camera."""
 
+    def update_cameras(self, cameras: Iterable[SafeHomeCamera]) -> None:
+        """Persist changes to several cameras (storages may batch them)."""
+        for camera in cameras:
+            self.update_camera(camera)
+
     @abstractmethod
     def delete_camera(self, camera_id: int) -> None:
         """Delete persisted camera information."""
@@ -47,3 +52,12 @@ class ICameraDB(ABC):
     @abstractmethod
     def get_all_cameras(self) -> List[SafeHomeCamera]:
         """Return all persisted cameras."""
+
+    def close(self) -> None:
+        """Release what the storage holds; cameras it returned stay with the caller."""
+
+    def __enter__(self) -> "ICameraDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
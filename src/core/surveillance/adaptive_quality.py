@@ -0,0 +1,136 @@
+# src/core/surveillance/adaptive_quality.py
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Deque, Dict, Optional, Tuple
+
+from device.device_camera import QUALITY_BILINEAR, QUALITY_LANCZOS, QUALITY_NEAREST
+
+# Render seconds per second above which quality is lowered. With several
+# render workers the load can go over 1.0.
+DEFAULT_BUDGET = 0.5
+# Resampling from best to cheapest, see device.device_camera.RESAMPLE
+QUALITY_ORDER = (QUALITY_LANCZOS, QUALITY_BILINEAR, QUALITY_NEAREST)
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """
+    How far views of non-focused cameras are degraded.
+    quality caps the resampling (None keeps the configured one), scale
+    shrinks the rendered resolution and max_fps limits how often a
+    camera's view is re-rendered (None re-renders every new frame).
+    """
+
+    level: int
+    quality: Optional[str]
+    scale: float
+    max_fps: Optional[float]
+
+    def apply(self, quality: str) -> str:
+        # The cheaper of quality and this level's quality
+        if self.quality is None or quality not in QUALITY_ORDER:
+            return quality
+        return max(quality, self.quality, key=QUALITY_ORDER.index)
+
+
+# Resample quality goes first, then resolution, then refresh rate
+LEVELS: Tuple[QualityLevel, ...] = (
+    QualityLevel(0, None, 1.0, None),
+    QualityLevel(1, QUALITY_BILINEAR, 1.0, None),
+    QualityLevel(2, QUALITY_NEAREST, 1.0, None),
+    QualityLevel(3, QUALITY_NEAREST, 0.5, None),
+    QualityLevel(4, QUALITY_NEAREST, 0.5, 2.0),
+    QualityLevel(5, QUALITY_NEAREST, 0.5, 0.5),
+)
+
+
+class AdaptiveQuality:
+    """
+    Picks a QualityLevel from the time spent rendering camera views.
+    Renders report their duration through record(); when the render time
+    of the last window seconds, per second, goes over budget the level
+    goes up one step, and once it falls under restore_ratio * budget it
+    goes back down one step. A level is kept for at least hold seconds so
+    that the load measured at the new level is what decides the next step.
+    """
+
+    def __init__(self, budget: float = DEFAULT_BUDGET, window: float = 1.0,
+                 hold: float = 1.0, restore_ratio: float = 0.5) -> None:
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, got {budget}.")
+        self.budget = budget
+        self.window = window
+        self.hold = hold
+        self.restore_ratio = restore_ratio
+        self.enabled = True
+        self._level = 0
+        self._changed_at = float("-inf")
+        self._samples: Deque[Tuple[float, float]] = deque()
+        self._total = 0.0
+        self._lock = Lock()
+
+    def record(self, seconds: float, now: Optional[float] = None) -> None:
+        # A render that took seconds finished at now
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._samples.append((now, seconds))
+            self._total += seconds
+            self._update(now)
+
+    def current(self, now: Optional[float] = None) -> QualityLevel:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._update(now)
+            return LEVELS[self._level] if self.enabled else LEVELS[0]
+
+    def load(self, now: Optional[float] = None) -> float:
+        # Render seconds per second over the last window
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return self._total / self.window
+
+    def set_budget(self, budget: float) -> None:
+        if budget <= 0:
+            raise ValueError(f"budget must be positive, got {budget}.")
+        with self._lock:
+            self.budget = budget
+
+    def set_enabled(self, enabled: bool) -> None:
+        with self._lock:
+            self.enabled = enabled
+            if not enabled:
+                self._level = 0
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.monotonic() if now is None else now
+        level = self.current(now)
+        return {
+            "level": level.level,
+            "load": self.load(now),
+            "budget": self.budget,
+        }
+
+    def _expire(self, now: float) -> None:
+        while self._samples and self._samples[0][0] <= now - self.window:
+            self._total -= self._samples.popleft()[1]
+        if not self._samples:
+            # Do not let float error accumulate
+            self._total = 0.0
+
+    def _update(self, now: float) -> None:
+        self._expire(now)
+        if not self.enabled or now - self._changed_at < self.hold:
+            return
+        load = self._total / self.window
+        if load > self.budget and self._level < len(LEVELS) - 1:
+            self._level += 1
+            self._changed_at = now
+        elif load < self.budget * self.restore_ratio and self._level > 0:
+            self._level -= 1
+            self._changed_at = now
@@ -2,17 +2,33 @@
 
 from __future__ import annotations
 
+import time
+from array import array
 from dataclasses import dataclass
-from PIL import Image, ImageDraw, ImageFont
-from typing import Dict, Iterable, Optional, List, Tuple
+from functools import cached_property, partial
+from PIL import Image
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Tuple
 from storage.camera_storage_memory import CameraMemoryDB
 from .safehome_camera import SafeHomeCamera
 from .ICameraDB import ICameraDB
-from device.device_camera import DeviceCamera
+from device.device_camera import DeviceCamera, QUALITY_BILINEAR, QUALITY_LANCZOS
 from .camera_exceptions import (
     CameraNotFoundError,
     InvalidLocationError,
 )
+from .adaptive_quality import AdaptiveQuality, QualityLevel
+from .camera_index import Bounds, CameraLocationIndex
+from .frame_stream import Frame, FrameStream, FrameStreamer
+from .render_pool import CameraRenderPool, RenderBatch, RenderJob
+from .thumbnail_cache import (
+    DEFAULT_MAX_BYTES,
+    THUMBNAIL_SIZE,
+    ThumbnailCache,
+    disabled_placeholder,
+    locked_placeholder,
+    placeholder,
+)
+from .thumbnail_mosaic import ThumbnailMosaic
 
 
 @dataclass(frozen=True)
@@ -29,6 +45,77 @@ class CameraInfo:
     has_password: bool
 
 
+# Bits of CameraSnapshot.flags
+ENABLED = 1
+HAS_PASSWORD = 2
+
+
+@dataclass(frozen=True)
+class CameraSnapshot:
+    """
+    Read-only state of many cameras at one controller version, stored as
+    parallel arrays (read-only memoryviews) rather than one object per
+    camera. A snapshot from changes_since(since) holds only the cameras
+    added or changed after since, plus the ids deleted after it.
+    """
+
+    version: int
+    camera_ids: memoryview
+    xs: memoryview
+    ys: memoryview
+    flags: memoryview
+    since: Optional[int] = None
+    deleted: Tuple[int, ...] = ()
+
+    @classmethod
+    def build(cls, version: int, cameras: Iterable[SafeHomeCamera],
+              since: Optional[int] = None,
+              deleted: Tuple[int, ...] = ()) -> CameraSnapshot:
+        ids, xs, ys, flags = array("q"), array("q"), array("q"), array("B")
+        for camera in cameras:
+            ids.append(camera.camera_id)
+            x, y = camera.location
+            xs.append(x)
+            ys.append(y)
+            flags.append((ENABLED if camera.enabled else 0)
+                         | (HAS_PASSWORD if camera.has_password else 0))
+        return cls(version, *(memoryview(a).toreadonly() for a in (ids, xs, ys, flags)),
+                   since=since, deleted=deleted)
+
+    def __len__(self) -> int:
+        return len(self.camera_ids)
+
+    def __iter__(self) -> Iterator[CameraInfo]:
+        return (self._info(i) for i in range(len(self.camera_ids)))
+
+    def __contains__(self, camera_id: int) -> bool:
+        return camera_id in self._index
+
+    def get(self, camera_id: int) -> Optional[CameraInfo]:
+        index = self._index.get(camera_id)
+        return None if index is None else self._info(index)
+
+    @cached_property
+    def locations(self) -> CameraLocationIndex:
+        # Spatial index of the snapshot's cameras, built on first use
+        return CameraLocationIndex(zip(self.camera_ids, self.xs, self.ys))
+
+    def is_enabled(self, camera_id: int) -> bool:
+        return bool(self.flags[self._index[camera_id]] & ENABLED)
+
+    @cached_property
+    def _index(self) -> Dict[int, int]:
+        return {cid: i for i, cid in enumerate(self.camera_ids)}
+
+    def _info(self, i: int) -> CameraInfo:
+        return CameraInfo(
+            camera_id=self.camera_ids[i],
+            location=(self.xs[i], self.ys[i]),
+            enabled=bool(self.flags[i] & ENABLED),
+            has_password=bool(self.flags[i] & HAS_PASSWORD),
+        )
+
+
 class CameraController:
     """
     Controller class that creates, deletes, and manages a list of
@@ -43,16 +130,46 @@ class CameraController:
     - Display a single view
     """
 
-    def __init__(self, camera_db: Optional[ICameraDB] = None) -> None:
+    def __init__(self, camera_db: Optional[ICameraDB] = None,
+                 thumbnail_max_bytes: int = DEFAULT_MAX_BYTES) -> None:
         self._camera_db: ICameraDB = camera_db or CameraMemoryDB()
+        # Thumbnails of enabled, unlocked cameras, reused while the
+        # camera's frame version is unchanged
+        self._thumbnails = ThumbnailCache(thumbnail_max_bytes)
+        # Resampling used for thumbnails (see device.device_camera.RESAMPLE)
+        self.thumbnail_quality: str = QUALITY_BILINEAR
+        # All thumbnails in one image, kept between calls so that only
+        # changed tiles are redrawn
+        self._mosaic = ThumbnailMosaic()
+        # Worker threads used to render several cameras at once
+        self._render_pool = CameraRenderPool()
+        # Pushes new frames to subscribers (see subscribe), rendered at the
+        # quality level for the current load like every other view
+        self._streamer = FrameStreamer(self._require_camera, self._render_view,
+                                       self._max_stream_fps)
+        # Lowers quality of non-focused cameras' views under render load
+        self._quality = AdaptiveQuality()
+        self._focused_camera: Optional[int] = None
+        # When each camera's thumbnail was last rendered
+        self._thumbnail_times: Dict[int, float] = {}
+        # Camera state version: bumped by every add, delete and change of
+        # what CameraInfo shows, with the version each camera last changed at
+        self._version = 0
+        self._changed: Dict[int, int] = {}
+        self._deleted: Dict[int, int] = {}
+        self._snapshot: Optional[CameraSnapshot] = None
         # Map from camera_id to SafeHomeCamera
         self._cameras: Dict[int, SafeHomeCamera] = {}
         for cam in self._camera_db.get_all_cameras():
+            # May have been closed by a previous controller on the same DB
+            cam.start()
             self._cameras[cam.camera_id] = cam
+            self._touch(cam.camera_id)
         self.next_camera_id: int = (
             max(self._cameras.keys(), default=0) + 1
         )
         self.total_camera_number: int = len(self._cameras)
+        self._closed = False
 
     def _validate_location(self, location: tuple[int, int]) -> None:
         # Helper to check validity of location
@@ -91,6 +208,7 @@ class CameraController:
 
         self._cameras[camera_id] = camera
         self._camera_db.create_camera(camera)
+        self._touch(camera_id)
 
         self.total_camera_number += 1
 
@@ -106,9 +224,25 @@ class CameraController:
             )
 
         self._camera_db.delete_camera(camera_id)
+        self._thumbnails.invalidate(camera_id)
+        self._thumbnail_times.pop(camera_id, None)
+        if self._focused_camera == camera_id:
+            self._focused_camera = None
+        self._version += 1
+        self._changed.pop(camera_id, None)
+        self._deleted[camera_id] = self._version
+        self._snapshot = None
+        camera.close()
         self.total_camera_number -= 1
         return True
 
+    def _touch(self, camera_id: int) -> None:
+        # Record a change of what CameraInfo shows for the camera
+        self._version += 1
+        self._changed[camera_id] = self._version
+        self._deleted.pop(camera_id, None)
+        self._snapshot = None
+
     def _require_camera(self, camera_id: int) -> SafeHomeCamera:
         # Helper to return SafeHomeCamera Object
         camera = self._cameras.get(camera_id)
@@ -130,41 +264,110 @@ class CameraController:
 
     def get_all_cameras_info(self) -> List[CameraInfo]:
         # Return a list of all camera info to the user
-        return [self.get_camera_info(cam_id) for cam_id in self._cameras.keys()]
+        return list(self.get_camera_snapshot())
+
+    @property
+    def camera_version(self) -> int:
+        # Increases whenever a camera is added, deleted, enabled, disabled
+        # or gets or loses its password
+        return self._version
+
+    def get_camera_snapshot(self) -> CameraSnapshot:
+        # State of all cameras at the current version; reused until the
+        # next change
+        if self._snapshot is None:
+            self._snapshot = CameraSnapshot.build(self._version, list(self._cameras.values()))
+        return self._snapshot
+
+    def changes_since(self, version: int) -> CameraSnapshot:
+        # Cameras added or changed after version, and the ids deleted after
+        # it. Pass the returned snapshot's version to the next call.
+        if version > self._version:
+            raise ValueError(
+                f"Version {version} is newer than the current version {self._version}.")
+        if version <= 0:
+            return self.get_camera_snapshot()
+        changed = [self._cameras[cid] for cid, v in list(self._changed.items()) if v > version]
+        deleted = tuple(cid for cid, v in list(self._deleted.items()) if v > version)
+        return CameraSnapshot.build(self._version, changed, since=version, deleted=deleted)
+
+    def get_nearest_cameras(
+            self,
+            location: Tuple[int, int],
+            count: int = 1,
+            max_distance: Optional[float] = None,
+            enabled_only: bool = False,
+    ) -> List[CameraInfo]:
+        # The count cameras closest to a floorplan location, closest first,
+        # e.g. the feeds to show for a triggered sensor. Looked up in the
+        # snapshot's spatial index, which is rebuilt after camera changes.
+        snapshot = self.get_camera_snapshot()
+        ids = snapshot.locations.nearest(
+            *location, count=count, max_distance=max_distance,
+            accept=snapshot.is_enabled if enabled_only else None)
+        return [snapshot.get(cid) for cid in ids]
+
+    def get_nearest_camera(
+            self,
+            location: Tuple[int, int],
+            max_distance: Optional[float] = None,
+            enabled_only: bool = False,
+    ) -> Optional[CameraInfo]:
+        cameras = self.get_nearest_cameras(location, 1, max_distance, enabled_only)
+        return cameras[0] if cameras else None
+
+    def get_cameras_in_area(self, bounds: Bounds,
+                            enabled_only: bool = False) -> List[CameraInfo]:
+        # Cameras inside (min_x, min_y, max_x, max_y), edges included, by
+        # id; pass a security zone's area.bounds() to get its cameras
+        snapshot = self.get_camera_snapshot()
+        return [snapshot.get(cid) for cid in snapshot.locations.in_area(bounds)
+                if not enabled_only or snapshot.is_enabled(cid)]
 
     def enable_camera(self, camera_id: int) -> None:
         # Enable specific camera
         camera = self._require_camera(camera_id)
         camera.enable()
+        self._thumbnails.invalidate(camera_id)
+        self._touch(camera_id)
         self._camera_db.update_camera(camera)
 
     def disable_camera(self, camera_id: int) -> None:
         # Disable specific camera
         camera = self._require_camera(camera_id)
         camera.disable()
+        self._thumbnails.invalidate(camera_id)
+        self._touch(camera_id)
         self._camera_db.update_camera(camera)
 
     def enable_cameras(self, camera_ids: Iterable[int]) -> None:
         # Enable a list of specific cameras.
-        for cid in camera_ids:
-            self.enable_camera(cid)
+        # All ids are checked before any camera changes; one batched write
+        cameras = [self._require_camera(cid) for cid in camera_ids]
+        self._set_enabled(cameras, True)
 
     def disable_cameras(self, camera_ids: Iterable[int]) -> None:
         # Disable a list of specific cameras.
-        for cid in camera_ids:
-            self.disable_camera(cid)
+        cameras = [self._require_camera(cid) for cid in camera_ids]
+        self._set_enabled(cameras, False)
 
     def enable_all(self) -> None:
         # Enable all cameras.
-        for camera in self._cameras.values():
-            camera.enable()
-            self._camera_db.update_camera(camera)
+        self._set_enabled(list(self._cameras.values()), True)
 
     def disable_all(self) -> None:
         # Disable all cameras.
-        for camera in self._cameras.values():
-            camera.disable()
-            self._camera_db.update_camera(camera)
+        self._set_enabled(list(self._cameras.values()), False)
+
+    def _set_enabled(self, cameras: List[SafeHomeCamera], enabled: bool) -> None:
+        for camera in cameras:
+            if enabled:
+                camera.enable()
+            else:
+                camera.disable()
+            self._thumbnails.invalidate(camera.camera_id)
+            self._touch(camera.camera_id)
+        self._camera_db.update_cameras(cameras)
 
     def zoom_in(self, camera_id: int) -> bool:
         # Attempt to zoom in in the hardware camera
@@ -198,54 +401,210 @@ class CameraController:
         self._camera_db.update_camera(camera)
         return result
 
-    def get_single_view(self, camera_id: int) -> Image.Image:
+    def get_single_view(self, camera_id: int,
+                        size: Optional[int] = None) -> Image.Image:
         # Display a single view (or return data for UI to display)
         # for a specific camera.
+        # size renders a smaller square view directly
         camera = self._require_camera(camera_id)
-        return camera.display_view()
+        return self._render_view(camera, size)
 
-    def get_thumbnail_views(self) -> Dict[int, Image.Image]:
+    def get_frame_version(self, camera_id: int) -> int:
+        # Version of the camera's current frame. A view fetched while the
+        # version was N is still current as long as this returns N.
+        camera = self._require_camera(camera_id)
+        return camera.get_frame_version()
+
+    def render_views(
+            self,
+            camera_ids: Iterable[int],
+            size: Optional[int] = None,
+            timeout=None,
+    ) -> RenderBatch:
+        # Render the views of several cameras concurrently on the render
+        # pool. timeout is one deadline in seconds or a dict of deadlines by
+        # camera id; cameras that miss it are listed in batch.timed_out.
+        jobs = {}
+        for cid in camera_ids:
+            camera = self._require_camera(cid)
+            jobs[cid] = self._view_job(camera, size)
+        return self._render_pool.render_all(jobs, timeout)
+
+    def get_thumbnail_views(self, timeout=None) -> Dict[int, Image.Image]:
         # Return thumbnail views for all cameras
         # If camera is protected by password displays "Locked" image
-        locked = Image.new("RGB", (160, 160), "black")
-        draw = ImageDraw.Draw(locked)
-        text = "Locked"
-        font = ImageFont.load_default()
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x = (160 - text_width) / 2
-        y = (160 - text_height) / 2
-
-        draw.text((x, y), text, font=font, fill="white")
-
-        disabled = Image.new("RGB", (160, 160), "black")
-        draw = ImageDraw.Draw(disabled)
-        text = "Disabled"
-        font = ImageFont.load_default()
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        x = (160 - text_width) / 2
-        y = (160 - text_height) / 2
-
-        draw.text((x, y), text, font=font, fill="white")
-
+        # Thumbnails that are not cached are rendered in parallel; those
+        # that miss the timeout show a "Loading" placeholder instead.
+        # Returned images are shared with the cache and must not be modified
         result: Dict[int, Image.Image] = {}
+        jobs = {}
+        versions = {}
+        level = self._quality.current()
+        now = time.monotonic()
         for cid, camera in self._cameras.items():
             if camera.has_password:
-                result[cid] = locked
+                result[cid] = locked_placeholder()
             elif not camera.enabled:
-                result[cid] = disabled
+                result[cid] = disabled_placeholder()
             else:
-                result[cid] = camera.display_thumbnail()
-        return result
+                versions[cid] = camera.get_frame_version()
+                thumbnail = self._thumbnails.get(cid, versions[cid])
+                if thumbnail is None and self._refresh_later(cid, level, now):
+                    stale = self._thumbnails.peek(cid)
+                    thumbnail = stale[1] if stale is not None else None
+                if thumbnail is not None:
+                    result[cid] = thumbnail
+                else:
+                    jobs[cid] = self._thumbnail_job(camera, level)
+
+        if len(jobs) == 1 and timeout is None:
+            # Not worth a round trip through the pool
+            batch = RenderBatch(images={cid: job() for cid, job in jobs.items()})
+        else:
+            batch = self._render_pool.render_all(jobs, timeout)
+        if batch.errors:
+            raise next(iter(batch.errors.values()))
+        for cid, thumbnail in batch.images.items():
+            self._thumbnails.put(cid, versions[cid], thumbnail)
+            self._thumbnail_times[cid] = now
+            result[cid] = thumbnail
+        for cid in batch.timed_out:
+            result[cid] = placeholder("Loading")
+
+        # Keep the camera order
+        return {cid: result[cid] for cid in self._cameras if cid in result}
+
+    def get_thumbnail_mosaic(self, columns: int = 3, timeout=None) -> ThumbnailMosaic:
+        # Composite all thumbnail views into one image (mosaic.image) and
+        # return the mosaic; mosaic.dirty lists the boxes that changed since
+        # the previous call. The image is updated in place by later calls.
+        if columns != self._mosaic.columns:
+            self._mosaic = ThumbnailMosaic(columns)
+        self._mosaic.update(self.get_thumbnail_views(timeout))
+        return self._mosaic
+
+    def subscribe(
+            self,
+            camera_id: int,
+            fps: float = 10.0,
+            size: Optional[int] = None,
+            callback: Optional[Callable[[Frame], None]] = None,
+    ) -> FrameStream:
+        # Stream new frames of a camera at up to fps frames per second.
+        # Iterate over the returned stream, or pass a callback to receive
+        # frames on the streaming thread; close the stream when done.
+        # Slow consumers only get the newest frame. Under render load,
+        # non-focused cameras stream at most at the level's max_fps.
+        return self._streamer.subscribe(camera_id, fps, size, callback)
+
+    def set_focused_camera(self, camera_id: Optional[int]) -> None:
+        # The camera the user is watching, e.g. in the single view. Its
+        # views keep full quality whatever the render load; None for none.
+        if camera_id is not None:
+            self._require_camera(camera_id)
+        self._focused_camera = camera_id
+
+    def get_focused_camera(self) -> Optional[int]:
+        return self._focused_camera
+
+    def get_quality_level(self) -> QualityLevel:
+        # Degradation currently applied to non-focused cameras; level 0
+        # renders them as configured
+        return self._quality.current()
+
+    def get_render_load(self) -> Dict[str, float]:
+        # Current level, render seconds per second and budget
+        return self._quality.stats()
+
+    def set_render_budget(self, seconds_per_second: float) -> None:
+        # Render time per second above which views are degraded
+        self._quality.set_budget(seconds_per_second)
+
+    def set_adaptive_quality(self, enabled: bool) -> None:
+        # Turn load-based degradation on or off; off restores full quality
+        self._quality.set_enabled(enabled)
+
+    def set_render_workers(self, max_workers: int) -> None:
+        # Change how many cameras are rendered at the same time
+        self._render_pool.shutdown(wait=False)
+        self._render_pool = CameraRenderPool(max_workers)
+
+    def _view_job(self, camera: SafeHomeCamera, size: Optional[int]) -> RenderJob:
+        # Render of camera's view at size (None for the full view), at the
+        # quality level for the current load
+        level = self._quality.current()
+        if size is None:
+            base, target = partial(camera.display_view), DeviceCamera.RETURN_SIZE
+            quality = level.apply(QUALITY_LANCZOS)
+        else:
+            base, target = partial(camera.display_view, size, self.thumbnail_quality), size
+            quality = level.apply(self.thumbnail_quality)
+        if level.level == 0 or camera.camera_id == self._focused_camera:
+            return self._timed(base)
+        return self._timed(partial(self._degraded_view, camera, target, quality, level.scale))
+
+    def _render_view(self, camera: SafeHomeCamera, size: Optional[int]) -> Image.Image:
+        return self._view_job(camera, size)()
+
+    def _thumbnail_job(self, camera: SafeHomeCamera, level: QualityLevel) -> RenderJob:
+        if level.level == 0 or camera.camera_id == self._focused_camera:
+            return self._timed(partial(camera.display_thumbnail, self.thumbnail_quality))
+        return self._timed(partial(self._degraded_view, camera, THUMBNAIL_SIZE,
+                                   level.apply(self.thumbnail_quality), level.scale))
+
+    @staticmethod
+    def _degraded_view(camera: SafeHomeCamera, size: int, quality: str,
+                       scale: float) -> Image.Image:
+        # Rendered at scale and blown back up, so that callers always get
+        # an image of the size they asked for
+        reduced = max(1, round(size * scale))
+        image = camera.display_view(reduced, quality)
+        if reduced != size:
+            image = image.resize((size, size), Image.NEAREST)
+        return image
+
+    def _timed(self, job: RenderJob) -> RenderJob:
+        def run() -> Image.Image:
+            start = time.perf_counter()
+            try:
+                return job()
+            finally:
+                self._quality.record(time.perf_counter() - start)
+        return run
+
+    def _refresh_later(self, camera_id: int, level: QualityLevel, now: float) -> bool:
+        # Whether an outdated thumbnail is still recent enough for the
+        # level's refresh rate
+        if level.max_fps is None or camera_id == self._focused_camera:
+            return False
+        rendered = self._thumbnail_times.get(camera_id)
+        return rendered is not None and now - rendered < 1.0 / level.max_fps
+
+    def _max_stream_fps(self, camera_id: int) -> Optional[float]:
+        # Frame rate limit of the current level for streams of the camera
+        if camera_id == self._focused_camera:
+            return None
+        return self._quality.current().max_fps
+
+    def set_thumbnail_quality(self, quality: str) -> None:
+        # Trade thumbnail quality for speed, e.g. "nearest" or "reduce"
+        self.thumbnail_quality = quality
+        self._thumbnails.invalidate()
+
+    def set_thumbnail_max_bytes(self, max_bytes: int) -> None:
+        # Cap the memory held by cached thumbnails
+        self._thumbnails.set_max_bytes(max_bytes)
+
+    def get_thumbnail_cache_stats(self) -> Dict[str, int]:
+        return self._thumbnails.stats()
 
     def set_camera_password(self, camera_id: int,
                             password: str) -> None:
         # Sets password to the camera with the ID
         camera = self._require_camera(camera_id)
         camera.set_password(password)
+        self._thumbnails.invalidate(camera_id)
+        self._touch(camera_id)
         self._camera_db.update_camera(camera)
 
     def validate_camera_password(self, camera_id: int, password: str) -> bool:
@@ -262,9 +621,25 @@ class CameraController:
         camera = self._require_camera(camera_id)
         had_password = camera.has_password
         camera.set_password("")
+        self._thumbnails.invalidate(camera_id)
+        self._touch(camera_id)
         self._camera_db.update_camera(camera)
         return had_password
 
-    def __del__(self):
-        for _, camera in self._cameras.items():
-            camera.stop()
+    def close(self) -> None:
+        # Stop streaming and rendering, and stop every camera and release
+        # its images. Safe to call more than once.
+        if self._closed:
+            return
+        self._closed = True
+        self._streamer.close()
+        self._render_pool.shutdown(wait=False)
+        for camera in self._cameras.values():
+            camera.close()
+        self._thumbnails.invalidate()
+
+    def __enter__(self) -> CameraController:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
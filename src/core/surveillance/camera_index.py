@@ -0,0 +1,96 @@
+# src/core/surveillance/camera_index.py
+
+from __future__ import annotations
+
+import heapq
+from math import hypot
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# (min_x, min_y, max_x, max_y), as returned by Square.bounds()
+Bounds = Tuple[float, float, float, float]
+
+
+class CameraLocationIndex:
+    """
+    Immutable 2-d tree of camera locations on the floorplan.
+    Built once from (camera_id, x, y) entries; nearest() and in_area()
+    then visit O(log n) nodes plus the matches instead of every camera.
+    The tree is stored implicitly: the median of each slice of
+    self._nodes is the node, the halves before and after it its children.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, int, int]]) -> None:
+        self._nodes: List[Tuple[int, int, int]] = list(entries)
+        self._build(0, len(self._nodes), 0)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def nearest(self, x: float, y: float, count: int = 1,
+                max_distance: Optional[float] = None,
+                accept: Optional[Callable[[int], bool]] = None) -> List[int]:
+        # Ids of the count cameras closest to (x, y), closest first. Only
+        # cameras within max_distance and, with accept, those it returns
+        # True for are considered.
+        if count < 1:
+            raise ValueError(f"count must be at least 1, got {count}.")
+        limit = float("inf") if max_distance is None else max_distance
+        # Max-heap of the best matches so far as (-distance, -id)
+        best: List[Tuple[float, int]] = []
+
+        def bound() -> float:
+            return -best[0][0] if len(best) == count else limit
+
+        def visit(lo: int, hi: int, axis: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            cid, cx, cy = self._nodes[mid]
+            distance = hypot(cx - x, cy - y)
+            if distance <= bound() and (accept is None or accept(cid)):
+                item = (-distance, -cid)
+                if len(best) < count:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+            offset = (x - cx) if axis == 0 else (y - cy)
+            near, far = ((lo, mid), (mid + 1, hi)) if offset < 0 else ((mid + 1, hi), (lo, mid))
+            visit(*near, 1 - axis)
+            # The far side can only hold a closer camera if the splitting
+            # line is closer than the current bound
+            if abs(offset) <= bound():
+                visit(*far, 1 - axis)
+
+        visit(0, len(self._nodes), 0)
+        return [-cid for _, cid in sorted(best, reverse=True)]
+
+    def in_area(self, bounds: Bounds) -> List[int]:
+        # Ids of the cameras inside bounds (edges included), by id
+        min_x, min_y, max_x, max_y = bounds
+        found: List[int] = []
+
+        def visit(lo: int, hi: int, axis: int) -> None:
+            if lo >= hi:
+                return
+            mid = (lo + hi) // 2
+            cid, cx, cy = self._nodes[mid]
+            if min_x <= cx <= max_x and min_y <= cy <= max_y:
+                found.append(cid)
+            value, low, high = (cx, min_x, max_x) if axis == 0 else (cy, min_y, max_y)
+            if low <= value:
+                visit(lo, mid, 1 - axis)
+            if value <= high:
+                visit(mid + 1, hi, 1 - axis)
+
+        visit(0, len(self._nodes), 0)
+        return sorted(found)
+
+    def _build(self, lo: int, hi: int, axis: int) -> None:
+        # Sort the slice on axis so that its median splits it; equal
+        # coordinates may end up on either side, which the queries allow for
+        if hi - lo <= 1:
+            return
+        self._nodes[lo:hi] = sorted(self._nodes[lo:hi], key=lambda n: (n[1 + axis], n[0]))
+        mid = (lo + hi) // 2
+        self._build(lo, mid, 1 - axis)
+        self._build(mid + 1, hi, 1 - axis)
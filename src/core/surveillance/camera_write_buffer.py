@@ -0,0 +1,147 @@
+# src/core/surveillance/camera_write_buffer.py
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .ICameraDB import ICameraDB
+from .safehome_camera import SafeHomeCamera
+
+
+class BufferedCameraDB(ICameraDB):
+    """
+    Write-behind layer in front of a camera storage.
+
+    update_camera only marks the camera dirty; dirty cameras are written
+    together once no update arrived for idle_delay seconds, at the latest
+    max_delay seconds after the first pending update, before any read, and
+    on flush()/close(). Since SafeHomeCamera objects are stored by
+    reference, a flush writes each camera's latest state once.
+
+    Writes run outside the lock that update_camera takes, so a slow
+    storage never blocks the caller; timed flushes run on one flusher
+    thread, started with the first update and ended by close().
+    """
+
+    def __init__(self, camera_db: ICameraDB, idle_delay: float = 0.5,
+                 max_delay: float = 2.0) -> None:
+        self.camera_db = camera_db
+        self.idle_delay = idle_delay
+        self.max_delay = max_delay
+        self._dirty: Dict[int, SafeHomeCamera] = {}
+        # Cameras taken out of _dirty by the write in progress
+        self._writing: Dict[int, SafeHomeCamera] = {}
+        self._first_dirty: Optional[float] = None
+        self._last_update = 0.0
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        # Serializes access to camera_db, so that a create or delete never
+        # overtakes a write of the same camera
+        self._write_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = False
+        self.flushes = 0
+
+    def create_camera(self, camera: SafeHomeCamera) -> None:
+        with self._write_lock:
+            self.camera_db.create_camera(camera)
+
+    def update_camera(self, camera: SafeHomeCamera) -> None:
+        self.update_cameras([camera])
+
+    def update_cameras(self, cameras: Iterable[SafeHomeCamera]) -> None:
+        with self._lock:
+            for camera in cameras:
+                self._dirty[camera.camera_id] = camera
+            if not self._dirty:
+                return
+            self._last_update = time.monotonic()
+            if self._first_dirty is None:
+                self._first_dirty = self._last_update
+            if self._flusher is None and not self._stopped:
+                self._flusher = threading.Thread(target=self._run, name="camera-db-flush",
+                                                 daemon=True)
+                self._flusher.start()
+            self._changed.notify()
+
+    def delete_camera(self, camera_id: int) -> None:
+        with self._lock:
+            self._dirty.pop(camera_id, None)
+        with self._write_lock:
+            self.camera_db.delete_camera(camera_id)
+
+    def get_camera_by_id(self, camera_id: int) -> Optional[SafeHomeCamera]:
+        self.flush()
+        return self.camera_db.get_camera_by_id(camera_id)
+
+    def get_all_cameras(self) -> List[SafeHomeCamera]:
+        self.flush()
+        return self.camera_db.get_all_cameras()
+
+    def pending(self) -> List[int]:
+        # Ids of cameras with unwritten changes, including a write in progress
+        with self._lock:
+            return list({**self._writing, **self._dirty})
+
+    def flush(self) -> None:
+        # Write every dirty camera now, in one batch
+        with self._write_lock:
+            with self._lock:
+                cameras = list(self._dirty.values())
+                self._writing = dict(self._dirty)
+                self._dirty.clear()
+                self._first_dirty = None
+            if not cameras:
+                return
+            try:
+                self.camera_db.update_cameras(cameras)
+            except Exception:
+                # Keep the changes for the next attempt, after idle_delay
+                with self._lock:
+                    for camera in cameras:
+                        self._dirty.setdefault(camera.camera_id, camera)
+                    self._writing = {}
+                    self._last_update = time.monotonic()
+                    if self._first_dirty is None:
+                        self._first_dirty = self._last_update
+                raise
+            with self._lock:
+                self._writing = {}
+            self.flushes += 1
+
+    def discard(self) -> None:
+        # Drop pending changes, e.g. after the underlying storage was reset
+        with self._lock:
+            self._dirty.clear()
+            self._first_dirty = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._changed.notify()
+        self.flush()
+        self.camera_db.close()
+
+    def _run(self) -> None:
+        # Flusher thread: write once the pending changes are due
+        while True:
+            with self._lock:
+                while True:
+                    if self._stopped:
+                        self._flusher = None
+                        return
+                    if not self._dirty:
+                        self._changed.wait()
+                        continue
+                    due = min(self._last_update + self.idle_delay,
+                              self._first_dirty + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+            try:
+                self.flush()
+            except Exception as e:
+                print("Error writing camera state:", e)
@@ -0,0 +1,315 @@
+# src/core/surveillance/event_recorder.py
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import queue
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional
+
+from .camera_controller import CameraController
+from .frame_stream import Frame, FrameStream
+
+# Segment file layout:
+#   SEGMENT_MAGIC
+#   JPEG frames, back to back
+#   index: one INDEX_ENTRY per frame
+#   footer: index offset, frame count, INDEX_MAGIC
+SEGMENT_MAGIC = b"SHSEG001"
+INDEX_MAGIC = b"SHIDX001"
+INDEX_ENTRY = struct.Struct("<IdQI")  # camera_id, timestamp, offset, length
+FOOTER = struct.Struct("<QI8s")  # index offset, frame count, INDEX_MAGIC
+SEGMENT_SUFFIX = ".shseg"
+# Default frame size: enough to make out a person, at a fraction of the
+# cost of the full view
+RECORDING_SIZE = 320
+# Frames waiting to be encoded beyond this are dropped
+MAX_PENDING_FRAMES = 64
+
+
+class SegmentFormatError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    camera_id: int
+    timestamp: float
+    jpeg: bytes
+
+
+@dataclass(frozen=True)
+class SegmentEntry:
+    camera_id: int
+    timestamp: float
+    offset: int
+    length: int
+
+
+def write_segment(f: BinaryIO, frames: Iterable[RecordedFrame]) -> int:
+    # Write frames as one segment and return how many were written
+    f.write(SEGMENT_MAGIC)
+    entries = []
+    for frame in frames:
+        entries.append(INDEX_ENTRY.pack(frame.camera_id, frame.timestamp,
+                                        f.tell(), len(frame.jpeg)))
+        f.write(frame.jpeg)
+    index_offset = f.tell()
+    for entry in entries:
+        f.write(entry)
+    f.write(FOOTER.pack(index_offset, len(entries), INDEX_MAGIC))
+    return len(entries)
+
+
+class SegmentReader:
+    """
+    Random access to the frames of a segment file through its index.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._f = open(path, "rb")
+        try:
+            self.entries = self._read_index()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _read_index(self) -> List[SegmentEntry]:
+        if self._f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+            raise SegmentFormatError(f"{self.path} is not a segment file")
+        self._f.seek(0, os.SEEK_END)
+        end = self._f.tell()
+        if end < len(SEGMENT_MAGIC) + FOOTER.size:
+            raise SegmentFormatError(f"{self.path} is truncated")
+        self._f.seek(end - FOOTER.size)
+        index_offset, count, magic = FOOTER.unpack(self._f.read(FOOTER.size))
+        if magic != INDEX_MAGIC or index_offset + count * INDEX_ENTRY.size != end - FOOTER.size:
+            raise SegmentFormatError(f"{self.path} has a damaged index")
+        self._f.seek(index_offset)
+        data = self._f.read(count * INDEX_ENTRY.size)
+        return [SegmentEntry(*INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size))
+                for i in range(count)]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def read(self, index: int) -> RecordedFrame:
+        entry = self.entries[index]
+        self._f.seek(entry.offset)
+        return RecordedFrame(entry.camera_id, entry.timestamp, self._f.read(entry.length))
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        for i in range(len(self.entries)):
+            yield self.read(i)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> SegmentReader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class Recording:
+    """
+    One event recording: the buffered frames from before the trigger plus
+    the frames that arrive until end. done is set once it is written, or
+    once writing failed, in which case path stays None.
+    """
+
+    reason: str
+    started: float
+    end: float
+    camera_ids: Optional[set] = None
+    frames: List[RecordedFrame] = field(default_factory=list)
+    path: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class EventRecorder:
+    """
+    Keeps the last pre_seconds of encoded frames of every camera in
+    memory and, when triggered, writes them together with the following
+    post_seconds to a segment file in directory. trigger() only takes a
+    snapshot of the buffers; encoding and writing happen on other threads,
+    so neither slows down the streaming thread that delivers the frames.
+    A recording is written once the frames queued before its end are
+    encoded.
+    At most max_recordings files are kept, the oldest are deleted first.
+    """
+
+    def __init__(self, controller: CameraController, directory: str,
+                 pre_seconds: float = 5.0, post_seconds: float = 5.0,
+                 fps: float = 2.0, size: Optional[int] = RECORDING_SIZE,
+                 max_recordings: int = 20, jpeg_quality: int = 70) -> None:
+        self.controller = controller
+        self.directory = directory
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.fps = fps
+        self.size = size
+        self.max_recordings = max_recordings
+        self.jpeg_quality = jpeg_quality
+        self._buffers: Dict[int, Deque[RecordedFrame]] = {}
+        self._streams: Dict[int, FrameStream] = {}
+        self._active: Optional[Recording] = None
+        self._lock = threading.Lock()
+        # (frame, arrival time) handed from the streaming thread to the
+        # encoder, and recordings to write once the frames before them are in
+        self._pending: queue.Queue = queue.Queue()
+        self._encoder: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        # Buffer every camera the controller currently has
+        for info in self.controller.get_all_cameras_info():
+            self.add_camera(info.camera_id)
+
+    def stop(self) -> None:
+        with self._lock:
+            streams = list(self._streams.values())
+            self._streams.clear()
+        for stream in streams:
+            stream.close()
+        with self._lock:
+            encoder, self._encoder = self._encoder, None
+        if encoder is not None:
+            # Frames queued before this are still encoded
+            self._pending.put(None)
+
+    def add_camera(self, camera_id: int) -> None:
+        with self._lock:
+            if camera_id in self._streams:
+                return
+            self._buffers[camera_id] = deque(maxlen=max(1, math.ceil(self.pre_seconds * self.fps)))
+            if self._encoder is None:
+                # A queue per encoder, so that a stopped encoder's end
+                # marker cannot reach its successor
+                self._pending = queue.Queue()
+                self._encoder = threading.Thread(target=self._encode_frames,
+                                                 args=(self._pending,),
+                                                 name="event-encoder", daemon=True)
+                self._encoder.start()
+        stream = self.controller.subscribe(camera_id, self.fps, self.size, self._on_frame)
+        with self._lock:
+            self._streams[camera_id] = stream
+
+    def remove_camera(self, camera_id: int) -> None:
+        with self._lock:
+            stream = self._streams.pop(camera_id, None)
+            self._buffers.pop(camera_id, None)
+        if stream is not None:
+            stream.close()
+
+    def trigger(self, reason: str = "", camera_ids: Optional[Iterable[int]] = None) -> Recording:
+        # Start a recording, or return the one in progress. Never blocks on
+        # encoding or disk I/O, so it can be called from the detection loop.
+        now = time.time()
+        with self._lock:
+            if self._active is not None:
+                return self._active
+            wanted = set(camera_ids) if camera_ids is not None else None
+            recording = Recording(reason, now, now + self.post_seconds, wanted)
+            recording.frames = sorted(
+                (frame for cid, buffer in self._buffers.items()
+                 if wanted is None or cid in wanted
+                 for frame in buffer),
+                key=lambda frame: frame.timestamp)
+            self._active = recording
+        timer = threading.Timer(self.post_seconds, self._end, args=(recording,))
+        timer.daemon = True
+        timer.start()
+        return recording
+
+    def recordings(self) -> List[str]:
+        # Paths of the written recordings, oldest first
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def _on_frame(self, frame: Frame) -> None:
+        # Runs on the streaming thread: only queue the frame for encoding
+        if self._pending.qsize() >= MAX_PENDING_FRAMES:
+            self.dropped += 1
+            return
+        self._pending.put((frame, time.time()))
+
+    def _end(self, recording: Recording) -> None:
+        # Timer: frames still waiting for the encoder belong to the
+        # recording, so it is written after them on the encoder thread
+        with self._lock:
+            if self._encoder is not None:
+                self._pending.put(recording)
+                return
+        self._finish(recording)
+
+    def _encode_frames(self, pending: queue.Queue) -> None:
+        # Encoder thread
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            try:
+                if isinstance(item, Recording):
+                    self._finish(item)
+                else:
+                    self._encode(*item)
+            except Exception as e:
+                print("Error recording camera frames:", e)
+
+    def _encode(self, frame: Frame, timestamp: float) -> None:
+        buffer = io.BytesIO()
+        frame.image.convert("RGB").save(buffer, "JPEG", quality=self.jpeg_quality)
+        recorded = RecordedFrame(frame.camera_id, timestamp, buffer.getvalue())
+        with self._lock:
+            ring = self._buffers.get(frame.camera_id)
+            if ring is not None:
+                ring.append(recorded)
+            active = self._active
+            if active is not None and recorded.timestamp <= active.end and (
+                    active.camera_ids is None or frame.camera_id in active.camera_ids):
+                active.frames.append(recorded)
+
+    def _finish(self, recording: Recording) -> None:
+        with self._lock:
+            if self._active is recording:
+                self._active = None
+        name = datetime.fromtimestamp(recording.started).strftime("event-%Y%m%d-%H%M%S-%f")
+        path = os.path.join(self.directory, name + SEGMENT_SUFFIX)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write under a temporary name so readers never see a partial file
+            with open(path + ".tmp", "wb") as f:
+                write_segment(f, recording.frames)
+            os.replace(path + ".tmp", path)
+            recording.path = path
+            self._evict()
+        except OSError as e:
+            print("Error writing event recording:", e)
+            try:
+                os.remove(path + ".tmp")
+            except OSError:
+                pass
+        finally:
+            # path stays None if the recording could not be written
+            recording.done.set()
+
+    def _evict(self) -> None:
+        paths = self.recordings()
+        for path in paths[:max(0, len(paths) - self.max_recordings)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,262 @@
+# src/core/surveillance/frame_stream.py
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Condition, Event, Lock, Thread, current_thread
+from typing import Callable, Dict, List, Optional, Tuple
+from PIL import Image
+
+from .camera_exceptions import CameraDisabledError, CameraNotFoundError
+from .safehome_camera import SafeHomeCamera
+
+# (camera_id, size); size None is the full view
+ChannelKey = Tuple[int, Optional[int]]
+# Renders a camera's view at a size, e.g. CameraController's quality-aware render
+RenderView = Callable[[SafeHomeCamera, Optional[int]], Image.Image]
+# Highest frame rate a camera may currently be streamed at, None for no limit
+FpsLimit = Callable[[int], Optional[float]]
+
+
+def _display_view(camera: SafeHomeCamera, size: Optional[int]) -> Image.Image:
+    return camera.display_view(size)
+
+
+def _no_limit(camera_id: int) -> Optional[float]:
+    return None
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    One rendered camera frame. image is shared by every subscriber of
+    the same camera and size, so it must not be modified.
+    """
+
+    camera_id: int
+    version: int
+    image: Image.Image
+
+
+class FrameStream:
+    """
+    Subscription to the frames of one camera at one size.
+    Iterate over it (or call get) to receive frames; only the newest
+    undelivered frame is kept, older ones are dropped. With a callback,
+    frames are instead passed to it on the streaming thread.
+    """
+
+    def __init__(self, streamer: FrameStreamer, camera_id: int, fps: float,
+                 size: Optional[int],
+                 callback: Optional[Callable[[Frame], None]] = None) -> None:
+        self.camera_id = camera_id
+        self.fps = fps
+        self.size = size
+        self.interval = 1.0 / fps
+        self.dropped = 0
+        self._streamer = streamer
+        self._callback = callback
+        self._cond = Condition()
+        self._pending: Optional[Frame] = None
+        self._closed = False
+        self._last_sent = float("-inf")
+        self._last_version: Optional[int] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        # Next new frame, or None on timeout or once the stream is closed
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending is not None or self._closed, timeout)
+            frame, self._pending = self._pending, None
+            return frame
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Frame:
+        frame = self.get()
+        if frame is None:
+            raise StopIteration
+        return frame
+
+    def close(self) -> None:
+        self._streamer.unsubscribe(self)
+        self._end()
+
+    def __enter__(self) -> FrameStream:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _end(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _offer(self, frame: Frame, now: float) -> None:
+        # Called by the streaming thread with the channel's latest frame
+        if self._closed or frame.version == self._last_version:
+            return
+        if now - self._last_sent < self.interval:
+            return
+        self._last_sent = now
+        self._last_version = frame.version
+        if self._callback is not None:
+            try:
+                self._callback(frame)
+            except Exception:
+                # A failing consumer must not stop the other streams
+                self.close()
+            return
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self._cond.notify_all()
+
+
+class FrameStreamer:
+    """
+    Renders frames for all subscriptions on one thread.
+    Subscribers of the same camera and size share one render per frame
+    version; cameras without subscribers are not rendered at all, and the
+    thread exits when the last subscription is closed. max_fps can lower
+    a camera's frame rate below what its subscribers asked for.
+    """
+
+    def __init__(self, get_camera: Callable[[int], SafeHomeCamera],
+                 render: Optional[RenderView] = None,
+                 max_fps: Optional[FpsLimit] = None) -> None:
+        self._get_camera = get_camera
+        self._render_view = render or _display_view
+        self._max_fps = max_fps or _no_limit
+        self._channels: Dict[ChannelKey, List[FrameStream]] = {}
+        self._latest: Dict[ChannelKey, Frame] = {}
+        self._due: Dict[ChannelKey, float] = {}
+        self._lock = Lock()
+        self._wake = Event()
+        self._thread: Optional[Thread] = None
+
+    def subscribe(self, camera_id: int, fps: float = 10.0, size: Optional[int] = None,
+                  callback: Optional[Callable[[Frame], None]] = None) -> FrameStream:
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}.")
+        self._get_camera(camera_id)
+        stream = FrameStream(self, camera_id, fps, size, callback)
+        key = (camera_id, size)
+        with self._lock:
+            self._channels.setdefault(key, []).append(stream)
+            # Render for the new subscriber right away
+            self._due[key] = 0.0
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="camera-stream", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return stream
+
+    def unsubscribe(self, stream: FrameStream) -> None:
+        key = (stream.camera_id, stream.size)
+        with self._lock:
+            streams = self._channels.get(key, [])
+            if stream in streams:
+                streams.remove(stream)
+            if not streams:
+                self._channels.pop(key, None)
+                self._latest.pop(key, None)
+                self._due.pop(key, None)
+        self._wake.set()
+
+    def subscriber_count(self, camera_id: Optional[int] = None) -> int:
+        with self._lock:
+            return sum(len(streams) for (cid, _), streams in self._channels.items()
+                       if camera_id is None or cid == camera_id)
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def close(self) -> None:
+        # Close every subscription; the thread exits on its own
+        with self._lock:
+            streams = [s for group in self._channels.values() for s in group]
+        for stream in streams:
+            stream.close()
+
+    def _run(self) -> None:
+        try:
+            self._stream_frames()
+        finally:
+            # Normally cleared together with the last channel; this covers
+            # an unexpected error, so that the next subscribe starts a thread
+            with self._lock:
+                if self._thread is current_thread():
+                    self._thread = None
+
+    def _stream_frames(self) -> None:
+        while True:
+            self._wake.clear()
+            with self._lock:
+                if not self._channels:
+                    self._thread = None
+                    return
+                channels = {key: list(streams) for key, streams in self._channels.items()}
+
+            now = time.monotonic()
+            next_due = now + 1.0
+            for key, streams in channels.items():
+                with self._lock:
+                    due = self._due.get(key)
+                if due is None:
+                    continue
+                if now >= due:
+                    due = now + self._interval(key[0], streams)
+                    frame = self._render(key, streams)
+                    with self._lock:
+                        if key in self._channels:
+                            self._due[key] = due
+                            if frame is not None:
+                                self._latest[key] = frame
+                            frame = self._latest.get(key)
+                    if frame is not None:
+                        for stream in streams:
+                            stream._offer(frame, now)
+                next_due = min(next_due, due)
+
+            self._wake.wait(max(0.0, next_due - time.monotonic()))
+
+    def _interval(self, camera_id: int, streams: List[FrameStream]) -> float:
+        # Time until the channel is rendered again: as often as its most
+        # demanding subscriber asks, but not above the camera's limit
+        interval = min(s.interval for s in streams)
+        limit = self._max_fps(camera_id)
+        if limit is not None:
+            interval = max(interval, 1.0 / limit)
+        return interval
+
+    def _render(self, key: ChannelKey, streams: List[FrameStream]) -> Optional[Frame]:
+        # New frame for the channel, or None if the camera has not changed
+        camera_id, size = key
+        try:
+            camera = self._get_camera(camera_id)
+        except CameraNotFoundError:
+            for stream in streams:
+                stream.close()
+            return None
+        version = camera.get_frame_version()
+        with self._lock:
+            latest = self._latest.get(key)
+        if latest is not None and latest.version == version:
+            return None
+        try:
+            image = self._render_view(camera, size)
+        except CameraDisabledError:
+            return None
+        except Exception as e:
+            # Keep streaming the other channels; retried when next due
+            print(f"Error rendering camera {camera_id}:", e)
+            return None
+        return Frame(camera_id, version, image)
@@ -0,0 +1,406 @@
+# src/core/surveillance/mjpeg_server.py
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from PIL import Image
+
+from .camera_controller import CameraController
+from .camera_exceptions import CameraDisabledError, CameraNotFoundError
+from .frame_stream import Frame, FrameStream
+from .thumbnail_cache import THUMBNAIL_SIZE
+
+BOUNDARY = "safehomeframe"
+MAX_REQUEST_BYTES = 8192
+MAX_VIEW_SIZE = 1000
+# Default cap on the memory held by cached JPEG encodings
+DEFAULT_JPEG_CACHE_BYTES = 8 * 1024 * 1024
+
+_SNAPSHOT = re.compile(r"^/cameras/(\d+)/snapshot\.jpg$")
+_STREAM = re.compile(r"^/cameras/(\d+)/stream\.mjpg$")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str = "") -> None:
+        super().__init__(message or _REASONS.get(status, ""))
+        self.status = status
+
+
+class JpegCache:
+    """
+    Latest JPEG encoding per (camera_id, size). A frame is encoded at
+    most once per frame version, however many clients ask for it.
+    Least recently used entries are evicted once the total size goes
+    over max_bytes.
+    """
+
+    def __init__(self, quality: int = 80, max_bytes: int = DEFAULT_JPEG_CACHE_BYTES) -> None:
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.encodes = 0
+        self._entries: OrderedDict[Tuple[int, Optional[int]], Tuple[int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, camera_id: int, size: Optional[int], version: int) -> Optional[bytes]:
+        key = (camera_id, size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def encode(self, camera_id: int, size: Optional[int], version: int,
+               image: Image.Image) -> bytes:
+        data = self.get(camera_id, size, version)
+        if data is not None:
+            return data
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, "JPEG", quality=self.quality)
+        data = buffer.getvalue()
+        key = (camera_id, size)
+        with self._lock:
+            self.encodes += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[1])
+            if len(data) <= self.max_bytes:
+                self._entries[key] = (version, data)
+                self.total_bytes += len(data)
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.total_bytes -= len(evicted)
+        return data
+
+
+class _Broadcast:
+    """
+    One frame subscription shared by every client streaming the same
+    camera at the same size. Lives on the server's event loop.
+    """
+
+    def __init__(self) -> None:
+        self.stream: Optional[FrameStream] = None
+        self.clients = 0
+        self.version: Optional[int] = None
+        self.data: Optional[bytes] = None
+        self.changed = asyncio.Event()
+
+    def publish(self, version: int, data: bytes) -> None:
+        self.version = version
+        self.data = data
+        # Wake every waiting client; later waiters get a fresh event
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class MJPEGServer:
+    """
+    Local HTTP server that streams camera frames to remote viewers.
+
+    GET /cameras                          JSON list of cameras
+    GET /cameras/<id>/snapshot.jpg        single JPEG (?size=, default 160)
+    GET /cameras/<id>/stream.mjpg         MJPEG stream (?size=, ?fps=)
+
+    Password protected cameras need ?password= or an X-Camera-Password
+    header. Frames are encoded once per version and the bytes are shared
+    by all clients; slow clients skip to the newest frame.
+    """
+
+    def __init__(self, controller: CameraController, host: str = "127.0.0.1",
+                 port: int = 8080, max_connections: int = 16, max_fps: float = 10.0,
+                 jpeg_quality: int = 80) -> None:
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_fps = max_fps
+        self.jpegs = JpegCache(jpeg_quality)
+        self.connections = 0
+        self._broadcasts: Dict[Tuple[int, Optional[int]], _Broadcast] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: set = set()
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Report the real port when bound to port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        # Streams never end on their own, and wait_closed() waits for them
+        for task in list(self._clients):
+            task.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        for broadcast in self._broadcasts.values():
+            if broadcast.stream is not None:
+                broadcast.stream.close()
+        self._broadcasts.clear()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def start_in_thread(self) -> None:
+        # Run the server on its own event loop thread, for the Tk app
+        started = threading.Event()
+        errors = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.stop())
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="mjpeg-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+
+    def stop_thread(self) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._clients.add(task)
+        self.connections += 1
+        try:
+            if self.connections > self.max_connections:
+                raise HttpError(503, "Too many connections")
+            await self._dispatch(reader, writer)
+        except HttpError as e:
+            await self._send_error(writer, e)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections -= 1
+            self._clients.discard(task)
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise HttpError(400, "Request too large")
+        if len(head) > MAX_REQUEST_BYTES:
+            raise HttpError(400, "Request too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        if method != "GET":
+            raise HttpError(405)
+
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/cameras":
+            await self._send_camera_list(writer)
+            return
+        match = _SNAPSHOT.match(url.path)
+        if match:
+            camera_id = self._authorize(int(match.group(1)), query, headers)
+            size = self._size(query, THUMBNAIL_SIZE)
+            await self._send_snapshot(writer, camera_id, size)
+            return
+        match = _STREAM.match(url.path)
+        if match:
+            camera_id = self._authorize(int(match.group(1)), query, headers)
+            size = self._size(query, None)
+            fps = self._fps(query)
+            await self._send_stream(reader, writer, camera_id, size, fps)
+            return
+        raise HttpError(404)
+
+    def _authorize(self, camera_id: int, query: dict, headers: dict) -> int:
+        try:
+            info = self.controller.get_camera_info(camera_id)
+        except CameraNotFoundError:
+            raise HttpError(404, f"No camera with id {camera_id}")
+        if info.has_password:
+            password = query.get("password", headers.get("x-camera-password", ""))
+            if not self.controller.validate_camera_password(camera_id, password):
+                raise HttpError(403, "Wrong camera password")
+        if not info.enabled:
+            raise HttpError(409, f"Camera {camera_id} is disabled")
+        return camera_id
+
+    def _size(self, query: dict, default: Optional[int]) -> Optional[int]:
+        if "size" not in query:
+            return default
+        try:
+            size = int(query["size"])
+        except ValueError:
+            raise HttpError(400, "size must be an integer")
+        if not 1 <= size <= MAX_VIEW_SIZE:
+            raise HttpError(400, f"size must be between 1 and {MAX_VIEW_SIZE}")
+        return size
+
+    def _fps(self, query: dict) -> float:
+        try:
+            fps = float(query.get("fps", self.max_fps))
+        except ValueError:
+            raise HttpError(400, "fps must be a number")
+        if fps <= 0:
+            raise HttpError(400, "fps must be positive")
+        return min(fps, self.max_fps)
+
+    async def _send_camera_list(self, writer: asyncio.StreamWriter) -> None:
+        cameras = [asdict(info) for info in self.controller.get_all_cameras_info()]
+        await self._send(writer, 200, "application/json", json.dumps(cameras).encode())
+
+    async def _send_snapshot(self, writer: asyncio.StreamWriter, camera_id: int,
+                             size: int) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(None, self._snapshot, camera_id, size)
+        except CameraNotFoundError:
+            raise HttpError(404, f"No camera with id {camera_id}")
+        except CameraDisabledError:
+            raise HttpError(409, f"Camera {camera_id} is disabled")
+        await self._send(writer, 200, "image/jpeg", data)
+
+    def _snapshot(self, camera_id: int, size: int) -> bytes:
+        version = self.controller.get_frame_version(camera_id)
+        data = self.jpegs.get(camera_id, size, version)
+        if data is None:
+            image = self.controller.get_single_view(camera_id, size)
+            data = self.jpegs.encode(camera_id, size, version, image)
+        return data
+
+    async def _send_stream(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter, camera_id: int,
+                           size: Optional[int], fps: float) -> None:
+        broadcast = self._join(camera_id, size)
+        # Viewers send nothing after the request, so EOF means they left
+        disconnected = asyncio.ensure_future(reader.read())
+        try:
+            writer.write(
+                "HTTP/1.1 200 OK\r\n"
+                f"Content-Type: multipart/x-mixed-replace; boundary={BOUNDARY}\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Connection: close\r\n\r\n".encode())
+            await writer.drain()
+            interval = 1.0 / fps
+            sent = None
+            while True:
+                changed = broadcast.changed
+                if broadcast.data is not None and broadcast.version != sent:
+                    sent = broadcast.version
+                    data = broadcast.data
+                    writer.write(
+                        f"--{BOUNDARY}\r\n"
+                        "Content-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(data)}\r\n\r\n".encode()
+                        + data + b"\r\n")
+                    # A slow client waits here while newer frames replace
+                    # broadcast.data, so it resumes with the latest one
+                    await writer.drain()
+                    await asyncio.sleep(interval)
+                    if disconnected.done():
+                        return
+                    continue
+                if broadcast.stream.closed or disconnected.done():
+                    return
+                waiter = asyncio.ensure_future(changed.wait())
+                await asyncio.wait({waiter, disconnected}, timeout=1.0,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+        finally:
+            disconnected.cancel()
+            self._leave(camera_id, size, broadcast)
+
+    def _join(self, camera_id: int, size: Optional[int]) -> _Broadcast:
+        key = (camera_id, size)
+        broadcast = self._broadcasts.get(key)
+        if broadcast is None:
+            broadcast = _Broadcast()
+            loop = self._loop
+
+            def on_frame(frame: Frame) -> None:
+                # Runs on the streaming thread: encode there, publish on the loop
+                data = self.jpegs.encode(camera_id, size, frame.version, frame.image)
+                loop.call_soon_threadsafe(broadcast.publish, frame.version, data)
+
+            broadcast.stream = self.controller.subscribe(camera_id, self.max_fps, size, on_frame)
+            self._broadcasts[key] = broadcast
+        broadcast.clients += 1
+        return broadcast
+
+    def _leave(self, camera_id: int, size: Optional[int], broadcast: _Broadcast) -> None:
+        broadcast.clients -= 1
+        if broadcast.clients == 0:
+            broadcast.stream.close()
+            self._broadcasts.pop((camera_id, size), None)
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int,
+                    content_type: str, body: bytes) -> None:
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def _send_error(self, writer: asyncio.StreamWriter, error: HttpError) -> None:
+        try:
+            await self._send(writer, error.status, "text/plain; charset=utf-8",
+                             str(error).encode())
+        except ConnectionError:
+            pass
@@ -0,0 +1,108 @@
+# src/core/surveillance/render_pool.py
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Dict, List, Mapping, Optional, Union
+from PIL import Image
+
+RenderJob = Callable[[], Image.Image]
+
+
+def default_workers() -> int:
+    # Crop/resize release the GIL, so one worker per core keeps them busy
+    return min(8, os.cpu_count() or 1)
+
+
+@dataclass
+class RenderBatch:
+    """
+    Result of rendering several cameras at once.
+    Cameras that missed their deadline are listed in timed_out, cameras
+    whose render raised are in errors with the exception.
+    """
+
+    images: Dict[int, Image.Image] = field(default_factory=dict)
+    timed_out: List[int] = field(default_factory=list)
+    errors: Dict[int, BaseException] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.timed_out and not self.errors
+
+
+class CameraRenderPool:
+    """
+    Renders camera views on a bounded pool of worker threads.
+    At most max_workers renders run at the same time; further jobs wait
+    in the pool's queue.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or default_workers()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads are only started once something is rendered
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="camera-render",
+                )
+            return self._executor
+
+    def submit(self, render: RenderJob) -> Future:
+        return self._get_executor().submit(render)
+
+    def submit_all(self, jobs: Mapping[int, RenderJob]) -> Dict[int, Future]:
+        # One future per camera id
+        return {cid: self.submit(render) for cid, render in jobs.items()}
+
+    def render_all(
+            self,
+            jobs: Mapping[int, RenderJob],
+            timeout: Union[None, float, Mapping[int, float]] = None,
+    ) -> RenderBatch:
+        # Render every job and wait for the results. timeout is either one
+        # deadline (seconds from now) for all cameras or one per camera id;
+        # None waits for everything. Renders that have not started by their
+        # deadline are cancelled.
+        start = time.monotonic()
+        futures = self.submit_all(jobs)
+        deadlines = {cid: _deadline(start, timeout, cid) for cid in futures}
+
+        batch = RenderBatch()
+        for cid in sorted(futures, key=lambda c: deadlines[c]):
+            future = futures[cid]
+            remaining = None
+            if deadlines[cid] != float("inf"):
+                remaining = max(0.0, deadlines[cid] - time.monotonic())
+            try:
+                batch.images[cid] = future.result(timeout=remaining)
+            except TimeoutError:
+                future.cancel()
+                batch.timed_out.append(cid)
+            except Exception as e:
+                batch.errors[cid] = e
+        return batch
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _deadline(start: float, timeout: Union[None, float, Mapping[int, float]],
+              camera_id: int) -> float:
+    if isinstance(timeout, Mapping):
+        timeout = timeout.get(camera_id)
+    if timeout is None:
+        return float("inf")
+    return start + timeout
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Tuple
+from typing import Optional, Tuple
 from .camera_exceptions import (
     InvalidLocationError,
     CameraDisabledError
 )
 from PIL import Image
 
-from device.device_camera import DeviceCamera
+from device.device_camera import DeviceCamera, QUALITY_BILINEAR, QUALITY_LANCZOS
+from .thumbnail_cache import THUMBNAIL_SIZE
 
 
 @dataclass
@@ -78,17 +79,27 @@ class SafeHomeCamera:
         # Disable this camera
         self.enabled = False
 
-    def display_view(self) -> Image.Image:
+    def display_view(self, size: Optional[int] = None,
+                     quality: str = QUALITY_LANCZOS) -> Image.Image:
         # Display a still image from this camera.
+        # size renders a smaller view directly instead of the full one
         if not self.enabled:
             raise CameraDisabledError(
                 f"Camera {self.camera_id} is disabled and cannot provide a view."
             )
-        image = self.hardware_camera.get_view()
+        if size is None:
+            return self.hardware_camera.get_view()
+        image = self.hardware_camera.get_view(size=size, quality=quality)
         return image
 
-    def display_thumbnail(self) -> Image.Image:
-        return self.display_view().resize((160, 160))
+    def get_frame_version(self) -> int:
+        # Version of the hardware camera's current frame
+        return self.hardware_camera.get_frame_version()
+
+    def display_thumbnail(self, quality: str = QUALITY_BILINEAR) -> Image.Image:
+        # Rendered at thumbnail size from the source, not shrunk from
+        # the full view
+        return self.display_view(size=THUMBNAIL_SIZE, quality=quality)
 
     def zoom_in(self) -> bool:
         # Attempt to zoom in in the hardware camera
@@ -151,6 +162,20 @@ class SafeHomeCamera:
         # Return current password for this camera (if any).
         return self.password
 
+    def start(self) -> None:
+        # Resumes the camera after stop() or close()
+        self.hardware_camera.start()
+
     def stop(self) -> None:
         # Stops current camera's threading
         self.hardware_camera.stop()
+
+    def close(self) -> None:
+        # Stops the camera and releases its images
+        self.hardware_camera.close()
+
+    def __enter__(self) -> SafeHomeCamera:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,117 @@
+# src/core/surveillance/thumbnail_cache.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+THUMBNAIL_SIZE = 160
+# Default cap on the memory held by cached thumbnails (about 64 RGB
+# thumbnails of 160x160)
+DEFAULT_MAX_BYTES = 64 * THUMBNAIL_SIZE * THUMBNAIL_SIZE * 3
+
+
+@lru_cache(maxsize=None)
+def placeholder(text: str, size: int = THUMBNAIL_SIZE) -> Image.Image:
+    # Black square with centered white text, built once per (text, size).
+    # The image is shared between callers, so it must not be modified.
+    image = Image.new("RGB", (size, size), "black")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    x = (size - text_width) / 2
+    y = (size - text_height) / 2
+
+    draw.text((x, y), text, font=font, fill="white")
+    return image
+
+
+def locked_placeholder() -> Image.Image:
+    return placeholder("Locked")
+
+
+def disabled_placeholder() -> Image.Image:
+    return placeholder("Disabled")
+
+
+def image_bytes(image: Image.Image) -> int:
+    # Approximate memory used by the pixel data of an image
+    return image.width * image.height * len(image.getbands())
+
+
+class ThumbnailCache:
+    """
+    Per-camera thumbnails, each stored with the frame version it was
+    rendered from. Least recently used entries are evicted once the
+    total size goes over max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._entries: OrderedDict[int, Tuple[int, Image.Image]] = OrderedDict()
+        self._lock = Lock()
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+
+    def get(self, camera_id: int, frame_version: int) -> Optional[Image.Image]:
+        # Cached thumbnail of the camera, if it was rendered from frame_version
+        with self._lock:
+            entry = self._entries.get(camera_id)
+            if entry is None or entry[0] != frame_version:
+                return None
+            self._entries.move_to_end(camera_id)
+            return entry[1]
+
+    def peek(self, camera_id: int) -> Optional[Tuple[int, Image.Image]]:
+        # Cached (frame version, thumbnail) of the camera, even if outdated
+        with self._lock:
+            return self._entries.get(camera_id)
+
+    def put(self, camera_id: int, frame_version: int, image: Image.Image) -> None:
+        with self._lock:
+            self._discard(camera_id)
+            size = image_bytes(image)
+            if size > self.max_bytes:
+                return
+            self._entries[camera_id] = (frame_version, image)
+            self.total_bytes += size
+            self._evict()
+
+    def invalidate(self, camera_id: Optional[int] = None) -> None:
+        # Drop the thumbnail of one camera, or of every camera
+        with self._lock:
+            if camera_id is None:
+                self._entries.clear()
+                self.total_bytes = 0
+            else:
+                self._discard(camera_id)
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, camera_id: int) -> None:
+        entry = self._entries.pop(camera_id, None)
+        if entry is not None:
+            self.total_bytes -= image_bytes(entry[1])
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, (_, image) = self._entries.popitem(last=False)
+            self.total_bytes -= image_bytes(image)
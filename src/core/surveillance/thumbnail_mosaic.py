@@ -0,0 +1,135 @@
+# src/core/surveillance/thumbnail_mosaic.py
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+from .thumbnail_cache import THUMBNAIL_SIZE
+
+Box = Tuple[int, int, int, int]
+
+BACKGROUND = (217, 217, 217)
+LABEL_COLOR = (0, 0, 0)
+
+
+class ThumbnailMosaic:
+    """
+    All camera thumbnails composited into one image, laid out in a grid
+    of columns cells, each with a "Camera N" label above the thumbnail.
+    The image is allocated once per grid size and updated in place: a
+    cell is only redrawn when its camera or its thumbnail object changed.
+    Since cached thumbnails and placeholders are shared objects, an
+    unchanged camera hands in the very same image and costs nothing.
+    """
+
+    def __init__(self, columns: int = 3, tile_size: int = THUMBNAIL_SIZE,
+                 padding: int = 10, label_height: int = 20) -> None:
+        if columns < 1:
+            raise ValueError(f"columns must be at least 1, got {columns}.")
+        self.columns = columns
+        self.tile_size = tile_size
+        self.padding = padding
+        self.label_height = label_height
+        self.image = Image.new("RGB", (0, 0), BACKGROUND)
+        # Box of every camera's thumbnail in image
+        self.tiles: Dict[int, Box] = {}
+        # Boxes redrawn by the last update
+        self.dirty: List[Box] = []
+        # Increases whenever the image changes
+        self.version = 0
+        self._slots: List[Optional[int]] = []
+        self._shown: Dict[int, Image.Image] = {}
+        self._font = ImageFont.load_default()
+        self._lock = Lock()
+
+    @property
+    def cell_width(self) -> int:
+        return self.tile_size + 2 * self.padding
+
+    @property
+    def cell_height(self) -> int:
+        return self.label_height + self.tile_size + 2 * self.padding
+
+    def update(self, thumbnails: Dict[int, Image.Image]) -> List[Box]:
+        # Bring the mosaic up to date with thumbnails (camera id -> image,
+        # in display order) and return the boxes that were redrawn
+        with self._lock:
+            order = list(thumbnails)
+            rows = (len(order) + self.columns - 1) // self.columns
+            size = (self.columns * self.cell_width if order else 0,
+                    rows * self.cell_height)
+            dirty: List[Box] = []
+            if size != self.image.size:
+                self.image = Image.new("RGB", size, BACKGROUND)
+                self._slots = []
+                self._shown.clear()
+                dirty.append((0, 0) + size)
+
+            draw = ImageDraw.Draw(self.image)
+            slots = self._slots + [None] * (len(order) - len(self._slots))
+            for index, cid in enumerate(order):
+                box = self._cell_box(index)
+                if slots[index] != cid:
+                    # Camera moved into this cell: redraw the label as well
+                    draw.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=BACKGROUND)
+                    draw.text((box[0] + self.padding, box[1] + self.padding),
+                              f"Camera {cid}", font=self._font, fill=LABEL_COLOR)
+                    self._shown.pop(cid, None)
+                    dirty.append(box)
+                image = thumbnails[cid]
+                if self._shown.get(cid) is not image:
+                    tile = self._tile_box(index)
+                    self._paste(image, tile)
+                    self._shown[cid] = image
+                    dirty.append(tile)
+            # Cells past the end of a shorter list
+            for index in range(len(order), len(slots)):
+                if slots[index] is not None:
+                    box = self._cell_box(index)
+                    draw.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=BACKGROUND)
+                    dirty.append(box)
+
+            self._slots = order
+            for cid in set(self._shown) - set(order):
+                del self._shown[cid]
+            self.tiles = {cid: self._tile_box(i) for i, cid in enumerate(order)}
+            self.dirty = dirty
+            if dirty:
+                self.version += 1
+            return dirty
+
+    def camera_at(self, x: int, y: int) -> Optional[int]:
+        # Id of the camera whose cell contains the point, e.g. a click
+        if x < 0 or y < 0:
+            return None
+        index = (y // self.cell_height) * self.columns + x // self.cell_width
+        if x >= self.columns * self.cell_width or index >= len(self._slots):
+            return None
+        return self._slots[index]
+
+    def _cell_box(self, index: int) -> Box:
+        row, col = divmod(index, self.columns)
+        left, top = col * self.cell_width, row * self.cell_height
+        return (left, top, left + self.cell_width, top + self.cell_height)
+
+    def _tile_box(self, index: int) -> Box:
+        left, top, _, _ = self._cell_box(index)
+        left += self.padding
+        top += self.padding + self.label_height
+        return (left, top, left + self.tile_size, top + self.tile_size)
+
+    def _paste(self, image: Image.Image, box: Box) -> None:
+        # Center the thumbnail in its tile, shrinking it if it is too big
+        if image.width > self.tile_size or image.height > self.tile_size:
+            image = image.copy()
+            image.thumbnail((self.tile_size, self.tile_size))
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        left, top, right, bottom = box
+        if image.size != (self.tile_size, self.tile_size):
+            ImageDraw.Draw(self.image).rectangle((left, top, right - 1, bottom - 1),
+                                                 fill=BACKGROUND)
+        self.image.paste(image, (left + (self.tile_size - image.width) // 2,
+                                 top + (self.tile_size - image.height) // 2))
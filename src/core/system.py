@@ -2,7 +2,10 @@ from core.log.log_manager import LogManager
 from core.login.login_manager import LoginManager
 from core.security.security_manager import SecurityManager
 from core.setting.system_setting_manager import SystemSettingsManager
+from core.setting.setting_cache import SystemSettingsCache, ControlPanelSettingsCache
 from core.surveillance.camera_controller import CameraController
+from core.surveillance.camera_write_buffer import BufferedCameraDB
+from core.surveillance.event_recorder import EventRecorder
 
 from core.security.security_memory_database import SecurityMemoryDatabase
 from storage.camera_storage_memory import CameraMemoryDB
@@ -52,6 +55,12 @@ class System:
             self.password_db = PasswordMemoryDB()
             self.cp_settings_db = ControlPanelSettingsMemoryDB()
 
+        # keep hot settings reads (panic call, keypad login) off the storage
+        self.settings_db = SystemSettingsCache(self.settings_db)
+        self.cp_settings_db = ControlPanelSettingsCache(self.cp_settings_db)
+        # coalesce pan/zoom/enable writes so camera control never waits on storage
+        self.camera_db = BufferedCameraDB(self.camera_db)
+
         self.session_db = SessionMemoryDB()
 
         self.current_system_settings_manager = SystemSettingsManager(
@@ -71,6 +80,15 @@ class System:
             self.security_db, self.current_log_manager)
         self.login_manager = LoginManager(
             self.password_db, self.session_db, self.cp_settings_db)
+        self._attach_event_recorder()
+
+    def _attach_event_recorder(self):
+        # Footage around each intrusion; cameras are buffered while the system is on
+        self.event_recorder = EventRecorder(
+            self.current_camera_controller, "recordings")
+        self.current_security_manager.add_intrusion_listener(
+            lambda sensors: self.event_recorder.trigger(
+                "intrusion " + str([s.get_id() for s in sensors])))
 
     def _poll_loop(self):
         if not self.on:
@@ -83,6 +101,7 @@ class System:
 
     def turn_on(self):
         self.on = True
+        self.event_recorder.start()
         if self.current_app:
             self.current_app.back_to_login()
             self.current_app.deiconify()
@@ -94,6 +113,8 @@ class System:
 
     def turn_off(self):
         self.on = False
+        self.event_recorder.stop()
+        self.camera_db.flush()
         if self._poll_after_id and self.current_app:
             try:
                 self.current_app.after_cancel(self._poll_after_id)
@@ -105,13 +126,26 @@ class System:
         else:
             raise Exception("no web gui found")
 
+    def shutdown(self):
+        # Called once the application exits, with or without turn_off:
+        # write the buffered camera changes and stop the camera threads
+        self.event_recorder.stop()
+        self.current_camera_controller.close()
+        self.camera_db.close()
+
     def reset(self):
+        self.event_recorder.stop()
+        self.camera_db.discard()
         self.storage_manager.reset()
+        self.settings_db.invalidate()
+        self.cp_settings_db.invalidate()
         self.session_db = SessionMemoryDB()
 
         self.current_system_settings_manager = SystemSettingsManager(
             self.settings_db)
 
+        # Stop the old controller's cameras now rather than whenever it is collected
+        self.current_camera_controller.close()
         self.current_camera_controller = CameraController(self.camera_db)
         if not self.use_db:
             self.current_camera_controller.add_camera(
@@ -126,6 +160,9 @@ class System:
             self.security_db, self.current_log_manager)
         self.login_manager = LoginManager(
             self.password_db, self.session_db, self.cp_settings_db)
+        self._attach_event_recorder()
+        if self.on:
+            self.event_recorder.start()
 
     def poll_sensors(self):
         (_, armed_detected) = self.current_security_manager.update(True)
@@ -0,0 +1,103 @@
+import threading
+import weakref
+
+
+def live_members(weak_set):
+    """List the members of a WeakSet without iterating it in Python.
+
+    Copying the underlying set is a single C call, so a finalizer that
+    adds or removes members (e.g. a controller closing its cameras) cannot
+    run in the middle of it and break the iteration.
+    """
+    refs = weak_set.data.copy()
+    return [item for item in (ref() for ref in refs) if item is not None]
+
+
+class CameraClock:
+    """Single timer thread that advances the time of every subscribed camera.
+
+    Cameras are held through weak references, so a camera that is no longer
+    used elsewhere drops out of the clock on its own. The thread is started
+    on the first subscription (or by start()) and is the only one no matter
+    how many cameras exist.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._subscribers = weakref.WeakSet()
+        # Reentrant: garbage collection inside subscribe() can run a
+        # finalizer that stops (unsubscribes) another camera
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def subscribe(self, camera):
+        """Tick camera every interval; starts the clock if needed."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Camera clock is closed")
+            self._subscribers.add(camera)
+        self.start()
+
+    def unsubscribe(self, camera):
+        with self._lock:
+            self._subscribers.discard(camera)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the timer thread (no-op when already running)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Camera clock is closed")
+            if self.is_running():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="camera-clock", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the timer thread; subscribers are kept for a later start()."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopped.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def close(self):
+        """Stop the clock for good and drop all subscribers."""
+        self.stop()
+        with self._lock:
+            self._closed = True
+            self._subscribers = weakref.WeakSet()
+
+    def tick(self):
+        """Advance every subscribed camera by one step."""
+        with self._lock:
+            cameras = live_members(self._subscribers)
+        for camera in cameras:
+            camera._tick()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.tick()
+
+
+_shared_clock = None
+_shared_lock = threading.Lock()
+
+
+def get_camera_clock():
+    """Process-wide clock used by cameras that are not given their own."""
+    global _shared_clock
+    with _shared_lock:
+        if _shared_clock is None or _shared_clock._closed:
+            _shared_clock = CameraClock()
+        return _shared_clock
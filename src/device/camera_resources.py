@@ -0,0 +1,114 @@
+import threading
+import time
+import weakref
+
+from .camera_clock import get_camera_clock, live_members
+from .source_cache import get_source_cache
+
+# Default cap on the memory held by camera images: decoded sources plus
+# every camera's rendered frames and precomputed crops
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+# Cameras not rendered for this long drop their decoded data
+DEFAULT_IDLE_SECONDS = 30.0
+
+
+class CameraResourceManager:
+    """Keeps the images held by all cameras under one memory budget.
+
+    Cameras register themselves on creation (weakly, like the clock) and
+    record when they were last rendered. enforce() first releases the
+    decoded data of cameras idle for idle_seconds, then of the least
+    recently rendered cameras, and finally trims the shared source cache
+    until the total is under max_bytes. Released cameras reload their
+    source on their next render. Subscribed to the camera clock, so the
+    budget is checked on every tick.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, idle_seconds=DEFAULT_IDLE_SECONDS,
+                 source_cache=None):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.releases = 0
+        self._source_cache = source_cache or get_source_cache()
+        self._cameras = weakref.WeakSet()
+        # Reentrant for the same reason as the clock's: code run by garbage
+        # collection during register() may unregister cameras
+        self._lock = threading.RLock()
+
+    def register(self, camera):
+        with self._lock:
+            self._cameras.add(camera)
+
+    def unregister(self, camera):
+        with self._lock:
+            self._cameras.discard(camera)
+
+    def camera_count(self):
+        with self._lock:
+            return len(self._cameras)
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.enforce()
+
+    def usage(self):
+        cameras = self._snapshot()
+        camera_bytes = sum(c.resource_bytes() for c in cameras)
+        source_bytes = self._source_cache.stats()["total_bytes"]
+        return {
+            "cameras": len(cameras),
+            "camera_bytes": camera_bytes,
+            "source_bytes": source_bytes,
+            "total_bytes": camera_bytes + source_bytes,
+            "max_bytes": self.max_bytes,
+            "releases": self.releases,
+        }
+
+    def enforce(self, now=None):
+        """Release camera data until the budget holds; returns the release count."""
+        now = time.monotonic() if now is None else now
+        cameras = sorted(self._snapshot(), key=lambda c: c.last_used)
+        held = {c: c.resource_bytes() for c in cameras}
+        released = 0
+        for camera in cameras:
+            if now - camera.last_used >= self.idle_seconds and camera.holds_resources():
+                camera.release()
+                held[camera] = 0
+                released += 1
+
+        total = sum(held.values()) + self._source_cache.stats()["total_bytes"]
+        for camera in cameras:
+            if total <= self.max_bytes:
+                break
+            if held[camera] or camera.holds_resources():
+                camera.release()
+                total -= held[camera]
+                held[camera] = 0
+                released += 1
+
+        if total > self.max_bytes:
+            self._source_cache.trim(max(0, self.max_bytes - sum(held.values())))
+        self.releases += released
+        return released
+
+    def _snapshot(self):
+        with self._lock:
+            return live_members(self._cameras)
+
+    def _tick(self):
+        # Called by the camera clock
+        self.enforce()
+
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+
+def get_resource_manager():
+    """Process-wide manager that every DeviceCamera registers with."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = CameraResourceManager()
+            get_camera_clock().subscribe(_shared_manager)
+        return _shared_manager
@@ -1,32 +1,130 @@
 import threading
 import time
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from tkinter import messagebox
+from .camera_clock import get_camera_clock
+from .camera_resources import get_resource_manager
 from .interface_camera import InterfaceCamera
+from .source_cache import draft_scale, get_source_cache, image_bytes
 import os
 
 
-class DeviceCamera(threading.Thread, InterfaceCamera):
+# Resampling used for views by quality name. "reduce" box-averages the crop
+# by an integer factor (Image.reduce) and only resamples the remainder.
+QUALITY_NEAREST = "nearest"
+QUALITY_BILINEAR = "bilinear"
+QUALITY_LANCZOS = "lanczos"
+QUALITY_REDUCE = "reduce"
+RESAMPLE = {
+    QUALITY_NEAREST: Image.NEAREST,
+    QUALITY_BILINEAR: Image.BILINEAR,
+    QUALITY_LANCZOS: Image.LANCZOS,
+    QUALITY_REDUCE: Image.NEAREST,
+}
+
+
+def show_file_error(file_name):
+    """Default report of a missing camera source: a message box, or a
+    print where no display is available."""
+    try:
+        messagebox.showerror("File Error", f"{file_name} file open error")
+    except:
+        print(f"ERROR: {file_name} file open error")
+
+
+_file_error_handler = show_file_error
+
+
+def set_file_error_handler(handler):
+    """Report missing camera sources through handler(file_name) instead;
+    None restores show_file_error. Returns the previous handler."""
+    global _file_error_handler
+    previous, _file_error_handler = _file_error_handler, handler or show_file_error
+    return previous
+
+
+@lru_cache(maxsize=None)
+def _default_font():
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def _overlay_tile(font, text, size, quality):
+    """Pre-rendered view label, shared by every camera showing the same text.
+
+    For the full view size the label is RGBA and pasted through its own
+    alpha, so the frame shows around the rounded corners. For smaller
+    sizes it is drawn on black at full scale and shrunk, so the label
+    covers the same share of the image at every size.
+    """
+    # Measure the text once, on a scratch image
+    bbox = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+    wText = bbox[2] - bbox[0]
+    hText = bbox[3] - bbox[1]
+    w, h = wText + 11, hText + 6
+
+    if size == DeviceCamera.RETURN_SIZE:
+        tile = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    else:
+        tile = Image.new('RGB', (w, h), 'black')
+    draw = ImageDraw.Draw(tile)
+    # Rounded rectangle background (gray) with the text (cyan)
+    draw.rounded_rectangle([(0, 0), (wText + 10, hText + 5)], radius=hText // 2, fill='gray')
+    draw.text((5, 2), text, fill='cyan', font=font)
+
+    if size != DeviceCamera.RETURN_SIZE:
+        scale = size / DeviceCamera.RETURN_SIZE
+        tile = tile.resize((max(1, round(w * scale)), max(1, round(h * scale))),
+                           RESAMPLE[quality])
+    return tile
+
+
+class DeviceCamera(InterfaceCamera):
     RETURN_SIZE = 500
     SOURCE_SIZE = 200
+    PAN_RANGE = range(-5, 6)
+    ZOOM_RANGE = range(1, 10)
 
-    def __init__(self):
-        super().__init__(daemon=True)
-
+    def __init__(self, clock=None):
         self.cameraId = 0
         self.time = 0
         self.pan = 0
         self.zoom = 2
         self.imgSource = None
+        self._source_path = None
         self.centerWidth = 0
         self.centerHeight = 0
-        self._running = True
         self._lock = threading.Lock()
+        # Bumped whenever an input of the rendered frame (source, time, pan,
+        # zoom) changes. The last rendered frame is reused until it does.
+        self.frame_version = 0
+        self._frame = None
+        self._frame_version = -1
+        # Reduced-size frames by (size, quality), each with its frame version
+        self._sized_frames = {}
+        # Optional precomputed crops of the source, resized to RETURN_SIZE
+        # and without the overlay, keyed by (pan, zoom)
+        self.precompute = False
+        self._pyramid = {}
         # Font was previously missing; using a default PIL font prevents AttributeError in getView
-        self.font = ImageFont.load_default()
+        # (shared, so that cameras also share their rendered overlays)
+        self.font = _default_font()
+
+        # Decoded images count against a process-wide memory budget; the
+        # resource manager releases them when the camera sits unused
+        self.last_used = time.monotonic()
 
+        # Time is advanced by a clock shared with the other cameras
+        self._clock = clock or get_camera_clock()
         self.start()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def set_id(self, id_):
         """Set the camera ID and load associated image (synchronized)."""
         with self._lock:
@@ -34,85 +132,195 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
 
             fileName = os.path.join(os.path.dirname(os.path.dirname(__file__)), "img", f"camera{id_}.jpg")
 
+            self.frame_version += 1
+            self._pyramid = {}
             try:
-                self.imgSource = Image.open(fileName)
+                # Decoded sources are shared by every camera showing the file
+                self.imgSource = get_source_cache().load(fileName)
+                self._source_path = fileName
                 self.centerWidth = self.imgSource.width // 2
                 self.centerHeight = self.imgSource.height // 2
             except FileNotFoundError:
                 self.imgSource = None
-                try:
-                    messagebox.showerror(
-                        "File Error", f"{fileName} file open error")
-                except:
-                    print(f"ERROR: {fileName} file open error")
+                self._source_path = None
+                _file_error_handler(fileName)
                 return
 
     def get_id(self):
         """Get the camera ID."""
         return self.cameraId
 
-    def get_view(self):
-        """Get the current camera view as a PIL Image (synchronized)."""
+    def get_frame_version(self):
+        """Version of the current frame; changes whenever the view would."""
+        return self.frame_version
+
+    def has_changed_since(self, version):
+        """Whether the view differs from the one rendered at version."""
+        return self.frame_version != version
+
+    def get_view(self, size=None, quality=QUALITY_LANCZOS):
+        """Get the current camera view as a PIL Image (synchronized).
+
+        size renders a size x size view straight from the source instead of
+        the full RETURN_SIZE one; quality picks the resampling (see RESAMPLE).
+        The returned image is shared with later callers until the frame
+        changes, so it must not be modified in place.
+        """
+        if size is None:
+            size = self.RETURN_SIZE
+        if quality not in RESAMPLE:
+            raise ValueError(f"Unknown view quality: {quality}")
+        with self._lock:
+            self.last_used = time.monotonic()
+            if size == self.RETURN_SIZE and quality == QUALITY_LANCZOS:
+                if self._frame is None or self._frame_version != self.frame_version:
+                    self._frame = self._render_view()
+                    self._frame_version = self.frame_version
+                return self._frame
+
+            key = (size, quality)
+            cached = self._sized_frames.get(key)
+            if cached is not None and cached[0] == self.frame_version:
+                return cached[1]
+            # Only frames of the current version are worth keeping
+            self._sized_frames = {
+                k: v for k, v in self._sized_frames.items() if v[0] == self.frame_version}
+            frame = self._render_view(size, quality)
+            self._sized_frames[key] = (self.frame_version, frame)
+            return frame
+
+    def enable_precompute(self, background=False):
+        """Keep every resized pan/zoom crop of the source once rendered.
+
+        Crops are added as they are first requested, or all at once in a
+        background thread when background is True.
+        """
+        with self._lock:
+            self.precompute = True
+            source = self.imgSource
+        if background and source is not None:
+            threading.Thread(target=self._build_pyramid, args=(source,), daemon=True).start()
+
+    def disable_precompute(self):
+        """Stop precomputing and drop the stored crops."""
         with self._lock:
+            self.precompute = False
+            self._pyramid = {}
+
+    def _build_pyramid(self, source):
+        for zoom in self.ZOOM_RANGE:
+            for pan in self.PAN_RANGE:
+                with self._lock:
+                    if not self.precompute or self.imgSource is not source:
+                        return
+                    if (pan, zoom) in self._pyramid:
+                        continue
+                crop = self._resize_crop(source, pan, zoom)
+                with self._lock:
+                    if self.precompute and self.imgSource is source:
+                        self._pyramid[(pan, zoom)] = crop
+
+    def _crop_box(self, pan, zoom):
+        zoomed = self.SOURCE_SIZE * (10 - zoom) // 10
+        panned = pan * self.SOURCE_SIZE // 5
 
-            view = "Time = "
-            if self.time < 10:
-                view += "0"
-            view += f"{self.time}, zoom x{self.zoom}, "
+        left = self.centerWidth + panned - zoomed
+        top = self.centerHeight - zoomed
+        right = self.centerWidth + panned + zoomed
+        bottom = self.centerHeight + zoomed
+        return left, top, right, bottom
 
-            if self.pan > 0:
-                view += f"right {self.pan}"
-            elif self.pan == 0:
-                view += "center"
+    def _resize_crop(self, source, pan, zoom, size=None, quality=QUALITY_LANCZOS):
+        """Crop the source for pan/zoom and resize it to fill the view."""
+        if size is None:
+            size = self.RETURN_SIZE
+        try:
+            cropped = source.crop(self._crop_box(pan, zoom))
+            if quality == QUALITY_REDUCE:
+                factor = min(cropped.width, cropped.height) // size
+                if factor > 1:
+                    cropped = cropped.reduce(factor)
+            if cropped.size == (size, size):
+                resized = cropped
             else:
-                view += f"left {-self.pan}"
-
-            # Create the view image (500x500)
-            imgView = Image.new(
-                'RGB', (self.RETURN_SIZE, self.RETURN_SIZE), 'black')
-
-            if self.imgSource is not None:
-
-                zoomed = self.SOURCE_SIZE * (10 - self.zoom) // 10
-                panned = self.pan * self.SOURCE_SIZE // 5
-
-                left = self.centerWidth + panned - zoomed
-                top = self.centerHeight - zoomed
-                right = self.centerWidth + panned + zoomed
-                bottom = self.centerHeight + zoomed
-
-                # Crop and resize to fill the view
-                try:
-                    cropped = self.imgSource.crop((left, top, right, bottom))
-                    resized = cropped.resize(
-                        (self.RETURN_SIZE, self.RETURN_SIZE), Image.LANCZOS)
-                    imgView.paste(resized, (0, 0))
-                except Exception:
-                    # If crop fails, keep black background
-                    pass
-
-            draw = ImageDraw.Draw(imgView)
-
-            # Get text size
-            bbox = draw.textbbox((0, 0), view, font=self.font)
-            wText = bbox[2] - bbox[0]
-            hText = bbox[3] - bbox[1]
-
-            # Draw rounded rectangle background (gray)
-            rX = 0
-            rY = 0
-            draw.rounded_rectangle(
-                [(rX, rY), (rX + wText + 10, rY + hText + 5)],
-                radius=hText // 2,
-                fill='gray'
-            )
-
-            # Draw text (cyan)
-            xText = rX + 5
-            yText = rY + 2
-            draw.text((xText, yText), view, fill='cyan', font=self.font)
-
-            return imgView
+                resized = cropped.resize((size, size), RESAMPLE[quality])
+        except Exception:
+            # If crop fails, the view keeps a black background
+            return None
+        if resized.mode != 'RGB':
+            resized = resized.convert('RGB')
+        return resized
+
+    def _resize_draft_crop(self, size, quality):
+        """Like _resize_crop, but from a JPEG draft decode when the crop is
+        at least twice the requested size (caller holds the lock)."""
+        left, top, right, bottom = self._crop_box(self.pan, self.zoom)
+        scale = draft_scale(right - left, size)
+        if scale == 1 or self._source_path is None:
+            return self._resize_crop(self.imgSource, self.pan, self.zoom, size, quality)
+        try:
+            draft = get_source_cache().load(self._source_path, scale)
+        except OSError:
+            return self._resize_crop(self.imgSource, self.pan, self.zoom, size, quality)
+        # Draft mode picks the actual scale, so map the box by the real ratio
+        ratio = draft.width / self.imgSource.width
+        box = tuple(round(v * ratio) for v in (left, top, right, bottom))
+        try:
+            cropped = draft.crop(box)
+            resized = cropped.resize((size, size), RESAMPLE[quality])
+        except Exception:
+            return None
+        if resized.mode != 'RGB':
+            resized = resized.convert('RGB')
+        return resized
+
+    def _get_crop(self, size=None, quality=QUALITY_LANCZOS):
+        """Resized crop for the current pan/zoom (caller holds the lock)."""
+        if self.imgSource is None:
+            return None
+        if size not in (None, self.RETURN_SIZE) or quality != QUALITY_LANCZOS:
+            return self._resize_draft_crop(size, quality)
+        key = (self.pan, self.zoom)
+        crop = self._pyramid.get(key)
+        if crop is None:
+            crop = self._resize_crop(self.imgSource, self.pan, self.zoom)
+            if self.precompute and crop is not None:
+                self._pyramid[key] = crop
+        return crop
+
+    def _render_view(self, size=None, quality=QUALITY_LANCZOS):
+        """Render the view for the current state (caller holds the lock)."""
+        self._ensure_source()
+        if size is None:
+            size = self.RETURN_SIZE
+        view = "Time = "
+        if self.time < 10:
+            view += "0"
+        view += f"{self.time}, zoom x{self.zoom}, "
+
+        if self.pan > 0:
+            view += f"right {self.pan}"
+        elif self.pan == 0:
+            view += "center"
+        else:
+            view += f"left {-self.pan}"
+
+        # Create the view image (size x size); crops stored in the pyramid
+        # are shared, so the overlay is drawn on a copy of those
+        crop = self._get_crop(size, quality)
+        if crop is None:
+            imgView = Image.new('RGB', (size, size), 'black')
+        elif crop is self._pyramid.get((self.pan, self.zoom)):
+            imgView = crop.copy()
+        else:
+            imgView = crop
+
+        # The label depends only on the text and size, so it comes from a
+        # cache and costs one paste
+        tile = _overlay_tile(self.font, view, size, quality)
+        imgView.paste(tile, (0, 0), tile if tile.mode == 'RGBA' else None)
+
+        return imgView
 
     def pan_right(self):
         """Pan camera to the right (synchronized)."""
@@ -121,6 +329,7 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
             if self.pan > 5:
                 self.pan = 5
                 return False
+            self.frame_version += 1
             return True
 
     def pan_left(self):
@@ -130,6 +339,7 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
             if self.pan < -5:
                 self.pan += 1
                 return False
+            self.frame_version += 1
             return True
 
     def zoom_in(self):
@@ -139,6 +349,7 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
             if self.zoom > 9:
                 self.zoom -= 1
                 return False
+            self.frame_version += 1
             return True
 
     def zoom_out(self):
@@ -148,6 +359,7 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
             if self.zoom < 1:
                 self.zoom += 1
                 return False
+            self.frame_version += 1
             return True
 
     def _tick(self):
@@ -156,16 +368,56 @@ class DeviceCamera(threading.Thread, InterfaceCamera):
             self.time += 1
             if self.time >= 100:
                 self.time = 0
+            self.frame_version += 1
 
-    def run(self):
-        """Thread run method - updates time every second."""
-        while self._running:
-            try:
-                time.sleep(1.0)
-            except InterruptedError:
-                pass
-            self._tick()
+    def start(self):
+        """Start advancing time with the camera clock."""
+        get_resource_manager().register(self)
+        self._clock.subscribe(self)
 
     def stop(self):
-        """Stop the camera thread."""
-        self._running = False
+        """Stop advancing time."""
+        self._clock.unsubscribe(self)
+
+    def close(self):
+        """Stop the camera and release its images.
+
+        A closed camera can be started again; its source is then reloaded
+        on the next render.
+        """
+        self.stop()
+        self.release()
+        get_resource_manager().unregister(self)
+
+    def release(self):
+        """Drop the decoded source and rendered images until the next render."""
+        with self._lock:
+            self._frame = None
+            self._frame_version = -1
+            self._sized_frames = {}
+            self._pyramid = {}
+            self.imgSource = None
+
+    def holds_resources(self):
+        with self._lock:
+            return (self.imgSource is not None or self._frame is not None
+                    or bool(self._sized_frames) or bool(self._pyramid))
+
+    def resource_bytes(self):
+        """Memory held by this camera's rendered frames and crops.
+
+        The source is shared through the source cache and counted there.
+        """
+        with self._lock:
+            images = [self._frame] + [f for _, f in self._sized_frames.values()]
+            images += self._pyramid.values()
+        return sum(image_bytes(image) for image in images if image is not None)
+
+    def _ensure_source(self):
+        """Reload a released source (caller holds the lock)."""
+        if self.imgSource is not None or self._source_path is None:
+            return
+        try:
+            self.imgSource = get_source_cache().load(self._source_path)
+        except FileNotFoundError:
+            self._source_path = None
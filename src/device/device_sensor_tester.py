@@ -12,6 +12,7 @@ class DeviceSensorTester(ABC):
     head_motion_detector = None  # alias
     newIdSequence_WinDoorSensor = 0
     newIdSequence_MotionDetector = 0
+    newIdSequence_VideoMotionDetector = 0
 
     def __init__(self):
         self.next = None
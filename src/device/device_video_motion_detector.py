@@ -0,0 +1,185 @@
+import time
+
+from .device_camera import DeviceCamera, QUALITY_BILINEAR
+from .device_sensor_tester import DeviceSensorTester
+from .interface_sensor import InterfaceSensor
+from core.security.security_zone_geometry.area import Point
+
+
+def _numpy():
+    # numpy is optional; only this sensor type needs it
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "DeviceVideoMotionDetector requires numpy (pip install numpy)") from e
+    return numpy
+
+
+class DeviceVideoMotionDetector(InterfaceSensor):
+    """Motion sensor that watches a camera instead of a physical detector.
+
+    Frames are taken from the camera's cached thumbnail-size view, turned
+    into small grayscale images and compared with a running average of
+    the scene. Motion is detected when more than min_changed of the masked
+    pixels differ from the average by more than threshold.
+    """
+
+    # View size requested from the camera; matches the thumbnail grid, so
+    # the frame is usually already rendered
+    SOURCE_SIZE = 160
+    # Analysis works on SOURCE_SIZE / BLOCK pixels per side
+    BLOCK = 4
+
+    def __init__(self, camera: DeviceCamera, location: (int, int), fps: float = 2.0,
+                 threshold: float = 25.0, min_changed: float = 0.02, alpha: float = 0.1):
+        super().__init__()
+        self.np = _numpy()
+
+        self.camera = camera
+        self.area = Point(*location)
+        # Assign unique ID
+        DeviceSensorTester.newIdSequence_VideoMotionDetector += 1
+        self.sensor_id = DeviceSensorTester.newIdSequence_VideoMotionDetector
+
+        self.fps = fps
+        self.threshold = threshold
+        self.min_changed = min_changed
+        self.alpha = alpha
+
+        self.detected = False
+        self.armed = False
+        self.background = None
+        self._last_analysis = float("-inf")
+        self._last_version = None
+        self._last_position = None
+        self.mask = None
+        self.set_mask()
+
+    @property
+    def analysis_size(self):
+        return self.SOURCE_SIZE // self.BLOCK
+
+    def set_mask(self, regions=None, ignore=None):
+        """Limit analysis to regions and skip ignore.
+
+        Both are lists of (left, top, right, bottom) in view fractions
+        (0.0 - 1.0). The camera's time overlay is always ignored.
+        """
+        np = self.np
+        n = self.analysis_size
+        if regions:
+            mask = np.zeros((n, n), dtype=bool)
+            for box in regions:
+                mask[self._slices(box)] = True
+        else:
+            mask = np.ones((n, n), dtype=bool)
+        # The overlay label changes every second; keep it out of the diff
+        for box in [(0.0, 0.0, 0.5, 0.06)] + list(ignore or []):
+            mask[self._slices(box)] = False
+        self.mask = mask
+
+    def _slices(self, box):
+        n = self.analysis_size
+        left, top, right, bottom = box
+        return (slice(int(top * n), max(int(top * n) + 1, round(bottom * n))),
+                slice(int(left * n), max(int(left * n) + 1, round(right * n))))
+
+    def intrude(self):
+        """Simulate motion detection."""
+        self.detected = True
+
+    def release(self):
+        """Clear motion detection."""
+        self.detected = False
+
+    def get_id(self):
+        return self.sensor_id
+
+    def read(self):
+        """Read the sensor state, analyzing a new frame when one is due.
+
+        Call poll() first to analyze several detectors in one pass; read()
+        then only returns the result.
+        """
+        if not self.armed:
+            return False
+        if self._due(time.monotonic()):
+            analyze([self])
+        return self.detected
+
+    def arm(self):
+        self.armed = True
+
+    def disarm(self):
+        self.armed = False
+
+    def test_armed_state(self):
+        return self.armed
+
+    def _due(self, now):
+        """Whether an armed detector should analyze a frame now; if so, it is
+        counted as analyzed."""
+        if not self.armed or now - self._last_analysis < 1.0 / self.fps:
+            return False
+        self._last_analysis = now
+        return True
+
+    def _frame(self):
+        """Small grayscale frame, or None if the camera has not changed."""
+        version = self.camera.get_frame_version()
+        if version == self._last_version:
+            return None
+        self._last_version = version
+        position = (self.camera.pan, self.camera.zoom)
+        if position != self._last_position:
+            # Panning or zooming changes the whole picture, not motion
+            self._last_position = position
+            self.background = None
+        view = self.camera.get_view(size=self.SOURCE_SIZE, quality=QUALITY_BILINEAR)
+        gray = self.np.asarray(view.convert("L"), dtype=self.np.float32)
+        n, b = self.analysis_size, self.BLOCK
+        # Block average down to the analysis size
+        return gray[:n * b, :n * b].reshape(n, b, n, b).mean(axis=(1, 3))
+
+
+def poll(sensors):
+    """Analyze every video motion detector among sensors that is due, in one
+    analyze() call. Other sensor types are skipped."""
+    now = time.monotonic()
+    analyze([s for s in sensors if isinstance(s, DeviceVideoMotionDetector) and s._due(now)])
+
+
+def analyze(detectors):
+    """Analyze the latest frames of several detectors in one vectorized pass."""
+    detectors = list(detectors)
+    if not detectors:
+        return
+    np = detectors[0].np
+    frames, active = [], []
+    for detector in detectors:
+        frame = detector._frame()
+        if frame is None:
+            continue
+        if detector.background is None:
+            detector.background = frame
+            continue
+        frames.append(frame)
+        active.append(detector)
+    if not active:
+        return
+
+    current = np.stack(frames)
+    background = np.stack([d.background for d in active])
+    masks = np.stack([d.mask for d in active])
+    thresholds = np.array([d.threshold for d in active], dtype=np.float32)[:, None, None]
+    alphas = np.array([d.alpha for d in active], dtype=np.float32)[:, None, None]
+
+    changed = (np.abs(current - background) > thresholds) & masks
+    fractions = changed.sum(axis=(1, 2)) / np.maximum(masks.sum(axis=(1, 2)), 1)
+    updated = background + alphas * (current - background)
+
+    for i, detector in enumerate(active):
+        detector.background = updated[i]
+        if fractions[i] > detector.min_changed:
+            detector.detected = True
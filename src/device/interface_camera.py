@@ -15,8 +15,12 @@ class InterfaceCamera(ABC):
         pass
 
     @abstractmethod
-    def get_view(self):
-        """Get the current camera view as an image (PIL Image in Python)."""
+    def get_view(self, size=None, quality=None):
+        """Get the current camera view as an image (PIL Image in Python).
+
+        size asks for a size x size view rendered directly at that
+        resolution; quality selects the resampling used to get there.
+        """
         pass
 
     @abstractmethod
@@ -0,0 +1,111 @@
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+# Default cap on the memory held by decoded camera sources
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Scales JPEG draft mode can decode at (1/2, 1/4 and 1/8 of full size)
+DRAFT_SCALES = (8, 4, 2)
+
+
+def image_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+class SourceImageCache:
+    """LRU cache of decoded camera source images shared by all cameras.
+
+    Entries are keyed by (path, mtime, scale), so a replaced file is decoded
+    again. scale > 1 asks for a JPEG decoded in draft mode at roughly
+    1/scale of its size; other formats ignore it and come back full size.
+    Cached images are shared and must not be modified.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path, scale=1):
+        """Decoded image at path; raises FileNotFoundError like Image.open."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            # Let Image.open report the missing file as before
+            return self._decode(path, scale)
+
+        key = (path, mtime, scale)
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        image = self._decode(path, scale)
+        with self._lock:
+            if key not in self._entries and image_bytes(image) <= self.max_bytes:
+                self._entries[key] = image
+                self.total_bytes += image_bytes(image)
+                self._evict()
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def trim(self, target_bytes):
+        """Evict least recently used entries until at most target_bytes remain."""
+        with self._lock:
+            self._evict(target_bytes)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _decode(self, path, scale):
+        # load() decodes the whole image and closes the file
+        image = Image.open(path)
+        if scale > 1:
+            image.draft(image.mode, (image.width // scale, image.height // scale))
+        image.load()
+        return image
+
+    def _evict(self, max_bytes=None):
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        while self.total_bytes > max_bytes and self._entries:
+            _, image = self._entries.popitem(last=False)
+            self.total_bytes -= image_bytes(image)
+
+
+def draft_scale(crop_width, size):
+    """Largest draft scale that still leaves crop_width / scale >= size."""
+    for scale in DRAFT_SCALES:
+        if crop_width // scale >= size:
+            return scale
+    return 1
+
+
+_shared_cache = SourceImageCache()
+
+
+def get_source_cache():
+    """Process-wide source cache used by DeviceCamera."""
+    return _shared_cache
@@ -1,7 +1,10 @@
+import queue
 import tkinter as tk
 from PIL import Image, ImageTk
 from core.system import system
 
+VIEW_SIZE = (400, 300)
+
 
 class CameraViewPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -12,6 +15,10 @@ class CameraViewPage(tk.Frame):
         self._after_id = None
         self.photo = None
         self.canvas_image_id = None
+        # Frames rendered on the streaming thread, newest only
+        self._frames = queue.Queue(maxsize=1)
+        self._stream = None
+        self._shown = None
 
         # ============================================================
         # HEADER
@@ -35,13 +42,13 @@ class CameraViewPage(tk.Frame):
         left.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
         self.canvas = tk.Canvas(
-            left, width=400, height=300,
+            left, width=VIEW_SIZE[0], height=VIEW_SIZE[1],
             bg="black", highlightthickness=2, highlightbackground="gray"
         )
         self.canvas.pack(expand=True)
 
-        # placeholder black image
-        placeholder = Image.new("RGB", (400, 300), "black")
+        # One PhotoImage for the page's lifetime, new frames are pasted into it
+        placeholder = Image.new("RGB", VIEW_SIZE, "black")
         self.photo = ImageTk.PhotoImage(placeholder, master=self.canvas)
         self.canvas_image_id = self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
 
@@ -111,24 +118,34 @@ class CameraViewPage(tk.Frame):
             text=f"Viewing Camera {self.camera_id}")
 
         try:
-            img = system.current_camera_controller.get_single_view(cam_id).resize((400, 300))
-        except Exception:
-            img = Image.new("RGB", (400, 300), "black")
-
-        if img.mode != "RGB":
-            img = img.convert("RGB")
+            # Keep this camera at full quality when rendering is degraded
+            system.current_camera_controller.set_focused_camera(cam_id)
+        except Exception as e:
+            print("Error focusing camera:", e)
 
-        self.photo = ImageTk.PhotoImage(img, master=self.canvas)
-        self.canvas.itemconfig(self.canvas_image_id, image=self.photo)
-        self.canvas._cached_image = self.photo
+        try:
+            img = self._prepare(system.current_camera_controller.get_single_view(cam_id))
+        except Exception:
+            img = Image.new("RGB", VIEW_SIZE, "black")
+        self.photo.paste(img)
+        self._shown = None
 
         self.start_updates()
 
     # ============================================================
     # PERIODIC UPDATE LOOP
     # ============================================================
+    # Frames are rendered and resized on the camera controller's streaming
+    # thread and handed over through self._frames; the Tk loop only pastes
+    # the newest one into self.photo.
     def start_updates(self):
         if self._after_id is None:
+            if self._stream is None and self.camera_id is not None:
+                try:
+                    self._stream = system.current_camera_controller.subscribe(
+                        self.camera_id, fps=10.0, callback=self._on_frame)
+                except Exception as e:
+                    print("Camera stream error:", e)
             self._schedule_next()
 
     def stop_updates(self):
@@ -138,19 +155,49 @@ class CameraViewPage(tk.Frame):
             except Exception as e:
                 print("Error cancelling after:", e)
             self._after_id = None
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception as e:
+                print("Error closing camera stream:", e)
+            self._stream = None
+        self._take_frame()
 
     def _schedule_next(self):
         self._after_id = self.after(100, self._update_view_internal)
 
-    def _update_view_internal(self):
+    @staticmethod
+    def _prepare(img):
+        img = img.resize(VIEW_SIZE)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        return img
+
+    def _on_frame(self, frame):
+        # Streaming thread: render the frame at view size, replacing a
+        # frame the Tk loop has not picked up yet
+        item = (frame.camera_id, frame.version, self._prepare(frame.image))
+        self._take_frame()
+        try:
+            self._frames.put_nowait(item)
+        except queue.Full:
+            pass
+
+    def _take_frame(self):
         try:
-            img = system.current_camera_controller.get_single_view(self.camera_id).resize((400, 300))
-            if img.mode != "RGB":
-                img = img.convert("RGB")
+            return self._frames.get_nowait()
+        except queue.Empty:
+            return None
 
-            self.photo = ImageTk.PhotoImage(img, master=self.canvas)
-            self.canvas.itemconfig(self.canvas_image_id, image=self.photo)
-            self.canvas._cached_image = self.photo
+    def _update_view_internal(self):
+        try:
+            item = self._take_frame()
+            if item is not None:
+                camera_id, version, img = item
+                # Skip frames of a previous camera and unchanged frames
+                if camera_id == self.camera_id and (camera_id, version) != self._shown:
+                    self.photo.paste(img)
+                    self._shown = (camera_id, version)
         except Exception as e:
             print("Camera update error:", e)
 
@@ -159,6 +206,10 @@ class CameraViewPage(tk.Frame):
     def back_to_floorplan(self) -> None:
         """Stop updates and switch back to floor plan."""
         self.stop_updates()
+        try:
+            system.current_camera_controller.set_focused_camera(None)
+        except Exception as e:
+            print("Error unfocusing camera:", e)
         try:
             from gui.gui_surveillance import FloorPlanPage
             self.controller.show_frame(FloorPlanPage)
@@ -40,6 +40,10 @@ class FloorPlanPage(tk.Frame):
 
         # Camera icons: {canvas_item_id: camera_id}
         self.camera_icons = {}
+        # Camera state version the icons were last refreshed at, and the
+        # controller it belongs to (system.reset() replaces the controller)
+        self.camera_version = 0
+        self.camera_source = None
         self.create_camera_icons()
 
         # --- Sidebar right ---
@@ -75,32 +79,38 @@ class FloorPlanPage(tk.Frame):
 
     def create_camera_icons(self) -> None:
         """Create initial camera icons based on camera states from CameraController."""
-        all_cameras = system.current_camera_controller.get_all_cameras_info()
+        self.camera_source = system.current_camera_controller
+        all_cameras = self.camera_source.get_all_cameras_info()
 
         for cam_info in all_cameras:
-            x, y = cam_info.location
-            r = 10
-
-            is_locked = cam_info.has_password
-
-            # Square for locked, circle for unlocked
-            if is_locked:
-                icon = self.canvas.create_rectangle(
-                    x - r, y - r, x + r, y + r,
-                    fill="green" if cam_info.enabled else "red",
-                    outline="black",
-                    width=2
-                )
-            else:
-                icon = self.canvas.create_oval(
-                    x - r, y - r, x + r, y + r,
-                    fill="green" if cam_info.enabled else "red",
-                    outline="black",
-                    width=2
-                )
+            self.create_camera_icon(cam_info)
+
+    def create_camera_icon(self, cam_info: Any) -> int:
+        """Draw one camera: square for locked, circle for unlocked."""
+        x, y = cam_info.location
+        r = 10
+
+        is_locked = cam_info.has_password
+
+        # Square for locked, circle for unlocked
+        if is_locked:
+            icon = self.canvas.create_rectangle(
+                x - r, y - r, x + r, y + r,
+                fill="green" if cam_info.enabled else "red",
+                outline="black",
+                width=2
+            )
+        else:
+            icon = self.canvas.create_oval(
+                x - r, y - r, x + r, y + r,
+                fill="green" if cam_info.enabled else "red",
+                outline="black",
+                width=2
+            )
 
-            self.camera_icons[icon] = cam_info.camera_id
-            self.canvas.tag_bind(icon, "<Button-1>", self.camera_clicked)
+        self.camera_icons[icon] = cam_info.camera_id
+        self.canvas.tag_bind(icon, "<Button-1>", self.camera_clicked)
+        return icon
 
     def camera_clicked(self, event: tk.Event) -> None:
         clicked_items = self.canvas.find_withtag("current")
@@ -130,57 +140,48 @@ class FloorPlanPage(tk.Frame):
 
     def update_camera_colors(self) -> None:
         """Update camera icons based on running/lock status."""
-        # Get fresh camera data
-        all_cameras = system.current_camera_controller.get_all_cameras_info()
-        camera_data = {cam.camera_id: cam for cam in all_cameras}
-
-        # Store old icon mapping
-        old_icons = self.camera_icons.copy()
-        self.camera_icons.clear()
-
-        for icon, cam_id in old_icons.items():
-            cam_info = camera_data.get(cam_id)
-            if not cam_info:
+        # Only cameras changed since the last refresh are redrawn
+        camera_controller = system.current_camera_controller
+        try:
+            if camera_controller is not self.camera_source:
+                raise ValueError("Camera controller was replaced.")
+            changes = camera_controller.changes_since(self.camera_version)
+        except ValueError:
+            # Versions of another controller mean nothing: redraw everything
+            for icon in self.camera_icons:
+                self.canvas.delete(icon)
+            self.camera_icons.clear()
+            self.camera_source = camera_controller
+            changes = camera_controller.changes_since(0)
+        self.camera_version = changes.version
+        icons = {cam_id: icon for icon, cam_id in self.camera_icons.items()}
+
+        for cam_id in changes.deleted:
+            icon = icons.pop(cam_id, None)
+            if icon is not None:
                 self.canvas.delete(icon)
+                del self.camera_icons[icon]
+
+        for cam_info in changes:
+            icon = icons.get(cam_info.camera_id)
+            if icon is None:
+                self.create_camera_icon(cam_info)
                 continue
 
-            x, y = cam_info.location
-            r = 10
             color = "green" if cam_info.enabled else "red"
 
             # Determine if should be locked (square) or unlocked (circle)
             should_be_square = cam_info.has_password
-
-            # Check current shape
-            current_coords = self.canvas.coords(icon)
-            if not current_coords:
-                continue
-
-            # Determine if currently a rectangle
-            # Rectangle has 4 coords (x1,y1,x2,y2), oval also has 4
-            # But we can check the canvas item type
-            current_type = self.canvas.type(icon)
-            is_currently_rect = (current_type == "rectangle")
+            is_currently_rect = (self.canvas.type(icon) == "rectangle")
 
             # If shape needs to change, delete and recreate
             if should_be_square != is_currently_rect:
                 self.canvas.delete(icon)
-                if should_be_square:
-                    new_icon = self.canvas.create_rectangle(
-                        x - r, y - r, x + r, y + r,
-                        fill=color, outline="black", width=2
-                    )
-                else:
-                    new_icon = self.canvas.create_oval(
-                        x - r, y - r, x + r, y + r,
-                        fill=color, outline="black", width=2
-                    )
-                self.camera_icons[new_icon] = cam_id
-                self.canvas.tag_bind(new_icon, "<Button-1>", self.camera_clicked)
+                del self.camera_icons[icon]
+                self.create_camera_icon(cam_info)
             else:
                 # Just update color
                 self.canvas.itemconfig(icon, fill=color)
-                self.camera_icons[icon] = cam_id
 
     def update_sidebar(self) -> None:
         """Update sidebar based on selected camera."""
@@ -1,10 +1,9 @@
 import tkinter as tk
-from typing import Any
-from PIL import Image, ImageTk
+from typing import Any, Optional
+from PIL import ImageTk
 from core.system import system
 
-THUMB_WIDTH = 200
-THUMB_HEIGHT = 200
+COLUMNS = 3
 
 
 class ThumbnailsPage(tk.Frame):
@@ -22,63 +21,45 @@ class ThumbnailsPage(tk.Frame):
             font=("Arial", 16, "bold")
         ).pack(pady=10)
 
-        # A frame that holds all thumbnails
+        # A frame that holds the thumbnail mosaic
         self.thumb_frame = tk.Frame(main_frame)
         self.thumb_frame.pack(expand=True, fill="both")
 
-        self.thumb_frame.grid_columnconfigure(0, weight=1)
-        self.thumb_frame.grid_columnconfigure(1, weight=1)
-        self.thumb_frame.grid_columnconfigure(2, weight=1)
-
-        self.thumbnail_widgets = {}
+        # All thumbnails are drawn into one image shown on one canvas
+        self.canvas = tk.Canvas(self.thumb_frame, highlightthickness=0)
+        scrollbar = tk.Scrollbar(self.thumb_frame, orient="vertical",
+                                 command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", expand=True, fill="both")
+
+        # Reused between loads; kept here to avoid garbage collection
+        self.tk_mosaic: Optional[ImageTk.PhotoImage] = None
+        self.mosaic_item = self.canvas.create_image(0, 0, anchor="nw")
+        self.mosaic_version: Optional[int] = None
+        self.tiles = {}
         self.load_thumbnails()
 
     def load_thumbnails(self) -> None:
-        # Clear old thumbnails
-        for widget in self.thumb_frame.winfo_children():
-            widget.destroy()
-
-        # Get thumbnails directly - controller handles all logic
-        thumbnails: dict[int, Image.Image] = system.current_camera_controller.get_thumbnail_views()
-
-        # Make Tkinter-safe images stored to avoid garbage collection
-        self.tk_thumbnails = {}
-
-        row = 0
-        col = 0
-
-        for cam_id, pil_img in thumbnails.items():
-            frame = tk.Frame(self.thumb_frame, bd=2, relief="groove", padx=5, pady=5)
-            frame.grid(row=row, column=col, padx=10, pady=10)
-
-            # Title
-            tk.Label(frame, text=f"Camera {cam_id}", font=("Arial", 12, "bold")).pack()
-
-            # Create a fixed-size canvas
-            canvas = tk.Canvas(frame, width=THUMB_WIDTH, height=THUMB_HEIGHT)
-            canvas.pack()
-
-            # Resize while maintaining aspect ratio
-            pil_img = pil_img.copy()
-            pil_img.thumbnail((THUMB_WIDTH, THUMB_HEIGHT))
-
-            tk_img = ImageTk.PhotoImage(pil_img)
-            self.tk_thumbnails[cam_id] = tk_img
-
-            # Center the image
-            w, h = pil_img.size
-            canvas.create_image(
-                (THUMB_WIDTH - w) // 2,
-                (THUMB_HEIGHT - h) // 2,
-                anchor="nw",
-                image=tk_img
-            )
-
-            # Move to next grid position
-            col += 1
-            if col == 3:
-                row += 1
-                col = 0
+        # Controller composites the thumbnails and redraws only changed tiles
+        mosaic = system.current_camera_controller.get_thumbnail_mosaic(COLUMNS)
+        self.tiles = dict(mosaic.tiles)
+
+        image = mosaic.image
+        if self.tk_mosaic is None or (self.tk_mosaic.width(), self.tk_mosaic.height()) != image.size:
+            if image.width == 0 or image.height == 0:
+                self.tk_mosaic = None
+                self.canvas.itemconfigure(self.mosaic_item, image="")
+            else:
+                self.tk_mosaic = ImageTk.PhotoImage(image)
+                self.canvas.itemconfigure(self.mosaic_item, image=self.tk_mosaic)
+        elif mosaic.version != self.mosaic_version:
+            # Same size: copy the pixels into the existing PhotoImage
+            self.tk_mosaic.paste(image)
+        self.mosaic_version = mosaic.version
+
+        self.canvas.configure(width=image.width, height=min(image.height, 600),
+                              scrollregion=(0, 0) + image.size)
 
 
 if __name__ == "__main__":
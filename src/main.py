@@ -22,7 +22,12 @@ def main():
 
     system.current_control_panel = control_panel
     system.current_app = app
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        # Closing a window only quits the mainloop; buffered camera
+        # changes would be lost with the process
+        system.shutdown()
 
 
 if __name__ == "__main__":
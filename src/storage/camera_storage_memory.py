@@ -34,3 +34,8 @@ class CameraMemoryDB(ICameraDB):
 
     def get_all_cameras(self) -> List[SafeHomeCamera]:
         return list(self._cameras.values())
+
+    def close(self) -> None:
+        # The stored cameras are the live ones, so they are closed here
+        for camera in self._cameras.values():
+            camera.close()
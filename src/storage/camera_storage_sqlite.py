@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Iterable, Optional, List
 
 from core.surveillance.ICameraDB import ICameraDB
 
@@ -7,43 +7,76 @@ from core.surveillance.safehome_camera import SafeHomeCamera
 
 
 class CameraSqliteDB(ICameraDB):
+    UPDATE_QUERY = """
+    UPDATE cameras
+    SET
+        location_x = ?,
+        location_y = ?,
+        pan_angle  = ?,
+        zoom_level = ?,
+        password   = ?,
+        enabled    = ?
+    WHERE camera_id = ?
+    """
+
     def __init__(self, storage_manager):
         self.storage_manager = storage_manager
 
     def create_camera(self, camera: SafeHomeCamera) -> None:
-        pass
-
-    def update_camera(self, camera: SafeHomeCamera) -> None:
-        """Persist changes to an existing camera."""
+        """Persist a newly created camera."""
         query = """
-        UPDATE cameras
-        SET 
-            location_x = ?,
-            location_y = ?,
-            pan_angle  = ?,
-            zoom_level = ?,
-            password   = ?,
-            enabled    = ?
-        WHERE camera_id = ?
+        INSERT INTO "cameras" ("camera_id", "location_x", "location_y", "pan_angle", "zoom_level", "password", "enabled")
+        VALUES (?, ?, ?, ?, ?, ?, ?)
         """
-        self.storage_manager.execute(
+        self.storage_manager.execute_insert(
             query,
             (
+                camera.camera_id,
                 camera.location[0],
                 camera.location[1],
                 camera.pan_angle,
                 camera.zoom_level,
                 camera.password,
-                camera.enabled,
-                camera.camera_id
+                camera.enabled
             )
         )
 
+    def update_camera(self, camera: SafeHomeCamera) -> None:
+        """Persist changes to an existing camera."""
+        self.storage_manager.execute(self.UPDATE_QUERY, self._update_params(camera))
+
+    def update_cameras(self, cameras: Iterable[SafeHomeCamera]) -> None:
+        """Persist changes to several cameras in one transaction."""
+        rows = [self._update_params(camera) for camera in cameras]
+        if not rows:
+            return
+        with self.storage_manager.transaction() as cursor:
+            cursor.executemany(self.UPDATE_QUERY, rows)
+
+    def _update_params(self, camera: SafeHomeCamera) -> tuple:
+        return (
+            camera.location[0],
+            camera.location[1],
+            camera.pan_angle,
+            camera.zoom_level,
+            camera.password,
+            camera.enabled,
+            camera.camera_id
+        )
+
     def delete_camera(self, camera_id: int) -> None:
-        pass
+        """Delete persisted camera information."""
+        query = """
+        DELETE FROM "cameras" WHERE camera_id = ?
+        """
+        self.storage_manager.execute(query, (camera_id,))
 
     def get_camera_by_id(self, camera_id: int) -> Optional[SafeHomeCamera]:
-        """Return a camera by id, or None if not found."""
+        """Return a camera by id, or None if not found.
+
+        The camera is built fresh from the row; the caller owns it and
+        should close() it when done.
+        """
 
         query = """
         SELECT *
@@ -71,7 +104,7 @@ class CameraSqliteDB(ICameraDB):
         return camera
 
     def get_all_cameras(self) -> List[SafeHomeCamera]:
-        """Return all persisted cameras."""
+        """Return all persisted cameras, built fresh and owned by the caller."""
 
         query = """
         SELECT *
@@ -0,0 +1,362 @@
+"""Export and import of a whole installation's configuration.
+
+The file format is JSON Lines: one record per line, so files can be
+written and read as a stream. The first line is a header naming the
+format and its version; the following lines are records tagged with
+``t``. Sensors must come before the modes that reference them. Paths
+ending in ``.gz`` are gzip-compressed.
+
+    {"format": "safehome-config", "version": 1}
+    {"t": "sensor", "id": 1, "type": "DeviceWinDoorSensor", "loc": {"x": 20, "y": 80}, "on": true, "arm": null}
+    {"t": "camera", "id": 1, "loc": [110, 50], "pan": 0, "zoom": 2, "password": "", "enabled": true}
+    {"t": "mode", "name": "Home", "sensors": [4, 5, 6]}
+    {"t": "zone", "id": 1, "enabled": true, "rect": [150, 200, 210, 240]}
+    {"t": "setting", "name": "panic_phone_number", "value": {"phone_number": "112"}}
+
+Exports are read through the storage interfaces, so they work for the
+memory and the sqlite backends alike; cameras are only read, never
+started or stopped. Imports replace the sensors,
+cameras, modes and zones of a sqlite database in a single transaction.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator
+
+from core.security.security_database_interface import SecurityDBInterface
+from core.setting.control_panel_setting_storage import IControlPanelSettingsDB
+from core.setting.system_setting_storage import ISystemSettingsDB
+from core.surveillance.ICameraDB import ICameraDB
+from storage.storage_sqlite import StorageManager
+
+FORMAT_NAME = "safehome-config"
+FORMAT_VERSION = 1
+
+SENSOR_LOCATION_KEYS = {
+    "DeviceWinDoorSensor": ("x", "y"),
+    "DeviceMotionDetector": ("up_left_x", "up_left_y", "down_right_x", "down_right_y"),
+}
+SETTING_VALUE_KEYS = {
+    "system_lock_time": "time",
+    "panic_phone_number": "phone_number",
+    "alarm_time_before_phonecall": "time",
+    "home_phone_number": "phone_number",
+    "now_security_mode": "mode",
+    "master_password": "password",
+    "guest_password": "password",
+}
+PAN_RANGE = (-5, 5)
+ZOOM_RANGE = (1, 9)
+
+
+class ConfigFormatError(Exception):
+    """Raised when a configuration file is malformed or inconsistent."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+@dataclass
+class ImportReport:
+    dry_run: bool
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ------------------------------------------------------------------- export
+def _sensor_location(sensor) -> dict:
+    sensor_type = type(sensor).__name__
+    if sensor_type == "DeviceWinDoorSensor":
+        return {"x": sensor.area.x, "y": sensor.area.y}
+    if sensor_type == "DeviceMotionDetector":
+        return {"up_left_x": sensor.area.start[0], "up_left_y": sensor.area.start[1],
+                "down_right_x": sensor.area.end[0], "down_right_y": sensor.area.end[1]}
+    raise ValueError(f"Cannot export sensor of type {sensor_type}")
+
+
+def iter_config_records(
+        security_db: SecurityDBInterface,
+        camera_db: ICameraDB,
+        settings_db: ISystemSettingsDB,
+        cp_settings_db: IControlPanelSettingsDB,
+) -> Iterator[dict]:
+    # Records of an installation, in the order they have to be imported
+    sensors = security_db.get_sensors()
+    for sensor, (on, arm) in sorted(sensors.items(), key=lambda item: item[0].get_id()):
+        yield {"t": "sensor", "id": sensor.get_id(), "type": type(sensor).__name__,
+               "loc": _sensor_location(sensor), "on": bool(on), "arm": arm}
+
+    for camera in sorted(camera_db.get_all_cameras(), key=lambda c: c.camera_id):
+        yield {"t": "camera", "id": camera.camera_id, "loc": list(camera.location),
+               "pan": camera.pan_angle, "zoom": camera.zoom_level,
+               "password": camera.password or "", "enabled": bool(camera.enabled)}
+
+    for mode in security_db.get_security_modes():
+        yield {"t": "mode", "name": mode.name, "sensors": [s.get_id() for s in mode.sensors]}
+
+    for zone in security_db.get_security_zones():
+        yield {"t": "zone", "id": zone.id, "enabled": bool(zone.enabled),
+               "rect": [*zone.area.up_left, *zone.area.down_right]}
+
+    settings = settings_db.get_system_settings()
+    values = {
+        "system_lock_time": settings.system_lock_time,
+        "panic_phone_number": settings.panic_phone_number,
+        "alarm_time_before_phonecall": settings.alarm_time_before_phonecall,
+        "home_phone_number": settings.home_phone_number,
+        "now_security_mode": security_db.get_now_security_mode(),
+        "master_password": cp_settings_db.get_master_password(),
+        "guest_password": cp_settings_db.get_guest_password(),
+    }
+    for name, value in values.items():
+        yield {"t": "setting", "name": name, "value": {SETTING_VALUE_KEYS[name]: value}}
+
+
+def write_config(f: IO[str], records: Iterable[dict]) -> int:
+    # Write the header and the records, returns the number of records
+    f.write(json.dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n")
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def export_config(path: str, security_db: SecurityDBInterface, camera_db: ICameraDB,
+                  settings_db: ISystemSettingsDB, cp_settings_db: IControlPanelSettingsDB) -> int:
+    with _open(path, "w") as f:
+        return write_config(f, iter_config_records(security_db, camera_db, settings_db, cp_settings_db))
+
+
+# --------------------------------------------------------------- validation
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Validator:
+    def __init__(self) -> None:
+        self.sensor_ids: set[int] = set()
+        self.camera_ids: set[int] = set()
+        self.zone_ids: set[int] = set()
+        self.mode_names: set[str] = set()
+        self.setting_names: set[str] = set()
+
+    def check(self, line: int, record) -> None:
+        if not isinstance(record, dict):
+            raise ConfigFormatError(line, "record must be an object")
+        check = getattr(self, f"_check_{record.get('t')}", None)
+        if check is None:
+            raise ConfigFormatError(line, f"unknown record type {record.get('t')!r}")
+        check(line, record)
+
+    def _require_id(self, line: int, record: dict, seen: set[int]) -> None:
+        record_id = record.get("id")
+        if not _is_int(record_id) or record_id <= 0:
+            raise ConfigFormatError(line, f"{record['t']} id must be a positive integer")
+        if record_id in seen:
+            raise ConfigFormatError(line, f"duplicate {record['t']} id {record_id}")
+        seen.add(record_id)
+
+    def _check_sensor(self, line: int, record: dict) -> None:
+        self._require_id(line, record, self.sensor_ids)
+        keys = SENSOR_LOCATION_KEYS.get(record.get("type"))
+        if keys is None:
+            raise ConfigFormatError(line, f"unknown sensor type {record.get('type')!r}")
+        loc = record.get("loc")
+        if not isinstance(loc, dict) or set(loc) != set(keys) or not all(_is_number(loc[k]) for k in keys):
+            raise ConfigFormatError(line, f"sensor location must have numeric {', '.join(keys)}")
+        if not isinstance(record.get("on"), bool):
+            raise ConfigFormatError(line, "sensor 'on' must be a boolean")
+        if record.get("arm") is not None and not isinstance(record.get("arm"), bool):
+            raise ConfigFormatError(line, "sensor 'arm' must be a boolean or null")
+
+    def _check_camera(self, line: int, record: dict) -> None:
+        self._require_id(line, record, self.camera_ids)
+        loc = record.get("loc")
+        if not isinstance(loc, list) or len(loc) != 2 or not all(_is_int(v) and v >= 0 for v in loc):
+            raise ConfigFormatError(line, "camera location must be two non-negative integers")
+        if not _is_int(record.get("pan")) or not PAN_RANGE[0] <= record["pan"] <= PAN_RANGE[1]:
+            raise ConfigFormatError(line, f"camera pan must be within {PAN_RANGE}")
+        if not _is_int(record.get("zoom")) or not ZOOM_RANGE[0] <= record["zoom"] <= ZOOM_RANGE[1]:
+            raise ConfigFormatError(line, f"camera zoom must be within {ZOOM_RANGE}")
+        if not isinstance(record.get("password"), str):
+            raise ConfigFormatError(line, "camera password must be a string")
+        if not isinstance(record.get("enabled"), bool):
+            raise ConfigFormatError(line, "camera 'enabled' must be a boolean")
+
+    def _check_mode(self, line: int, record: dict) -> None:
+        name = record.get("name")
+        if not isinstance(name, str) or name == "":
+            raise ConfigFormatError(line, "mode name must be a non-empty string")
+        if name in self.mode_names:
+            raise ConfigFormatError(line, f"duplicate mode {name!r}")
+        self.mode_names.add(name)
+        sensors = record.get("sensors")
+        if not isinstance(sensors, list):
+            raise ConfigFormatError(line, "mode sensors must be a list of sensor ids")
+        for sensor_id in sensors:
+            if sensor_id not in self.sensor_ids:
+                raise ConfigFormatError(line, f"mode {name!r} references unknown sensor {sensor_id!r}")
+
+    def _check_zone(self, line: int, record: dict) -> None:
+        self._require_id(line, record, self.zone_ids)
+        if not isinstance(record.get("enabled"), bool):
+            raise ConfigFormatError(line, "zone 'enabled' must be a boolean")
+        rect = record.get("rect")
+        if not isinstance(rect, list) or len(rect) != 4 or not all(_is_number(v) for v in rect):
+            raise ConfigFormatError(line, "zone rect must be four numbers")
+
+    def _check_setting(self, line: int, record: dict) -> None:
+        name = record.get("name")
+        key = SETTING_VALUE_KEYS.get(name)
+        if key is None:
+            raise ConfigFormatError(line, f"unknown setting {name!r}")
+        if name in self.setting_names:
+            raise ConfigFormatError(line, f"duplicate setting {name!r}")
+        self.setting_names.add(name)
+        value = record.get("value")
+        if not isinstance(value, dict) or set(value) != {key}:
+            raise ConfigFormatError(line, f"setting {name!r} value must be {{\"{key}\": ...}}")
+
+
+def read_config(f: IO[str]) -> Iterator[dict]:
+    """Yield the validated records of a configuration file one by one."""
+    header_line = f.readline()
+    try:
+        header = json.loads(header_line)
+    except ValueError:
+        raise ConfigFormatError(1, "missing header")
+    if not isinstance(header, dict) or header.get("format") != FORMAT_NAME:
+        raise ConfigFormatError(1, "not a SafeHome configuration file")
+    if header.get("version") != FORMAT_VERSION:
+        raise ConfigFormatError(1, f"unsupported version {header.get('version')!r}")
+
+    validator = _Validator()
+    for line, text in enumerate(f, start=2):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            raise ConfigFormatError(line, f"invalid JSON: {e}")
+        validator.check(line, record)
+        yield record
+
+
+# ------------------------------------------------------------------- import
+def _insert_record(cur, record: dict, mode_ids: dict[str, int]) -> None:
+    kind = record["t"]
+    if kind == "sensor":
+        cur.execute(
+            'INSERT INTO "sensors" ("sensor_id", "sensor_type", "location", "is_enabled", "is_armed") '
+            'VALUES (?, ?, ?, ?, ?)',
+            (record["id"], record["type"], json.dumps(record["loc"]), record["on"], record["arm"]))
+    elif kind == "camera":
+        cur.execute(
+            'INSERT INTO "cameras" ("camera_id", "location_x", "location_y", "pan_angle", "zoom_level", '
+            '"password", "enabled") VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (record["id"], record["loc"][0], record["loc"][1], record["pan"], record["zoom"],
+             record["password"], record["enabled"]))
+    elif kind == "mode":
+        # SecurityModeSqliteDB expects mode ids 1..n in file order
+        mode_id = len(mode_ids) + 1
+        mode_ids[record["name"]] = mode_id
+        cur.execute('INSERT INTO "safehome_modes" ("mode_id", "name") VALUES (?, ?)', (mode_id, record["name"]))
+        cur.executemany('INSERT INTO "mode_sensor_map" ("mode_id", "sensor_id") VALUES (?, ?)',
+                        [(mode_id, sensor_id) for sensor_id in record["sensors"]])
+    elif kind == "zone":
+        cur.execute(
+            'INSERT INTO "security_zones" ("security_zone_id", "is_enabled", "up_left_x", "up_left_y", '
+            '"down_right_x", "down_right_y") VALUES (?, ?, ?, ?, ?, ?)',
+            (record["id"], record["enabled"], *record["rect"]))
+    elif kind == "setting":
+        cur.execute(
+            'INSERT INTO "system_settings" ("name", "value") VALUES (?, ?) '
+            'ON CONFLICT("name") DO UPDATE SET "value" = excluded."value"',
+            (record["name"], json.dumps(record["value"])))
+
+
+def load_config(f: IO[str], storage_manager: StorageManager, dry_run: bool = False) -> ImportReport:
+    """
+    Replace the installation stored by storage_manager with the records of f.
+
+    Everything happens in one transaction: if any record is invalid or
+    violates a constraint nothing is changed. With dry_run the import is
+    carried out and then rolled back, so it checks the file against the
+    database without modifying it.
+    """
+    report = ImportReport(dry_run=dry_run)
+    mode_ids: dict[str, int] = {}
+
+    class _DryRun(Exception):
+        pass
+
+    try:
+        with storage_manager.transaction() as cur:
+            for table in ("mode_sensor_map", "security_zone_sensor_map", "safehome_modes",
+                          "security_zones", "cameras", "sensors"):
+                cur.execute(f'DELETE FROM "{table}"')
+            for record in read_config(f):
+                _insert_record(cur, record, mode_ids)
+                report.counts[record["t"]] = report.counts.get(record["t"], 0) + 1
+            if dry_run:
+                raise _DryRun()
+    except _DryRun:
+        pass
+    return report
+
+
+def import_config(path: str, storage_manager: StorageManager, dry_run: bool = False) -> ImportReport:
+    with _open(path, "r") as f:
+        return load_config(f, storage_manager, dry_run)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export or import a SafeHome installation")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="Configuration file (.jsonl, or .jsonl.gz for gzip)")
+    parser.add_argument("--db", default="safehome.db", help="SQLite database (default: safehome.db)")
+    parser.add_argument("--init-script", default="src/init.sql")
+    parser.add_argument("--dry-run", action="store_true", help="Validate an import without applying it.")
+    args = parser.parse_args(argv)
+
+    storage_manager = StorageManager(args.init_script, args.db)
+
+    if args.command == "export":
+        from storage.camera_storage_sqlite import CameraSqliteDB
+        from storage.control_panel_setting_storage_sqlite import ControlPanelSettingsSqliteDB
+        from storage.security_storage_sqlite import SecuritySqliteDB
+        from storage.system_setting_storage_sqlite import SystemSettingsSqliteDB
+
+        count = export_config(args.path, SecuritySqliteDB(storage_manager), CameraSqliteDB(storage_manager),
+                              SystemSettingsSqliteDB(storage_manager), ControlPanelSettingsSqliteDB(storage_manager))
+        print(f"exported {count} records to {args.path}")
+        return 0
+
+    try:
+        report = import_config(args.path, storage_manager, args.dry_run)
+    except (ConfigFormatError, ValueError, sqlite3.Error) as e:
+        print(f"import failed: {e}", file=sys.stderr)
+        return 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in report.counts.items())
+    print(f"{'checked' if report.dry_run else 'imported'} {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ from core.security.security_zone import SecurityZone
 from storage.sensor_storage_sqlite import SensorSqliteDB
 from storage.security_mode_storage_sqlite import SecurityModeSqliteDB
 from storage.security_zone_storage_sqlite import SecurityZoneSqliteDB
+from storage.spatial_index_sqlite import SpatialIndexSqliteDB
 
 
 class SecuritySqliteDB(SecurityDBInterface):
@@ -13,6 +14,8 @@ class SecuritySqliteDB(SecurityDBInterface):
         self.sensor_storage = SensorSqliteDB(storage_manager)
         self.security_mode_storage = SecurityModeSqliteDB(storage_manager)
         self.security_zone_storage = SecurityZoneSqliteDB(storage_manager)
+        self.spatial_index = SpatialIndexSqliteDB(storage_manager)
+        self.spatial_index.ensure_schema()
 
     def add_security_mode(self, mode) -> None:
         pass
@@ -58,3 +61,9 @@ class SecuritySqliteDB(SecurityDBInterface):
 
     def remove_security_zone(self, security_zone_id: int) -> None:
         self.security_zone_storage.remove_security_zone(security_zone_id)
+
+    def get_sensors_intersecting(self, bounds: tuple[float, float, float, float]) -> set[int]:
+        return self.spatial_index.get_sensors_intersecting(bounds)
+
+    def get_security_zones_containing(self, x: float, y: float) -> set[int]:
+        return self.spatial_index.get_security_zones_containing(x, y)
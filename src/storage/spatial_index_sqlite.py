@@ -0,0 +1,107 @@
+from storage.storage_sqlite import StorageManager
+
+
+# R*Tree mirrors of the sensor locations and the security zone rectangles.
+# The bounding boxes are derived in SQL (see the *_bounds views) and kept
+# up to date by triggers, so every write to sensors or security_zones -
+# through the storage classes or a bulk import - is reflected in the index.
+SPATIAL_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS "sensor_rtree" USING rtree(
+    "sensor_id", "min_x", "max_x", "min_y", "max_y"
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS "security_zone_rtree" USING rtree(
+    "security_zone_id", "min_x", "max_x", "min_y", "max_y"
+);
+
+CREATE VIEW IF NOT EXISTS "sensor_bounds" AS
+SELECT sensor_id,
+       min(coalesce(json_extract(location, '$.x'), json_extract(location, '$.up_left_x')),
+           coalesce(json_extract(location, '$.x'), json_extract(location, '$.down_right_x'))) AS min_x,
+       max(coalesce(json_extract(location, '$.x'), json_extract(location, '$.up_left_x')),
+           coalesce(json_extract(location, '$.x'), json_extract(location, '$.down_right_x'))) AS max_x,
+       min(coalesce(json_extract(location, '$.y'), json_extract(location, '$.up_left_y')),
+           coalesce(json_extract(location, '$.y'), json_extract(location, '$.down_right_y'))) AS min_y,
+       max(coalesce(json_extract(location, '$.y'), json_extract(location, '$.up_left_y')),
+           coalesce(json_extract(location, '$.y'), json_extract(location, '$.down_right_y'))) AS max_y
+FROM sensors;
+
+CREATE VIEW IF NOT EXISTS "security_zone_bounds" AS
+SELECT security_zone_id,
+       min(up_left_x, down_right_x) AS min_x,
+       max(up_left_x, down_right_x) AS max_x,
+       min(up_left_y, down_right_y) AS min_y,
+       max(up_left_y, down_right_y) AS max_y
+FROM security_zones;
+
+CREATE TRIGGER IF NOT EXISTS "sensor_rtree_insert" AFTER INSERT ON "sensors" BEGIN
+    INSERT OR REPLACE INTO sensor_rtree SELECT * FROM sensor_bounds WHERE sensor_id = NEW.sensor_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "sensor_rtree_update" AFTER UPDATE OF "sensor_id", "location" ON "sensors" BEGIN
+    DELETE FROM sensor_rtree WHERE sensor_id = OLD.sensor_id;
+    INSERT INTO sensor_rtree SELECT * FROM sensor_bounds WHERE sensor_id = NEW.sensor_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "sensor_rtree_delete" AFTER DELETE ON "sensors" BEGIN
+    DELETE FROM sensor_rtree WHERE sensor_id = OLD.sensor_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "security_zone_rtree_insert" AFTER INSERT ON "security_zones" BEGIN
+    INSERT OR REPLACE INTO security_zone_rtree
+    SELECT * FROM security_zone_bounds WHERE security_zone_id = NEW.security_zone_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "security_zone_rtree_update" AFTER UPDATE ON "security_zones" BEGIN
+    DELETE FROM security_zone_rtree WHERE security_zone_id = OLD.security_zone_id;
+    INSERT INTO security_zone_rtree
+    SELECT * FROM security_zone_bounds WHERE security_zone_id = NEW.security_zone_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS "security_zone_rtree_delete" AFTER DELETE ON "security_zones" BEGIN
+    DELETE FROM security_zone_rtree WHERE security_zone_id = OLD.security_zone_id;
+END;
+
+-- Backfill rows written before the index existed
+INSERT OR REPLACE INTO sensor_rtree SELECT * FROM sensor_bounds;
+INSERT OR REPLACE INTO security_zone_rtree SELECT * FROM security_zone_bounds;
+"""
+
+
+class SpatialIndexSqliteDB:
+    def __init__(self, storage_manager: StorageManager):
+        self.storage_manager = storage_manager
+        self._generation = None
+
+    def ensure_schema(self) -> None:
+        # Create the index for database files that predate it, or that were
+        # recreated by StorageManager.reset() since the last query.
+        if self._generation == self.storage_manager.generation:
+            return
+        self.storage_manager.execute_script(SPATIAL_SCHEMA)
+        self._generation = self.storage_manager.generation
+
+    def get_sensors_intersecting(self, bounds: tuple[float, float, float, float]) -> set[int]:
+        # Ids of the sensors whose bounding box intersects
+        # bounds = (min_x, min_y, max_x, max_y). R*Tree coordinates are
+        # rounded outwards, so callers should still check exact overlap.
+        self.ensure_schema()
+        query = """
+        SELECT sensor_id
+        FROM sensor_rtree
+        WHERE max_x >= ? AND min_x <= ? AND max_y >= ? AND min_y <= ?
+        """
+        min_x, min_y, max_x, max_y = bounds
+        rows = self.storage_manager.execute(query, (min_x, max_x, min_y, max_y))
+        return {row[0] for row in rows}
+
+    def get_security_zones_containing(self, x: float, y: float) -> set[int]:
+        # Ids of the security zones whose rectangle contains (x, y)
+        self.ensure_schema()
+        query = """
+        SELECT security_zone_id
+        FROM security_zone_rtree
+        WHERE min_x <= ? AND max_x >= ? AND min_y <= ? AND max_y >= ?
+        """
+        rows = self.storage_manager.execute(query, (x, x, y, y))
+        return {row[0] for row in rows}
@@ -1,11 +1,58 @@
 import sqlite3
 import os
+from contextlib import contextmanager
+import sys
+import time
+
+from storage.storage_stats import StorageStats
+
+
+def _caller_name(depth: int = 2) -> str:
+    # Name of the storage class that called into StorageManager
+    frame = sys._getframe(depth)
+    caller = frame.f_locals.get("self")
+    if caller is None:
+        return frame.f_code.co_name
+    return type(caller).__name__
+
+
+class _RecordingCursor:
+    # Cursor handed out by StorageManager.transaction() that records every
+    # statement in the stats, like StorageManager.execute does
+    def __init__(self, cursor, stats, backend):
+        self._cursor = cursor
+        self._stats = stats
+        self._backend = backend
+
+    def execute(self, query, params=()):
+        start = time.perf_counter()
+        result = self._cursor.execute(query, params)
+        self._stats.record(query, params, self._backend, time.perf_counter() - start,
+                           max(self._cursor.rowcount, 0))
+        return result
+
+    def executemany(self, query, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        start = time.perf_counter()
+        result = self._cursor.executemany(query, seq_of_params)
+        self._stats.record(query, f"<{len(seq_of_params)} parameter sets>", self._backend,
+                           time.perf_counter() - start, max(self._cursor.rowcount, 0))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
 
 
 class StorageManager:
     def __init__(self, init_script_path, db_file_path):
         self.init_script_path = init_script_path
         self.db_file_path = db_file_path
+        self.stats = StorageStats()
+        # incremented whenever the database file is recreated
+        self.generation = 0
 
         if not os.path.exists(self.db_file_path):
             try:
@@ -26,6 +73,7 @@ class StorageManager:
             pass
 
     def reset(self):
+        self.generation += 1
         try:
             os.remove(self.db_file_path)
 
@@ -44,6 +92,7 @@ class StorageManager:
             print(f"storage manger - while reset: {e}")
 
     def execute(self, query, params=()):
+        start = time.perf_counter()
         conn = sqlite3.connect(self.db_file_path)
         conn.execute("PRAGMA foreign_keys = ON;")
         try:
@@ -55,11 +104,14 @@ class StorageManager:
             conn.commit()
             conn.close()
 
+            self.stats.record(query, params, _caller_name(), time.perf_counter() - start,
+                              max(len(rows), cur.rowcount))
             return rows
         finally:
             conn.close()
 
     def execute_insert(self, query, params=()):
+        start = time.perf_counter()
         conn = sqlite3.connect(self.db_file_path)
         conn.execute("PRAGMA foreign_keys = ON;")
         try:
@@ -71,6 +123,46 @@ class StorageManager:
             conn.commit()
             conn.close()
 
+            self.stats.record(query, params, _caller_name(), time.perf_counter() - start,
+                              max(cur.rowcount, 0))
             return new_id
         finally:
             conn.close()
+
+    def execute_script(self, script):
+        start = time.perf_counter()
+        conn = sqlite3.connect(self.db_file_path)
+        try:
+            conn.executescript(script)
+            conn.commit()
+            self.stats.record(script, (), _caller_name(), time.perf_counter() - start, 0)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        # Yields a cursor whose statements are committed together when the
+        # block exits normally and rolled back if it raises. Each statement
+        # is recorded on its own, and so is the commit.
+        backend = _caller_name(3)
+        conn = sqlite3.connect(self.db_file_path)
+        conn.execute("PRAGMA foreign_keys = ON;")
+        try:
+            cur = _RecordingCursor(conn.cursor(), self.stats, backend)
+            cur.execute("BEGIN")
+            try:
+                yield cur
+            except BaseException:
+                conn.rollback()
+                raise
+            start = time.perf_counter()
+            conn.commit()
+            self.stats.record("COMMIT", (), backend, time.perf_counter() - start, 0)
+        finally:
+            conn.close()
+
+    def dump_stats(self) -> dict:
+        return self.stats.dump()
+
+    def reset_stats(self) -> None:
+        self.stats.reset()
@@ -0,0 +1,107 @@
+from collections import deque
+from datetime import datetime
+import re
+import threading
+
+
+# Upper bounds (in milliseconds) of the latency histogram buckets.
+# The last bucket collects everything slower than the last bound.
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def normalize_statement(query: str) -> str:
+    # Collapse whitespace and replace inline literals so that the same
+    # statement with different values is counted under one key.
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class QueryStats:
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed: float, rows: int) -> None:
+        self.calls += 1
+        self.rows += rows
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+        elapsed_ms = elapsed * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "rows": self.rows,
+            "total_ms": self.total_time * 1000,
+            "mean_ms": self.total_time * 1000 / self.calls if self.calls else 0.0,
+            "max_ms": self.max_time * 1000,
+            "histogram": dict(zip([f"<={b}ms" for b in LATENCY_BUCKETS_MS] + ["inf"], self.histogram)),
+        }
+
+
+class StorageStats:
+    """
+    Per-query statistics collected by StorageManager.
+
+    Every executed statement is recorded under its normalized text and
+    under the name of the storage class that issued it. Statements slower
+    than slow_query_threshold seconds are also kept in a bounded log.
+    """
+
+    def __init__(self, slow_query_threshold: float = 0.05, slow_query_log_size: int = 100):
+        self.enabled = True
+        self.slow_query_threshold = slow_query_threshold
+        self._lock = threading.Lock()
+        self._by_statement: dict[str, QueryStats] = {}
+        self._by_backend: dict[str, QueryStats] = {}
+        self._slow_queries: deque = deque(maxlen=slow_query_log_size)
+
+    def set_slow_query_log_size(self, size: int) -> None:
+        with self._lock:
+            self._slow_queries = deque(self._slow_queries, maxlen=size)
+
+    def record(self, query: str, params, backend: str, elapsed: float, rows: int) -> None:
+        if not self.enabled:
+            return
+
+        statement = normalize_statement(query)
+        with self._lock:
+            self._by_statement.setdefault(statement, QueryStats()).record(elapsed, rows)
+            self._by_backend.setdefault(backend, QueryStats()).record(elapsed, rows)
+
+            if elapsed >= self.slow_query_threshold:
+                self._slow_queries.append({
+                    "date_time": datetime.now().isoformat(" "),
+                    "backend": backend,
+                    "statement": statement,
+                    "params": repr(params),
+                    "elapsed_ms": elapsed * 1000,
+                })
+
+    def dump(self) -> dict:
+        with self._lock:
+            return {
+                "statements": {k: v.to_dict() for k, v in self._by_statement.items()},
+                "backends": {k: v.to_dict() for k, v in self._by_backend.items()},
+                "slow_queries": list(self._slow_queries),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_statement.clear()
+            self._by_backend.clear()
+            self._slow_queries.clear()
@@ -0,0 +1,26 @@
+import pytest
+from PIL import Image
+
+from device.source_cache import get_source_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_source_cache():
+    # Tests patch Image.open with fake sources, which must not leak into
+    # other tests through the shared decoded-source cache
+    get_source_cache().clear()
+    yield
+    get_source_cache().clear()
+
+
+@pytest.fixture
+def patch_device_camera_image(monkeypatch):
+    # Fake camera sources, so tests do not depend on the images in src/img;
+    # twice the source size so that zoomed and panned crops fit
+    import device.device_camera as device_camera_module
+
+    def fake_open(path):
+        size = device_camera_module.DeviceCamera.SOURCE_SIZE * 2
+        return Image.new("RGB", (size, size), "white")
+
+    monkeypatch.setattr(device_camera_module.Image, "open", fake_open)
@@ -0,0 +1,162 @@
+import io
+import json
+
+import pytest
+
+from storage.storage_sqlite import StorageManager
+from storage.camera_storage_sqlite import CameraSqliteDB
+from storage.camera_storage_memory import CameraMemoryDB
+from core.surveillance.camera_controller import CameraController
+from storage.security_storage_sqlite import SecuritySqliteDB
+from storage.system_setting_storage_sqlite import SystemSettingsSqliteDB
+from storage.control_panel_setting_storage_sqlite import ControlPanelSettingsSqliteDB
+from storage.config_transfer import (
+    ConfigFormatError,
+    export_config,
+    import_config,
+    load_config,
+    FORMAT_NAME,
+    FORMAT_VERSION,
+)
+
+DB_INIT_SCRIPT = "src/init.sql"
+DB_FILE = "safehome.db"
+
+
+@pytest.fixture
+def storage_manager():
+    storage_manager = StorageManager(DB_INIT_SCRIPT, DB_FILE)
+    storage_manager.reset()
+    return storage_manager
+
+
+def export(storage_manager, path):
+    return export_config(
+        str(path),
+        SecuritySqliteDB(storage_manager),
+        CameraSqliteDB(storage_manager),
+        SystemSettingsSqliteDB(storage_manager),
+        ControlPanelSettingsSqliteDB(storage_manager),
+    )
+
+
+def snapshot(storage_manager):
+    tables = ("sensors", "cameras", "safehome_modes", "mode_sensor_map", "security_zones", "system_settings")
+    return {
+        table: storage_manager.execute(f'SELECT * FROM "{table}" ORDER BY 1')
+        for table in tables
+    }
+
+
+def config_file(records):
+    lines = [json.dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION})]
+    lines += [json.dumps(r) for r in records]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def test_export_import_roundtrip(storage_manager, tmp_path):
+    path = tmp_path / "site.jsonl.gz"
+    ControlPanelSettingsSqliteDB(storage_manager).set_master_password("9876")
+    before = snapshot(storage_manager)
+
+    count = export(storage_manager, path)
+    assert count > 0
+
+    storage_manager.reset()
+    report = import_config(str(path), storage_manager)
+
+    assert report.counts["sensor"] == 10
+    assert report.counts["camera"] == 3
+    assert report.counts["mode"] == 4
+    assert ControlPanelSettingsSqliteDB(storage_manager).get_master_password() == "9876"
+
+    after = snapshot(storage_manager)
+    for table in ("sensors", "cameras", "safehome_modes", "security_zones"):
+        assert after[table] == before[table]
+    assert [r[1:] for r in after["mode_sensor_map"]] == [r[1:] for r in before["mode_sensor_map"]]
+
+
+def test_export_keeps_memory_cameras_running(storage_manager, tmp_path):
+    camera_db = CameraMemoryDB()
+    with CameraController(camera_db) as ctrl:
+        ctrl.add_camera(camera_id=1, location=(110, 50))
+        camera = camera_db.get_camera_by_id(1).hardware_camera
+        assert camera in camera._clock._subscribers
+
+        export_config(
+            str(tmp_path / "site.jsonl"),
+            SecuritySqliteDB(storage_manager),
+            camera_db,
+            SystemSettingsSqliteDB(storage_manager),
+            ControlPanelSettingsSqliteDB(storage_manager),
+        )
+
+        assert camera in camera._clock._subscribers
+
+
+def test_dry_run_leaves_database_unchanged(storage_manager, tmp_path):
+    path = tmp_path / "site.jsonl"
+    export(storage_manager, path)
+    before = snapshot(storage_manager)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()[1:]]
+    records = [r for r in records if r["t"] != "camera"]
+
+    report = load_config(config_file(records), storage_manager, dry_run=True)
+
+    assert report.dry_run is True
+    assert "camera" not in report.counts
+    assert snapshot(storage_manager) == before
+
+
+def test_invalid_record_rolls_back(storage_manager):
+    before = snapshot(storage_manager)
+    records = [
+        {"t": "sensor", "id": 1, "type": "DeviceWinDoorSensor", "loc": {"x": 1, "y": 2}, "on": True, "arm": None},
+        {"t": "mode", "name": "Home", "sensors": [1, 2]},
+    ]
+
+    with pytest.raises(ConfigFormatError) as e:
+        load_config(config_file(records), storage_manager)
+
+    assert e.value.line == 3
+    assert snapshot(storage_manager) == before
+
+
+@pytest.mark.parametrize("record", [
+    {"t": "sensor", "id": 0, "type": "DeviceWinDoorSensor", "loc": {"x": 1, "y": 2}, "on": True, "arm": None},
+    {"t": "sensor", "id": 1, "type": "Unknown", "loc": {"x": 1, "y": 2}, "on": True, "arm": None},
+    {"t": "camera", "id": 1, "loc": [-1, 0], "pan": 0, "zoom": 2, "password": "", "enabled": True},
+    {"t": "camera", "id": 1, "loc": [1, 0], "pan": 9, "zoom": 2, "password": "", "enabled": True},
+    {"t": "zone", "id": 1, "enabled": True, "rect": [1, 2, 3]},
+    {"t": "setting", "name": "panic_phone_number", "value": {"time": 3}},
+    {"t": "unknown"},
+])
+def test_validation_errors(storage_manager, record):
+    with pytest.raises(ConfigFormatError):
+        load_config(config_file([record]), storage_manager, dry_run=True)
+
+
+def test_rejects_wrong_version(storage_manager):
+    f = io.StringIO(json.dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION + 1}) + "\n")
+
+    with pytest.raises(ConfigFormatError):
+        load_config(f, storage_manager)
+
+
+def test_import_thousands_of_devices(storage_manager):
+    records = []
+    for i in range(1, 2001):
+        records.append({"t": "sensor", "id": i, "type": "DeviceWinDoorSensor",
+                        "loc": {"x": i % 500, "y": i % 300}, "on": True, "arm": None})
+    for i in range(1, 1001):
+        records.append({"t": "camera", "id": i, "loc": [i % 500, i % 300], "pan": 0, "zoom": 2,
+                        "password": "", "enabled": False})
+    records.append({"t": "mode", "name": "Home", "sensors": list(range(1, 101))})
+
+    report = load_config(config_file(records), storage_manager)
+
+    assert report.counts == {"sensor": 2000, "camera": 1000, "mode": 1}
+    assert storage_manager.execute('SELECT COUNT(*) FROM "sensors"')[0][0] == 2000
+    assert storage_manager.execute('SELECT COUNT(*) FROM "cameras"')[0][0] == 1000
+    assert storage_manager.execute('SELECT COUNT(*) FROM "mode_sensor_map"')[0][0] == 100
@@ -0,0 +1,150 @@
+import http.client
+import io
+import json
+import socket
+import time
+
+import pytest
+from PIL import Image
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.mjpeg_server import BOUNDARY, JpegCache, MJPEGServer
+from storage.camera_storage_memory import CameraMemoryDB
+
+# Image.open is patched by patch_device_camera_image; responses are
+# decoded with the real one
+decode = Image.open
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def ctrl():
+    ctrl = CameraController(camera_db=CameraMemoryDB())
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.add_camera(camera_id=2, location=(1, 1), password="secret")
+    ctrl.add_camera(camera_id=3, location=(2, 2))
+    ctrl.disable_camera(3)
+    yield ctrl
+    ctrl._streamer.close()
+
+
+@pytest.fixture
+def server(ctrl):
+    server = MJPEGServer(ctrl, port=0, max_connections=3, max_fps=50)
+    server.start_in_thread()
+    yield server
+    server.stop_thread()
+
+
+def get(server, path, headers=None):
+    conn = http.client.HTTPConnection(server.host, server.port, timeout=5)
+    conn.request("GET", path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response.status, response.getheader("Content-Type"), body
+
+
+def open_stream(server, path):
+    sock = socket.create_connection((server.host, server.port), timeout=5)
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    return sock
+
+
+def read_part(sock):
+    # Read until one complete JPEG part has arrived
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        assert chunk, "stream closed"
+        data += chunk
+        start = data.find(f"--{BOUNDARY}".encode())
+        if start < 0:
+            continue
+        head_end = data.find(b"\r\n\r\n", start)
+        if head_end < 0:
+            continue
+        headers = data[start:head_end].decode()
+        length = int(headers.split("Content-Length: ")[1].split("\r\n")[0])
+        if len(data) >= head_end + 4 + length:
+            return data[head_end + 4:head_end + 4 + length]
+
+
+def test_camera_list(server):
+    status, content_type, body = get(server, "/cameras")
+
+    assert status == 200
+    assert content_type == "application/json"
+    assert [c["camera_id"] for c in json.loads(body)] == [1, 2, 3]
+
+
+def test_snapshot_is_encoded_once_per_frame(server, ctrl):
+    ctrl._cameras[1].hardware_camera.stop()
+
+    status, content_type, body = get(server, "/cameras/1/snapshot.jpg")
+    get(server, "/cameras/1/snapshot.jpg")
+
+    assert status == 200
+    assert content_type == "image/jpeg"
+    assert decode(io.BytesIO(body)).size == (160, 160)
+    assert server.jpegs.encodes == 1
+
+
+def test_snapshot_errors_and_passwords(server):
+    assert get(server, "/cameras/9/snapshot.jpg")[0] == 404
+    assert get(server, "/cameras/2/snapshot.jpg")[0] == 403
+    assert get(server, "/cameras/2/snapshot.jpg?password=wrong")[0] == 403
+    assert get(server, "/cameras/2/snapshot.jpg?password=secret")[0] == 200
+    assert get(server, "/cameras/2/snapshot.jpg", {"X-Camera-Password": "secret"})[0] == 200
+    assert get(server, "/cameras/3/snapshot.jpg")[0] == 409
+    assert get(server, "/cameras/1/snapshot.jpg?size=abc")[0] == 400
+    assert get(server, "/nowhere")[0] == 404
+
+
+def test_stream_shares_encoding_between_clients(server, ctrl):
+    ctrl._cameras[1].hardware_camera.stop()
+    first = open_stream(server, "/cameras/1/stream.mjpg?size=100")
+    second = open_stream(server, "/cameras/1/stream.mjpg?size=100")
+
+    a = read_part(first)
+    b = read_part(second)
+
+    assert a == b
+    assert decode(io.BytesIO(a)).size == (100, 100)
+    assert server.jpegs.encodes == 1
+    assert ctrl._streamer.subscriber_count(1) == 1
+
+    first.close()
+    second.close()
+    end = time.monotonic() + 2
+    while ctrl._streamer.subscriber_count() and time.monotonic() < end:
+        time.sleep(0.01)
+    assert ctrl._streamer.subscriber_count() == 0
+
+
+def test_connection_limit(server):
+    streams = [open_stream(server, "/cameras/1/stream.mjpg") for _ in range(3)]
+    for sock in streams:
+        read_part(sock)
+
+    assert get(server, "/cameras")[0] == 503
+
+    for sock in streams:
+        sock.close()
+
+
+def test_jpeg_cache_evicts_least_recently_used():
+    image = Image.new("RGB", (64, 64), "gray")
+    size = len(JpegCache().encode(1, 64, 0, image))
+    cache = JpegCache(max_bytes=3 * size)
+
+    for view_size in range(1, 11):
+        cache.encode(1, view_size, 0, image)
+        cache.get(1, 1, 0)
+
+    assert len(cache) == 3
+    assert cache.total_bytes <= cache.max_bytes
+    # Kept in use, so never evicted
+    assert cache.get(1, 1, 0) is not None
+    assert cache.get(1, 2, 0) is None
@@ -0,0 +1,97 @@
+import pytest
+
+from storage.storage_sqlite import StorageManager
+from storage.security_storage_sqlite import SecuritySqliteDB
+from storage.spatial_index_sqlite import SpatialIndexSqliteDB
+from storage.log_storage_sqlite import LogSqliteDB
+from core.log.log_manager import LogManager
+from core.security.security_manager import SecurityManager
+from core.security.security_zone import SecurityZone
+from core.security.security_zone_geometry.area import Square
+
+
+@pytest.fixture
+def storage_manager(tmp_path):
+    return StorageManager("src/init.sql", str(tmp_path / "test_safehome.db"))
+
+
+@pytest.fixture
+def manager(storage_manager):
+    return SecurityManager(SecuritySqliteDB(storage_manager), LogManager(LogSqliteDB(storage_manager)))
+
+
+def test_sensors_intersecting_rectangle(storage_manager):
+    index = SpatialIndexSqliteDB(storage_manager)
+
+    # window/door sensors at (20, 80) and (70, 20), motion detector along y = 80
+    assert index.get_sensors_intersecting((0, 0, 100, 100)) == {1, 2, 9}
+    assert index.get_sensors_intersecting((300, 290, 310, 300)) == set()
+
+
+def test_index_follows_sensor_writes(storage_manager):
+    index = SpatialIndexSqliteDB(storage_manager)
+    index.ensure_schema()
+
+    storage_manager.execute(
+        "UPDATE sensors SET location = ? WHERE sensor_id = ?", ('{"x": 305, "y": 295}', 1))
+    assert index.get_sensors_intersecting((300, 290, 310, 300)) == {1}
+
+    storage_manager.execute("DELETE FROM mode_sensor_map WHERE sensor_id = ?", (1,))
+    storage_manager.execute("DELETE FROM sensors WHERE sensor_id = ?", (1,))
+    assert index.get_sensors_intersecting((300, 290, 310, 300)) == set()
+
+
+def test_index_rebuilt_after_reset(storage_manager):
+    index = SpatialIndexSqliteDB(storage_manager)
+    assert index.get_sensors_intersecting((0, 0, 100, 100)) == {1, 2, 9}
+
+    storage_manager.reset()
+
+    assert index.get_sensors_intersecting((0, 0, 100, 100)) == {1, 2, 9}
+
+
+def test_zones_containing_point(manager):
+    zone = manager.add_security_zone()
+    x, y = zone.area.up_left[0] + 1, zone.area.up_left[1] + 1
+
+    assert manager.get_security_zones_at(x, y) == [zone]
+
+    manager.update_security_zone(zone.id, Square(0, 10, 0, 10))
+    assert manager.get_security_zones_at(x, y) == []
+    assert manager.get_security_zones_at(5, 5) == [zone]
+
+    manager.remove_security_zone(zone.id)
+    assert manager.db_manager.get_security_zones_containing(5, 5) == set()
+
+
+def test_point_just_outside_zone_edge(manager):
+    zone = manager.add_security_zone()
+    manager.update_security_zone(zone.id, Square(0, 10.3, 0, 10.3))
+    # Inside the rectangle the index stores, which is rounded outwards
+    x = 10.3 + 1e-7
+    assert zone.id in manager.db_manager.get_security_zones_containing(x, 5)
+
+    assert manager.get_security_zones_at(x, 5) == []
+    assert manager.get_security_zones_at(10.3, 5) == [zone]
+
+
+def test_zone_sensors_match_full_scan(manager):
+    zone = manager.add_security_zone()
+
+    for area in (Square(0, 100, 0, 100), Square(150, 260, 0, 160), Square(0, 300, 0, 500)):
+        manager.update_security_zone(zone.id, area)
+        expected = SecurityZone(area, list(manager.sensors.keys())).sensors
+
+        assert {s.get_id() for s in zone.sensors} == {s.get_id() for s in expected}
+
+
+def test_runtime_sensors_are_still_considered(manager):
+    from device.device_windoor_sensor import DeviceWinDoorSensor
+
+    sensor = DeviceWinDoorSensor(5, 5)
+    manager.add_sensor(sensor)
+    zone = manager.add_security_zone()
+
+    manager.update_security_zone(zone.id, Square(0, 10, 0, 10))
+
+    assert sensor in zone.sensors
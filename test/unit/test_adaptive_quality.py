@@ -0,0 +1,70 @@
+import pytest
+
+from core.surveillance.adaptive_quality import LEVELS, AdaptiveQuality, QualityLevel
+
+
+def test_starts_at_full_quality():
+    quality = AdaptiveQuality()
+
+    assert quality.current(now=0.0) is LEVELS[0]
+    assert quality.load(now=0.0) == 0.0
+
+
+def test_level_rises_one_step_per_hold_under_load():
+    quality = AdaptiveQuality(budget=0.5, window=1.0, hold=1.0)
+
+    quality.record(0.8, now=10.0)
+    assert quality.current(now=10.0).level == 1
+    # Still over budget, but the level was just changed
+    quality.record(0.8, now=10.5)
+    assert quality.current(now=10.5).level == 1
+
+    quality.record(0.8, now=11.2)
+    assert quality.current(now=11.2).level == 2
+
+
+def test_level_restores_once_load_drops():
+    quality = AdaptiveQuality(budget=0.5, window=1.0, hold=1.0)
+    quality.record(0.8, now=10.0)
+    assert quality.current(now=10.0).level == 1
+
+    # Between restore_ratio * budget and budget: keep the level
+    quality.record(0.4, now=11.5)
+    assert quality.current(now=11.5).level == 1
+
+    assert quality.current(now=13.0).level == 0
+
+
+def test_level_stops_at_lowest_quality():
+    quality = AdaptiveQuality(budget=0.1, window=1.0, hold=0.0)
+    for step in range(2 * len(LEVELS)):
+        quality.record(1.0, now=float(step))
+
+    assert quality.current(now=float(step)) is LEVELS[-1]
+
+
+def test_disabled_keeps_full_quality():
+    quality = AdaptiveQuality(budget=0.5)
+    quality.record(0.8, now=1.0)
+    assert quality.current(now=1.0).level == 1
+
+    quality.set_enabled(False)
+    quality.record(5.0, now=1.5)
+
+    assert quality.current(now=1.5) is LEVELS[0]
+
+
+def test_apply_only_lowers_quality():
+    bilinear = QualityLevel(1, "bilinear", 1.0, None)
+
+    assert bilinear.apply("lanczos") == "bilinear"
+    assert bilinear.apply("nearest") == "nearest"
+    assert bilinear.apply("reduce") == "reduce"
+    assert LEVELS[0].apply("lanczos") == "lanczos"
+
+
+def test_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        AdaptiveQuality(budget=0)
+    with pytest.raises(ValueError):
+        AdaptiveQuality().set_budget(-1)
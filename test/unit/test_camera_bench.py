@@ -0,0 +1,74 @@
+import threading
+import time
+
+from bench import camera_bench
+from bench.common import load_results, time_ops
+from device.device_camera import _overlay_tile
+from device.source_cache import get_source_cache
+
+
+def test_camera_bench_runs_every_scenario(tmp_path):
+    output = tmp_path / "camera.json"
+
+    assert camera_bench.main(["--cameras", "1", "2", "--sizes", "100", "--qualities", "nearest",
+                              "--frames", "3", "--output", str(output)]) == 0
+
+    saved = load_results(str(output))
+    assert saved["suite"] == "camera"
+    seen = {(r["scenario"], r["cameras"]) for r in saved["results"]}
+    assert seen == {(s, n) for s in camera_bench.SCENARIOS for n in (1, 2)}
+    for r in saved["results"]:
+        assert r["ops"] == 3
+        assert r["fps"] > 0
+        assert r["size"] == (100 if r["scenario"] in ("view", "pan_zoom_sweep") else 160)
+
+
+def test_wall_fps_counts_every_camera():
+    result = camera_bench.run_case("wall_cached", 4, 160, "nearest", 2)
+
+    assert result["fps"] == result["ops_per_s"] * 4
+
+
+def test_cases_start_from_the_same_cache_state(monkeypatch):
+    states = []
+
+    def record_state(ops):
+        states.append((get_source_cache().stats()["entries"],
+                       _overlay_tile.cache_info().currsize))
+        return time_ops(ops)
+
+    monkeypatch.setattr(camera_bench, "time_ops", record_state)
+    camera_bench.run_case("view", 2, 100, "bilinear", 2)
+    camera_bench.run_case("thumbnail", 2, 160, "bilinear", 2)
+    camera_bench.run_case("view", 2, 100, "bilinear", 2)
+
+    assert states[0] == states[2]
+
+
+def _render_threads():
+    return {t for t in threading.enumerate() if t.name.startswith("camera-render")}
+
+
+def test_wall_cases_keep_cameras_still_and_close_the_controller(monkeypatch):
+    cameras = []
+    subscribed = []
+    new_camera = camera_bench._new_camera
+
+    def record_camera(index):
+        cameras.append(new_camera(index))
+        return cameras[-1]
+
+    def record_subscribed(ops):
+        subscribed.extend(c for c in cameras if c.hardware_camera in c.hardware_camera._clock._subscribers)
+        return time_ops(ops)
+
+    monkeypatch.setattr(camera_bench, "_new_camera", record_camera)
+    monkeypatch.setattr(camera_bench, "time_ops", record_subscribed)
+    before = _render_threads()
+    camera_bench.run_case("thumbnail_wall", 2, 160, "nearest", 2)
+
+    assert subscribed == []
+    end = time.monotonic() + 5
+    while _render_threads() - before and time.monotonic() < end:
+        time.sleep(0.01)
+    assert _render_threads() - before == set()
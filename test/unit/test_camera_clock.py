@@ -0,0 +1,77 @@
+import gc
+import threading
+
+import pytest
+
+from device.camera_clock import CameraClock, get_camera_clock
+from device.device_camera import DeviceCamera
+
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def clock():
+    # Long interval so only explicit ticks advance the cameras
+    clock = CameraClock(interval=60)
+    yield clock
+    clock.close()
+
+
+def test_tick_advances_subscribed_cameras(clock):
+    cameras = [DeviceCamera(clock) for _ in range(3)]
+
+    clock.tick()
+
+    assert [c.time for c in cameras] == [1, 1, 1]
+
+    cameras[0].stop()
+    clock.tick()
+    assert [c.time for c in cameras] == [1, 2, 2]
+
+    cameras[0].start()
+    clock.tick()
+    assert cameras[0].time == 2
+
+
+def test_thread_count_does_not_grow_with_cameras(clock):
+    first = DeviceCamera(clock)
+    before = threading.active_count()
+
+    cameras = [DeviceCamera(clock) for _ in range(50)]
+
+    assert threading.active_count() == before
+    assert clock.subscriber_count() == len(cameras) + 1
+
+
+def test_unused_cameras_are_dropped(clock):
+    camera = DeviceCamera(clock)
+    assert clock.subscriber_count() == 1
+
+    del camera
+    gc.collect()
+
+    assert clock.subscriber_count() == 0
+
+
+def test_start_stop_close(clock):
+    DeviceCamera(clock)
+    assert clock.is_running()
+
+    clock.stop()
+    assert not clock.is_running()
+
+    clock.start()
+    assert clock.is_running()
+
+    clock.close()
+    assert not clock.is_running()
+    with pytest.raises(RuntimeError):
+        DeviceCamera(clock)
+
+
+def test_cameras_share_the_default_clock():
+    camera = DeviceCamera()
+
+    assert camera._clock is get_camera_clock()
+    camera.stop()
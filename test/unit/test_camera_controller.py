@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from typing import Dict, List, Optional, Iterable
 
 import pytest
@@ -10,6 +12,8 @@ from PIL import Image
 # Adjust imports to match your layout
 from core.surveillance.camera_controller import CameraController
 from core.surveillance.safehome_camera import SafeHomeCamera
+from core.surveillance.thumbnail_cache import placeholder
+from core.security.security_zone_geometry.area import Square
 from device.device_camera import DeviceCamera
 from core.surveillance.camera_exceptions import (
     CameraNotFoundError,
@@ -60,6 +64,10 @@ class InMemoryCameraDB:
         self._store[camera.camera_id] = camera
         self.updated.append(camera.camera_id)
 
+    def update_cameras(self, cameras: Iterable[SafeHomeCamera]) -> None:
+        for camera in cameras:
+            self.update_camera(camera)
+
     def delete_camera(self, camera_id: int) -> None:
         if camera_id not in self._store:
             raise CameraNotFoundError(
@@ -430,3 +438,269 @@ def test_get_thumbnail_views_normal(controller):
     assert thumbs[1].size == (160, 160)
     assert thumbs[2].size == (160, 160)
     assert thumbs[3].size == (160, 160)
+
+
+def test_thumbnails_reused_until_frame_changes(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    # Keep the clock from ticking between the two calls
+    ctrl._cameras[1].hardware_camera._tick = lambda: None
+
+    first = ctrl.get_thumbnail_views()[1]
+    assert ctrl.get_thumbnail_views()[1] is first
+
+    ctrl.pan_right(1)
+    assert ctrl.get_thumbnail_views()[1] is not first
+
+
+def test_thumbnails_follow_enable_and_password_changes(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.add_camera(camera_id=2, location=(1, 1))
+    ctrl.get_thumbnail_views()
+    assert ctrl.get_thumbnail_cache_stats()["entries"] == 2
+
+    ctrl.disable_camera(1)
+    ctrl.set_camera_password(2, "secret")
+    thumbs = ctrl.get_thumbnail_views()
+
+    assert thumbs[1] is ctrl.get_thumbnail_views()[1]
+    assert thumbs[1] is not thumbs[2]
+    assert ctrl.get_thumbnail_cache_stats()["entries"] == 0
+
+
+def test_thumbnail_cache_respects_max_bytes(controller):
+    ctrl, _ = controller
+    ctrl.set_thumbnail_max_bytes(160 * 160 * 3)
+    for cid in range(1, 5):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+
+    thumbs = ctrl.get_thumbnail_views()
+
+    assert len(thumbs) == 4
+    assert ctrl.get_thumbnail_cache_stats()["entries"] == 1
+
+
+def test_render_views_renders_requested_cameras(controller):
+    ctrl, _ = controller
+    for cid in range(1, 4):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+
+    batch = ctrl.render_views([1, 3], size=100)
+
+    assert batch.complete
+    assert set(batch.images) == {1, 3}
+    assert batch.images[1].size == (100, 100)
+
+    with pytest.raises(CameraNotFoundError):
+        ctrl.render_views([9])
+
+
+def test_thumbnails_past_deadline_show_placeholder(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.add_camera(camera_id=2, location=(1, 1))
+    release = threading.Event()
+    slow = ctrl._cameras[2]
+    original = slow.display_thumbnail
+
+    def display_thumbnail(quality):
+        release.wait(1)
+        return original(quality)
+
+    slow.display_thumbnail = display_thumbnail
+    thumbs = ctrl.get_thumbnail_views(timeout=0.05)
+    release.set()
+
+    assert list(thumbs) == [1, 2]
+    assert thumbs[1].size == (160, 160)
+    assert thumbs[2] is placeholder("Loading")
+    assert ctrl.get_thumbnail_cache_stats()["entries"] == 1
+
+
+def test_thumbnail_mosaic_redraws_changed_cameras(controller):
+    ctrl, _ = controller
+    for cid in range(1, 5):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+        ctrl._cameras[cid].hardware_camera._tick = lambda: None
+
+    mosaic = ctrl.get_thumbnail_mosaic()
+    assert set(mosaic.tiles) == {1, 2, 3, 4}
+    assert ctrl.get_thumbnail_mosaic().dirty == []
+
+    ctrl.pan_right(2)
+    ctrl.disable_camera(3)
+    assert ctrl.get_thumbnail_mosaic().dirty == [mosaic.tiles[2], mosaic.tiles[3]]
+    assert ctrl.get_thumbnail_mosaic(columns=2).image.size == (
+        2 * mosaic.cell_width, 2 * mosaic.cell_height)
+
+
+def test_camera_snapshot_reused_until_state_changes(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(10, 20))
+    ctrl.add_camera(camera_id=2, location=(30, 40), password="pw")
+
+    snapshot = ctrl.get_camera_snapshot()
+    assert snapshot.version == ctrl.camera_version
+    assert ctrl.get_camera_snapshot() is snapshot
+    assert list(snapshot.camera_ids) == [1, 2]
+    assert snapshot.get(2) == ctrl.get_camera_info(2)
+    assert 3 not in snapshot
+    with pytest.raises(TypeError):
+        snapshot.xs[0] = 0
+
+    # Pan and zoom are not part of CameraInfo
+    ctrl.pan_right(1)
+    assert ctrl.get_camera_snapshot() is snapshot
+
+    ctrl.disable_camera(1)
+    latest = ctrl.get_camera_snapshot()
+    assert latest.version > snapshot.version
+    assert latest.get(1).enabled is False
+    assert snapshot.get(1).enabled is True
+
+
+def test_changes_since_reports_changed_and_deleted_cameras(controller):
+    ctrl, _ = controller
+    for cid in range(1, 5):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+    version = ctrl.camera_version
+
+    assert len(ctrl.changes_since(version)) == 0
+    ctrl.set_camera_password(2, "pw")
+    ctrl.disable_cameras([3])
+    ctrl.delete_camera(4)
+    ctrl.add_camera(camera_id=5, location=(5, 5))
+
+    changes = ctrl.changes_since(version)
+
+    assert changes.since == version
+    assert changes.version == ctrl.camera_version
+    assert sorted(info.camera_id for info in changes) == [2, 3, 5]
+    assert changes.get(2).has_password
+    assert changes.deleted == (4,)
+    assert len(ctrl.changes_since(changes.version)) == 0
+    # Version 0 means the caller has nothing yet
+    assert len(ctrl.changes_since(0)) == 4
+    with pytest.raises(ValueError):
+        ctrl.changes_since(ctrl.camera_version + 1)
+
+
+def overload(ctrl, level):
+    # Drive the controller's adaptive quality to level
+    ctrl._quality.hold = 0.0
+    for _ in range(level):
+        # Each over-budget render raises the level one step
+        ctrl._quality.record(10.0)
+    # Stay there for the rest of the test
+    ctrl._quality.hold = 60.0
+
+
+def test_render_load_degrades_non_focused_views(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.add_camera(camera_id=2, location=(1, 1))
+    ctrl.set_focused_camera(1)
+    overload(ctrl, 3)
+
+    thumbs = ctrl.get_thumbnail_views()
+    views = ctrl.render_views([1, 2], size=100)
+
+    assert ctrl.get_render_load()["level"] == 3
+    assert thumbs[2].size == (160, 160)
+    assert views.images[2].size == (100, 100)
+    # The focused camera renders as configured, the other at half size
+    assert ctrl.get_single_view(1, size=100) is ctrl._cameras[1].display_view(100, "bilinear")
+    assert ctrl.get_single_view(2, size=100) is not ctrl._cameras[2].display_view(100, "bilinear")
+
+
+def test_streamed_views_follow_quality_level(controller):
+    ctrl, _ = controller
+    for cid in (1, 2):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+        ctrl._cameras[cid].hardware_camera.stop()
+    ctrl.set_focused_camera(1)
+    overload(ctrl, 3)
+    samples = len(ctrl._quality._samples)
+
+    with ctrl.subscribe(1, fps=50, size=100) as focused, \
+            ctrl.subscribe(2, fps=50, size=100) as other:
+        focused_frame = focused.get(timeout=2)
+        other_frame = other.get(timeout=2)
+
+    assert focused_frame.image is ctrl._cameras[1].display_view(100, "bilinear")
+    assert other_frame.image.size == (100, 100)
+    assert other_frame.image is not ctrl._cameras[2].display_view(100, "bilinear")
+    # Streamed renders count towards the load
+    assert len(ctrl._quality._samples) >= samples + 2
+    ctrl._streamer.close()
+
+
+def test_low_refresh_level_limits_non_focused_streams(controller):
+    ctrl, _ = controller
+    for cid in (1, 2):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+        ctrl._cameras[cid].hardware_camera.stop()
+    ctrl.set_focused_camera(1)
+    # Level 5 refreshes non-focused cameras every 2 seconds
+    overload(ctrl, 5)
+    received = {1: [], 2: []}
+
+    with ctrl.subscribe(1, fps=50, callback=received[1].append), \
+            ctrl.subscribe(2, fps=50, callback=received[2].append):
+        end = time.monotonic() + 0.5
+        while time.monotonic() < end:
+            for cid in (1, 2):
+                ctrl._cameras[cid].hardware_camera._tick()
+            time.sleep(0.02)
+
+    assert len(received[1]) > 3
+    assert len(received[2]) == 1
+
+
+def test_low_refresh_level_reuses_outdated_thumbnails(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl._cameras[1].hardware_camera._tick = lambda: None
+    overload(ctrl, 5)
+
+    first = ctrl.get_thumbnail_views()[1]
+    ctrl.pan_right(1)
+    assert ctrl.get_thumbnail_views()[1] is first
+
+    ctrl.set_adaptive_quality(False)
+    assert ctrl.get_quality_level().level == 0
+    assert ctrl.get_thumbnail_views()[1] is not first
+
+
+def test_focused_camera_must_exist(controller):
+    ctrl, _ = controller
+    with pytest.raises(CameraNotFoundError):
+        ctrl.set_focused_camera(1)
+
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.set_focused_camera(1)
+    ctrl.delete_camera(1)
+
+    assert ctrl.get_focused_camera() is None
+
+
+def test_nearest_camera_and_cameras_in_area(controller):
+    ctrl, _ = controller
+    ctrl.add_camera(camera_id=1, location=(10, 10))
+    ctrl.add_camera(camera_id=2, location=(50, 10))
+    ctrl.add_camera(camera_id=3, location=(50, 60))
+    ctrl.disable_camera(2)
+
+    assert ctrl.get_nearest_camera((48, 30)).camera_id == 2
+    assert ctrl.get_nearest_camera((48, 30), enabled_only=True).camera_id == 3
+    assert ctrl.get_nearest_camera((48, 30), max_distance=5) is None
+    assert [c.camera_id for c in ctrl.get_nearest_cameras((0, 0), count=2)] == [1, 2]
+    assert [c.camera_id for c in ctrl.get_cameras_in_area((40, 0, 60, 100))] == [2, 3]
+    assert ctrl.get_cameras_in_area(Square(up=100, down=0, left=40, right=60).bounds(),
+                                    enabled_only=True)[0].camera_id == 3
+
+    # The index follows camera changes
+    ctrl.delete_camera(2)
+    ctrl.add_camera(camera_id=4, location=(44, 21))
+    assert ctrl.get_nearest_camera((48, 30)).camera_id == 4
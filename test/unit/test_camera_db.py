@@ -1,4 +1,5 @@
 from storage.storage_sqlite import StorageManager
+from storage.storage_stats import normalize_statement
 from storage.camera_storage_sqlite import CameraSqliteDB
 from core.surveillance.safehome_camera import SafeHomeCamera
 from device.device_camera import DeviceCamera
@@ -55,3 +56,54 @@ def test_get_camera_by_id():
     assert camera.password == "1234"
     assert camera.has_password == True
     assert camera.enabled == True
+
+
+def test_create_and_delete_camera():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+
+    camera_db = CameraSqliteDB(storage_manager)
+
+    camera = SafeHomeCamera(
+                camera_id       = 4              ,
+                location        = (10, 20)       ,
+                hardware_camera = DeviceCamera() ,
+                has_password    = False          ,
+                password        = ""             ,
+                enabled         = True
+            )
+
+    camera_db.create_camera(camera)
+
+    stored = camera_db.get_camera_by_id(4)
+    assert stored.location == (10, 20)
+    assert stored.enabled == True
+    assert len(camera_db.get_all_cameras()) == 4
+
+    camera_db.delete_camera(4)
+
+    assert camera_db.get_camera_by_id(4) is None
+    assert len(camera_db.get_all_cameras()) == 3
+
+
+def test_update_cameras():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+
+    camera_db = CameraSqliteDB(storage_manager)
+
+    cameras = camera_db.get_all_cameras()
+    for camera in cameras:
+        camera.enabled = False
+        camera.pan_angle = camera.camera_id
+
+    camera_db.update_cameras(cameras)
+
+    stored = camera_db.get_all_cameras()
+    assert [c.enabled for c in stored] == [False, False, False]
+    assert [c.pan_angle for c in stored] == [1, 2, 3]
+    statements = storage_manager.dump_stats()["statements"]
+    update = normalize_statement(CameraSqliteDB.UPDATE_QUERY)
+    assert statements[update]["calls"] == 1
+    assert statements[update]["rows"] == 3
+    assert statements["COMMIT"]["calls"] == 1
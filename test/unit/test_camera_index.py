@@ -0,0 +1,65 @@
+import random
+from math import hypot
+
+import pytest
+
+from core.surveillance.camera_index import CameraLocationIndex
+
+
+def random_entries(count, seed=0, span=50):
+    rng = random.Random(seed)
+    # Small span so that many cameras share a coordinate
+    return [(cid, rng.randrange(span), rng.randrange(span)) for cid in range(1, count + 1)]
+
+
+def brute_nearest(entries, x, y, count, max_distance=None):
+    candidates = [(hypot(cx - x, cy - y), cid) for cid, cx, cy in entries]
+    if max_distance is not None:
+        candidates = [c for c in candidates if c[0] <= max_distance]
+    return [cid for _, cid in sorted(candidates)[:count]]
+
+
+def test_empty_index():
+    index = CameraLocationIndex([])
+
+    assert len(index) == 0
+    assert index.nearest(0, 0) == []
+    assert index.in_area((0, 0, 100, 100)) == []
+
+
+@pytest.mark.parametrize("count", [1, 3, 10])
+def test_nearest_matches_brute_force(count):
+    entries = random_entries(300)
+    index = CameraLocationIndex(entries)
+    rng = random.Random(1)
+    for _ in range(100):
+        x, y = rng.uniform(-10, 60), rng.uniform(-10, 60)
+        assert index.nearest(x, y, count) == brute_nearest(entries, x, y, count)
+
+
+def test_nearest_respects_max_distance_and_accept():
+    entries = [(1, 0, 0), (2, 10, 0), (3, 20, 0)]
+    index = CameraLocationIndex(entries)
+
+    assert index.nearest(1, 0, count=3, max_distance=10) == [1, 2]
+    assert index.nearest(1, 0, accept=lambda cid: cid != 1) == [2]
+    assert index.nearest(100, 100, max_distance=5) == []
+    with pytest.raises(ValueError):
+        index.nearest(0, 0, count=0)
+
+
+def test_nearest_breaks_ties_by_id():
+    index = CameraLocationIndex([(3, 5, 0), (1, -5, 0), (2, 0, 5)])
+
+    assert index.nearest(0, 0, count=2) == [1, 2]
+
+
+def test_in_area_matches_brute_force():
+    entries = random_entries(300, seed=2)
+    index = CameraLocationIndex(entries)
+    rng = random.Random(3)
+    for _ in range(100):
+        x1, x2 = sorted(rng.randrange(-5, 55) for _ in range(2))
+        y1, y2 = sorted(rng.randrange(-5, 55) for _ in range(2))
+        expected = sorted(cid for cid, x, y in entries if x1 <= x <= x2 and y1 <= y <= y2)
+        assert index.in_area((x1, y1, x2, y2)) == expected
@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.camera_write_buffer import BufferedCameraDB
+from device.camera_resources import CameraResourceManager, get_resource_manager
+from device.device_camera import DeviceCamera
+from device.source_cache import SourceImageCache
+from storage.camera_storage_memory import CameraMemoryDB
+
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def cameras():
+    cameras = []
+    for cid in (1, 2, 3):
+        camera = DeviceCamera()
+        camera.set_id(cid)
+        camera.stop()
+        cameras.append(camera)
+    yield cameras
+    for camera in cameras:
+        camera.close()
+
+
+def rendered_manager(cameras, **kwargs):
+    # Render times are 0, 1 and 2 seconds after the returned start, which
+    # is recent enough that the shared manager leaves the cameras alone
+    manager = CameraResourceManager(source_cache=SourceImageCache(), **kwargs)
+    start = time.monotonic()
+    for i, camera in enumerate(cameras):
+        manager.register(camera)
+        camera.get_view()
+        camera.last_used = start + i
+    return manager, start
+
+
+def test_released_camera_reloads_on_next_render(cameras):
+    camera = cameras[0]
+    first = camera.get_view()
+    assert camera.holds_resources()
+    assert camera.resource_bytes() == 500 * 500 * 3
+
+    camera.release()
+
+    assert not camera.holds_resources()
+    assert camera.resource_bytes() == 0
+    view = camera.get_view()
+    assert view is not first
+    assert view.tobytes() == first.tobytes()
+
+
+def test_enforce_releases_idle_cameras(cameras):
+    manager, start = rendered_manager(cameras, idle_seconds=10)
+
+    assert manager.enforce(now=start + 11.5) == 2
+
+    assert [c.holds_resources() for c in cameras] == [False, False, True]
+    assert manager.usage()["releases"] == 2
+
+
+def test_enforce_releases_least_recently_used_over_budget(cameras):
+    frame = 500 * 500 * 3
+    manager, start = rendered_manager(cameras, idle_seconds=1000, max_bytes=2 * frame)
+
+    assert manager.usage()["camera_bytes"] == 3 * frame
+    assert manager.enforce(now=start + 1) == 1
+
+    assert [c.holds_resources() for c in cameras] == [False, True, True]
+    assert manager.usage()["total_bytes"] <= 2 * frame
+
+
+def test_enforce_trims_source_cache_last(cameras, tmp_path):
+    source = tmp_path / "a.jpg"
+    source.write_bytes(b"")
+    cache = SourceImageCache()
+    cache.load(str(source))
+    assert cache.stats()["total_bytes"] > 0
+    manager = CameraResourceManager(max_bytes=0, source_cache=cache)
+    manager.register(cameras[0])
+    cameras[0].get_view()
+
+    manager.enforce()
+
+    assert not cameras[0].holds_resources()
+    assert cache.stats()["total_bytes"] == 0
+    assert manager.usage()["total_bytes"] == 0
+
+
+def test_cameras_register_with_the_shared_manager(cameras):
+    manager = get_resource_manager()
+    assert cameras[0] in manager._snapshot()
+
+    cameras[0].close()
+    assert cameras[0] not in manager._snapshot()
+
+    cameras[0].start()
+    assert cameras[0] in manager._snapshot()
+
+
+def test_controller_close_releases_cameras():
+    with CameraController() as controller:
+        controller.add_camera(camera_id=1, location=(0, 0))
+        camera = controller._cameras[1].hardware_camera
+        controller.get_thumbnail_views()
+        stream = controller.subscribe(1, fps=1)
+
+    assert stream.closed
+    assert not camera.holds_resources()
+    assert camera not in camera._clock._subscribers
+    # A second close does nothing
+    controller.close()
+
+
+def test_controller_restarts_cameras_loaded_from_db():
+    db = CameraMemoryDB()
+    first = CameraController(db)
+    first.add_camera(camera_id=1, location=(0, 0))
+    camera = first._cameras[1].hardware_camera
+    first.close()
+
+    second = CameraController(db)
+
+    assert camera in camera._clock._subscribers
+    assert second.get_single_view(1).size == (500, 500)
+    second.close()
+
+
+def test_camera_db_close_closes_stored_cameras():
+    db = CameraMemoryDB()
+    controller = CameraController(BufferedCameraDB(db))
+    controller.add_camera(camera_id=1, location=(0, 0))
+    controller.pan_right(1)
+    camera = controller._cameras[1].hardware_camera
+    camera.get_view()
+
+    with controller._camera_db:
+        pass
+
+    assert controller._camera_db.pending() == []
+    assert db.get_camera_by_id(1).pan_angle == 1
+    assert not camera.holds_resources()
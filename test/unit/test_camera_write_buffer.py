@@ -0,0 +1,174 @@
+import threading
+import time
+
+import pytest
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.camera_write_buffer import BufferedCameraDB
+from storage.camera_storage_memory import CameraMemoryDB
+
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+class CountingDB(CameraMemoryDB):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def update_cameras(self, cameras):
+        cameras = list(cameras)
+        self.batches.append(sorted(c.camera_id for c in cameras))
+        super().update_cameras(cameras)
+
+
+@pytest.fixture
+def inner():
+    return CountingDB()
+
+
+@pytest.fixture
+def ctrl(inner):
+    db = BufferedCameraDB(inner, idle_delay=60, max_delay=120)
+    ctrl = CameraController(camera_db=db)
+    for cid in (1, 2, 3):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+    return ctrl, db
+
+
+def test_ptz_writes_are_coalesced(ctrl, inner):
+    ctrl, db = ctrl
+    for _ in range(4):
+        ctrl.pan_right(1)
+    ctrl.zoom_in(2)
+
+    assert inner.batches == []
+    assert sorted(db.pending()) == [1, 2]
+
+    db.flush()
+    assert inner.batches == [[1, 2]]
+    assert db.pending() == []
+
+
+def test_reads_see_pending_changes(ctrl, inner):
+    ctrl, db = ctrl
+    ctrl.pan_right(1)
+
+    assert db.get_camera_by_id(1).pan_angle == 1
+    assert inner.batches == [[1]]
+
+
+def test_enable_all_is_one_batch(ctrl, inner):
+    ctrl, db = ctrl
+    ctrl.disable_all()
+    ctrl.enable_cameras([1, 3])
+    db.close()
+
+    assert inner.batches == [[1, 2, 3]]
+    assert [c.enabled for c in inner.get_all_cameras()] == [True, False, True]
+
+
+def test_flush_after_idle_delay(inner):
+    db = BufferedCameraDB(inner, idle_delay=0.05, max_delay=1)
+    ctrl = CameraController(camera_db=db)
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+
+    ctrl.pan_left(1)
+    end = time.monotonic() + 2
+    while db.pending() and time.monotonic() < end:
+        time.sleep(0.01)
+
+    assert inner.batches == [[1]]
+
+
+def test_max_delay_bounds_debouncing(inner):
+    db = BufferedCameraDB(inner, idle_delay=0.2, max_delay=0.1)
+    ctrl = CameraController(camera_db=db)
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+
+    end = time.monotonic() + 0.5
+    while not inner.batches and time.monotonic() < end:
+        ctrl.zoom_in(1)
+        ctrl.zoom_out(1)
+        time.sleep(0.02)
+
+    assert inner.batches
+
+
+def test_discard_and_delete_drop_pending(ctrl, inner):
+    ctrl, db = ctrl
+    ctrl.pan_right(1)
+    ctrl.pan_right(2)
+
+    ctrl.delete_camera(2)
+    assert db.pending() == [1]
+
+    db.discard()
+    db.flush()
+    assert inner.batches == []
+
+
+def test_updates_do_not_wait_for_a_slow_write(inner):
+    started = threading.Event()
+    release = threading.Event()
+    write = inner.update_cameras
+
+    def slow_update_cameras(cameras):
+        started.set()
+        release.wait(2)
+        write(cameras)
+
+    inner.update_cameras = slow_update_cameras
+    db = BufferedCameraDB(inner, idle_delay=0.01, max_delay=0.05)
+    ctrl = CameraController(camera_db=db)
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.pan_right(1)
+    assert started.wait(2)
+
+    begin = time.monotonic()
+    ctrl.pan_right(1)
+    assert time.monotonic() - begin < 0.5
+    assert db.pending() == [1]
+
+    release.set()
+    db.close()
+    assert inner.get_camera_by_id(1).pan_angle == 2
+
+
+def test_failed_write_is_retried(inner):
+    failures = [OSError("disk full")]
+    write = inner.update_cameras
+
+    def flaky_update_cameras(cameras):
+        if failures:
+            raise failures.pop()
+        write(cameras)
+
+    inner.update_cameras = flaky_update_cameras
+    db = BufferedCameraDB(inner, idle_delay=60, max_delay=120)
+    ctrl = CameraController(camera_db=db)
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    ctrl.pan_right(1)
+
+    with pytest.raises(OSError):
+        db.flush()
+    assert db.pending() == [1]
+
+    db.flush()
+    assert db.pending() == []
+    assert inner.batches == [[1]]
+
+
+def test_one_flusher_thread_for_many_updates(inner):
+    db = BufferedCameraDB(inner, idle_delay=60, max_delay=120)
+    ctrl = CameraController(camera_db=db)
+    ctrl.add_camera(camera_id=1, location=(0, 0))
+    before = threading.active_count()
+
+    for _ in range(20):
+        ctrl.pan_right(1)
+        ctrl.pan_left(1)
+
+    assert threading.active_count() <= before + 1
+    db.close()
+    assert db.pending() == []
@@ -0,0 +1,171 @@
+# tests/test_device_camera.py
+
+import pytest
+
+from device.device_camera import DeviceCamera
+
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def hw():
+    camera = DeviceCamera()
+    camera.set_id(1)
+    yield camera
+    camera.stop()
+
+
+def test_get_view_reuses_frame_until_input_changes(hw):
+    first = hw.get_view()
+
+    assert hw.get_view() is first
+
+
+def test_tick_invalidates_frame(hw):
+    first = hw.get_view()
+    version = hw.get_frame_version()
+
+    hw._tick()
+
+    assert hw.has_changed_since(version)
+    assert hw.get_view() is not first
+
+
+def test_pan_and_zoom_invalidate_frame(hw):
+    for move in (hw.pan_right, hw.pan_left, hw.zoom_in, hw.zoom_out):
+        frame = hw.get_view()
+        version = hw.get_frame_version()
+
+        assert move() is True
+        assert hw.has_changed_since(version)
+        assert hw.get_view() is not frame
+
+
+def test_clamped_moves_keep_frame(hw):
+    for _ in range(5):
+        hw.pan_right()
+    frame = hw.get_view()
+    version = hw.get_frame_version()
+
+    assert hw.pan_right() is False
+    assert not hw.has_changed_since(version)
+    assert hw.get_view() is frame
+
+
+def test_set_id_invalidates_frame(hw):
+    version = hw.get_frame_version()
+
+    hw.set_id(2)
+
+    assert hw.has_changed_since(version)
+
+
+def test_precompute_reuses_crops(hw):
+    hw.enable_precompute()
+
+    hw.get_view()
+    crop = hw._pyramid[(0, 2)]
+    hw._tick()
+    hw.get_view()
+
+    assert hw._pyramid[(0, 2)] is crop
+    assert len(hw._pyramid) == 1
+
+
+def test_precompute_does_not_change_view(hw):
+    plain = hw.get_view().copy()
+
+    hw.enable_precompute()
+    hw.pan_right()
+    hw.pan_left()
+
+    assert list(hw.get_view().getdata()) == list(plain.getdata())
+
+
+def test_precompute_in_background_builds_every_crop(hw):
+    hw.enable_precompute()
+    hw._build_pyramid(hw.imgSource)
+
+    assert len(hw._pyramid) == len(DeviceCamera.PAN_RANGE) * len(DeviceCamera.ZOOM_RANGE)
+
+
+def test_set_id_and_disable_drop_crops(hw):
+    hw.enable_precompute()
+    hw.get_view()
+
+    hw.set_id(2)
+    assert hw._pyramid == {}
+
+    hw.get_view()
+    hw.disable_precompute()
+    assert hw._pyramid == {}
+
+
+@pytest.mark.parametrize("quality", ["nearest", "bilinear", "lanczos", "reduce"])
+def test_sized_view_renders_at_requested_size(hw, quality):
+    view = hw.get_view(size=160, quality=quality)
+
+    assert view.size == (160, 160)
+    # Source is white, the scaled overlay stays in the top left corner
+    assert view.getpixel((159, 159)) == (255, 255, 255)
+    assert view.getpixel((1, 1)) != (255, 255, 255)
+
+
+def test_sized_view_overlay_is_scaled(hw):
+    full = hw.get_view()
+    small = hw.get_view(size=100, quality="bilinear")
+
+    def label_width(img, y):
+        row = [img.getpixel((x, y)) for x in range(img.width)]
+        return next(x for x, p in enumerate(row) if p == (255, 255, 255))
+
+    assert label_width(small, 1) < label_width(full, 6) / 3
+
+
+def test_overlay_tiles_shared_between_cameras(hw):
+    from device.device_camera import _overlay_tile
+
+    other = DeviceCamera()
+    other.set_id(2)
+    # Keep the clock from ticking between the two renders
+    hw.stop()
+    other.stop()
+    other.time = hw.time
+    _overlay_tile.cache_clear()
+    hw.get_view()
+    other.get_view()
+
+    # Same label text, so the second camera reuses the first one's tile
+    assert _overlay_tile.cache_info().hits == 1
+    assert _overlay_tile.cache_info().misses == 1
+
+
+def test_sized_view_cached_per_frame(hw):
+    first = hw.get_view(size=160, quality="reduce")
+
+    assert hw.get_view(size=160, quality="reduce") is first
+    assert hw.get_view(size=160, quality="nearest") is not first
+
+    hw._tick()
+    assert hw.get_view(size=160, quality="reduce") is not first
+
+
+def test_default_size_keeps_full_view(hw):
+    assert hw.get_view(size=DeviceCamera.RETURN_SIZE) is hw.get_view()
+
+
+def test_unknown_quality_raises(hw):
+    with pytest.raises(ValueError):
+        hw.get_view(size=160, quality="best")
+
+
+def test_cameras_share_decoded_source():
+    first = DeviceCamera()
+    first.set_id(1)
+    second = DeviceCamera()
+    second.set_id(1)
+
+    assert first.imgSource is second.imgSource
+    first.stop()
+    second.stop()
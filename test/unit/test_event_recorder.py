@@ -0,0 +1,160 @@
+import io
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.event_recorder import (
+    RECORDING_SIZE,
+    EventRecorder,
+    RecordedFrame,
+    SegmentFormatError,
+    SegmentReader,
+    write_segment,
+)
+from core.surveillance.frame_stream import Frame
+from storage.camera_storage_memory import CameraMemoryDB
+
+# Image.open is patched by patch_device_camera_image; recorded frames are
+# decoded with the real one
+decode = Image.open
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def ctrl():
+    ctrl = CameraController(camera_db=CameraMemoryDB())
+    for cid in (1, 2):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+        ctrl._cameras[cid].hardware_camera.stop()
+    yield ctrl
+    ctrl._streamer.close()
+
+
+@pytest.fixture
+def recorder(ctrl, tmp_path):
+    recorder = EventRecorder(ctrl, str(tmp_path / "recordings"), pre_seconds=1,
+                             post_seconds=0.2, fps=50, size=80, max_recordings=2)
+    recorder.start()
+    yield recorder
+    recorder.stop()
+
+
+def wait_until(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_segment_round_trip(tmp_path):
+    path = tmp_path / "a.shseg"
+    frames = [RecordedFrame(1, 10.0, b"one"), RecordedFrame(2, 11.5, b"second")]
+    with open(path, "wb") as f:
+        assert write_segment(f, frames) == 2
+
+    with SegmentReader(str(path)) as reader:
+        assert len(reader) == 2
+        assert reader.read(1) == frames[1]
+        assert list(reader) == frames
+
+
+def test_damaged_segment_is_rejected(tmp_path):
+    path = tmp_path / "a.shseg"
+    with open(path, "wb") as f:
+        write_segment(f, [RecordedFrame(1, 0.0, b"x")])
+    with open(path, "r+b") as f:
+        f.truncate(20)
+
+    with pytest.raises(SegmentFormatError):
+        SegmentReader(str(path))
+
+
+def test_trigger_records_before_and_after(recorder, ctrl):
+    assert wait_until(lambda: all(len(b) == 1 for b in recorder._buffers.values()))
+
+    recording = recorder.trigger("intrusion", camera_ids=[1])
+    assert recorder.trigger("again") is recording
+    ctrl.pan_right(1)
+    ctrl.pan_right(2)
+
+    assert recording.done.wait(2)
+    with SegmentReader(recording.path) as reader:
+        frames = list(reader)
+    assert [f.camera_id for f in frames] == [1, 1]
+    assert frames[0].timestamp < recording.started <= frames[1].timestamp
+    assert decode(io.BytesIO(frames[0].jpeg)).size == (80, 80)
+
+
+def test_recordings_are_capped(recorder):
+    for _ in range(3):
+        assert recorder.trigger().done.wait(2)
+        time.sleep(0.01)
+
+    paths = recorder.recordings()
+    assert len(paths) == 2
+
+
+def test_stop_ends_buffering(recorder, ctrl):
+    recorder.stop()
+
+    assert wait_until(lambda: ctrl._streamer.subscriber_count() == 0)
+
+
+def test_frames_are_encoded_off_the_streaming_thread(recorder, ctrl):
+    threads = []
+    image = ctrl.get_single_view(1, size=80)
+
+    class Spy:
+        def convert(self, mode):
+            threads.append(threading.current_thread().name)
+            return image.convert(mode)
+
+    recorder._on_frame(Frame(1, 99, Spy()))
+
+    assert wait_until(lambda: threads)
+    assert threads == ["event-encoder"]
+
+
+def test_default_size_is_reduced(ctrl, tmp_path):
+    recorder = EventRecorder(ctrl, str(tmp_path))
+    assert recorder.size == RECORDING_SIZE < ctrl._cameras[1].hardware_camera.RETURN_SIZE
+
+
+def test_failed_write_still_finishes_recording(ctrl, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    recorder = EventRecorder(ctrl, str(blocker / "recordings"), post_seconds=0.05)
+
+    recording = recorder.trigger("intrusion")
+
+    assert recording.done.wait(2)
+    assert recording.path is None
+    assert list(tmp_path.iterdir()) == [blocker]
+
+
+def test_queued_frames_are_part_of_the_recording(recorder, ctrl):
+    assert wait_until(lambda: all(len(b) == 1 for b in recorder._buffers.values()))
+    gate = threading.Event()
+    encode = recorder._encode
+
+    def slow_encode(frame, timestamp):
+        gate.wait(2)
+        encode(frame, timestamp)
+
+    recorder._encode = slow_encode
+    image = ctrl.get_single_view(1, size=80)
+    recording = recorder.trigger("intrusion", camera_ids=[1])
+    before = len(recording.frames)
+    for version in range(3):
+        recorder._on_frame(Frame(1, 100 + version, image))
+    # The post_seconds timer fires while the frames are still queued
+    time.sleep(0.3)
+    gate.set()
+
+    assert recording.done.wait(2)
+    with SegmentReader(recording.path) as reader:
+        assert len(reader) == before + 3
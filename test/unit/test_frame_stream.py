@@ -0,0 +1,153 @@
+import time
+
+import pytest
+
+from core.surveillance.camera_controller import CameraController
+from core.surveillance.camera_exceptions import CameraNotFoundError
+from storage.camera_storage_memory import CameraMemoryDB
+
+
+pytestmark = pytest.mark.usefixtures("patch_device_camera_image")
+
+
+@pytest.fixture
+def ctrl():
+    ctrl = CameraController(camera_db=CameraMemoryDB())
+    for cid in (1, 2):
+        ctrl.add_camera(camera_id=cid, location=(cid, cid))
+        # Only explicit changes produce new frames
+        ctrl._cameras[cid].hardware_camera.stop()
+    yield ctrl
+    ctrl._streamer.close()
+
+
+def wait_until(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stream_delivers_only_new_frames(ctrl):
+    with ctrl.subscribe(1, fps=50) as stream:
+        first = stream.get(timeout=2)
+        assert first.camera_id == 1
+        assert first.image.size == (500, 500)
+
+        assert stream.get(timeout=0.1) is None
+
+        ctrl.pan_right(1)
+        second = stream.get(timeout=2)
+        assert second.version != first.version
+
+
+def test_subscribers_share_one_render(ctrl):
+    a = ctrl.subscribe(1, fps=50, size=160)
+    b = ctrl.subscribe(1, fps=50, size=160)
+
+    frame_a = a.get(timeout=2)
+    frame_b = b.get(timeout=2)
+
+    assert frame_a.image.size == (160, 160)
+    assert frame_a.image is frame_b.image
+    a.close()
+    b.close()
+
+
+def test_slow_consumer_only_gets_newest_frame(ctrl):
+    stream = ctrl.subscribe(1, fps=100)
+    stream.get(timeout=2)
+
+    for _ in range(3):
+        ctrl.zoom_in(1)
+        time.sleep(0.05)
+
+    assert wait_until(lambda: stream.dropped > 0)
+    frame = stream.get(timeout=1)
+    assert frame.version == ctrl.get_frame_version(1)
+    stream.close()
+
+
+def test_callback_stream(ctrl):
+    frames = []
+    stream = ctrl.subscribe(2, fps=50, callback=frames.append)
+
+    assert wait_until(lambda: len(frames) == 1)
+    assert frames[0].camera_id == 2
+    stream.close()
+
+
+def test_no_rendering_without_subscribers(ctrl):
+    stream = ctrl.subscribe(1, fps=50)
+    assert ctrl._streamer.subscriber_count(1) == 1
+
+    stream.close()
+
+    assert ctrl._streamer.subscriber_count() == 0
+    assert wait_until(lambda: not ctrl._streamer.is_running())
+    assert list(stream) == []
+
+
+def test_deleted_camera_ends_stream(ctrl):
+    stream = ctrl.subscribe(2, fps=50)
+    stream.get(timeout=2)
+
+    ctrl.delete_camera(2)
+
+    assert wait_until(lambda: stream.closed)
+
+
+def test_subscribe_validates_arguments(ctrl):
+    with pytest.raises(CameraNotFoundError):
+        ctrl.subscribe(9)
+    with pytest.raises(ValueError):
+        ctrl.subscribe(1, fps=0)
+
+
+def test_streams_survive_render_pool_resize(ctrl):
+    stream = ctrl.subscribe(1, fps=50)
+    stream.get(timeout=2)
+
+    ctrl.set_render_workers(2)
+    ctrl.pan_right(1)
+
+    assert not stream.closed
+    assert ctrl._streamer.subscriber_count(1) == 1
+    assert stream.get(timeout=2) is not None
+    stream.close()
+
+
+def test_render_error_does_not_stop_streaming(ctrl):
+    broken = ctrl._cameras[1]
+
+    def display_view(*args, **kwargs):
+        raise OSError("source unreadable")
+
+    broken.display_view = display_view
+    failing = ctrl.subscribe(1, fps=50)
+    working = ctrl.subscribe(2, fps=50)
+
+    assert working.get(timeout=2).camera_id == 2
+    assert failing.get(timeout=0.1) is None
+    assert ctrl._streamer.is_running()
+
+    failing.close()
+    working.close()
+    assert wait_until(lambda: not ctrl._streamer.is_running())
+    with ctrl.subscribe(2, fps=50) as stream:
+        assert stream.get(timeout=2) is not None
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_streamer_thread_restarts_after_crash(ctrl):
+    def crash(key, streams):
+        raise RuntimeError("bug")
+
+    ctrl._streamer._render = crash
+    stream = ctrl.subscribe(1, fps=50)
+    assert wait_until(lambda: not ctrl._streamer.is_running())
+    stream.close()
+
+    del ctrl._streamer._render
+    with ctrl.subscribe(1, fps=50) as stream:
+        assert stream.get(timeout=2) is not None
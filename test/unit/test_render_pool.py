@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from core.surveillance.render_pool import CameraRenderPool
+
+
+def image(color="white"):
+    return Image.new("RGB", (10, 10), color)
+
+
+@pytest.fixture
+def pool():
+    pool = CameraRenderPool(max_workers=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_render_all_returns_every_image(pool):
+    batch = pool.render_all({cid: (lambda cid=cid: image((cid, 0, 0))) for cid in range(10)})
+
+    assert batch.complete
+    assert sorted(batch.images) == list(range(10))
+    assert batch.images[3].getpixel((0, 0)) == (3, 0, 0)
+
+
+def test_renders_run_concurrently_within_bound(pool):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def render():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return image()
+
+    batch = pool.render_all({cid: render for cid in range(12)})
+
+    assert len(batch.images) == 12
+    assert 1 < peak <= 4
+
+
+def test_errors_are_collected(pool):
+    def fail():
+        raise RuntimeError("broken")
+
+    batch = pool.render_all({1: image, 2: fail})
+
+    assert set(batch.images) == {1}
+    assert isinstance(batch.errors[2], RuntimeError)
+    assert not batch.complete
+
+
+def test_per_camera_deadlines(pool):
+    release = threading.Event()
+
+    def slow():
+        release.wait(1)
+        return image()
+
+    batch = pool.render_all({1: image, 2: slow}, timeout={1: 1.0, 2: 0.05})
+    release.set()
+
+    assert set(batch.images) == {1}
+    assert batch.timed_out == [2]
+
+
+def test_submit_returns_future(pool):
+    assert pool.submit(image).result().size == (10, 10)
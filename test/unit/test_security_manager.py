@@ -188,6 +188,44 @@ def test_arm_order():
     assert manager.alarm.get()
 
 
+def test_intrusion_listeners():
+    manager = SecurityManager(SecurityMemoryDatabase(), LogManager(LogMemoryDB()))
+    sensors = [s for s, _ in manager.sensors.items()]
+    events = []
+    manager.add_intrusion_listener(events.append)
+
+    manager.update()
+    assert events == []
+
+    manager.arm(sensors[0])
+    sensors[0].intrude()
+    manager.update()
+    assert events == [[sensors[0]]]
+
+    manager.remove_intrusion_listener(events.append)
+    manager.update()
+    assert len(events) == 1
+
+
+def test_failing_intrusion_listener_does_not_stop_update():
+    manager = SecurityManager(SecurityMemoryDatabase(), LogManager(LogMemoryDB()))
+    sensors = [s for s, _ in manager.sensors.items()]
+    events = []
+
+    def broken(detected):
+        raise OSError("recording directory unavailable")
+
+    manager.add_intrusion_listener(broken)
+    manager.add_intrusion_listener(events.append)
+    manager.arm(sensors[0])
+    sensors[0].intrude()
+
+    result, armed_detected = manager.update()
+
+    assert armed_detected == [sensors[0]]
+    assert events == [[sensors[0]]]
+
+
 # test_area.py
 
 
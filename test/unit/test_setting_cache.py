@@ -0,0 +1,122 @@
+from core.setting.setting_cache import SystemSettingsCache, ControlPanelSettingsCache
+from core.setting.system_setting import SystemSettings
+from storage.storage_sqlite import StorageManager
+from storage.system_setting_storage_memory import SystemSettingsMemoryDB
+from storage.control_panel_setting_storage_memory import ControlPanelSettingsMemoryDB
+from storage.control_panel_setting_storage_sqlite import ControlPanelSettingsSqliteDB
+
+
+class CountingSettingsDB(SystemSettingsMemoryDB):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    def update_system_settings(self, settings):
+        self.writes += 1
+        super().update_system_settings(settings)
+
+    def get_system_settings(self):
+        self.reads += 1
+        return super().get_system_settings()
+
+
+class CountingControlPanelDB(ControlPanelSettingsMemoryDB):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_master_password(self):
+        self.reads += 1
+        return super().get_master_password()
+
+    def get_guest_password(self):
+        self.reads += 1
+        return super().get_guest_password()
+
+
+def test_system_settings_read_once():
+    db = CountingSettingsDB()
+    cache = SystemSettingsCache(db)
+
+    for _ in range(5):
+        assert cache.get_system_settings().panic_phone_number == "112"
+
+    assert db.reads == 1
+
+
+def test_system_settings_write_through():
+    db = CountingSettingsDB()
+    cache = SystemSettingsCache(db)
+    cache.get_system_settings()
+
+    settings = SystemSettings()
+    settings.panic_phone_number = "119"
+    cache.update_system_settings(settings)
+
+    assert db.writes == 1
+    assert db.settings.panic_phone_number == "119"
+    assert cache.get_system_settings().panic_phone_number == "119"
+    assert db.reads == 1
+
+
+def test_system_settings_returns_copies():
+    cache = SystemSettingsCache(CountingSettingsDB())
+
+    settings = cache.get_system_settings()
+    settings.panic_phone_number = "000"
+
+    assert cache.get_system_settings().panic_phone_number == "112"
+
+
+def test_system_settings_invalidate():
+    db = CountingSettingsDB()
+    cache = SystemSettingsCache(db)
+    cache.get_system_settings()
+
+    cache.invalidate()
+    cache.get_system_settings()
+
+    assert db.reads == 2
+
+
+def test_control_panel_passwords_read_once():
+    db = CountingControlPanelDB()
+    cache = ControlPanelSettingsCache(db)
+
+    for _ in range(3):
+        assert cache.get_master_password() == "1234"
+        assert cache.get_guest_password() == ""
+
+    assert db.reads == 2
+
+
+def test_control_panel_passwords_write_through():
+    db = CountingControlPanelDB()
+    cache = ControlPanelSettingsCache(db)
+    cache.get_master_password()
+
+    cache.set_master_password("4321")
+    cache.set_guest_password("1111")
+
+    assert db.master_password == "4321"
+    assert db.guest_password == "1111"
+    assert cache.get_master_password() == "4321"
+    assert cache.get_guest_password() == "1111"
+    assert db.reads == 1
+
+
+def test_control_panel_cache_over_sqlite():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+
+    cache = ControlPanelSettingsCache(ControlPanelSettingsSqliteDB(storage_manager))
+    cache.set_master_password("9999")
+
+    assert cache.get_master_password() == "9999"
+    assert ControlPanelSettingsSqliteDB(storage_manager).get_master_password() == "9999"
+
+    storage_manager.reset()
+    cache.invalidate()
+
+    assert cache.get_master_password() == "1234"
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+from PIL import Image
+
+from device.source_cache import SourceImageCache, draft_scale, image_bytes
+
+
+@pytest.fixture
+def jpeg(tmp_path):
+    path = str(tmp_path / "camera.jpg")
+    Image.new("RGB", (400, 300), "red").save(path)
+    return path
+
+
+def test_load_decodes_once(jpeg, monkeypatch):
+    cache = SourceImageCache()
+    first = cache.load(jpeg)
+
+    def fail(path):
+        raise AssertionError("file opened again")
+
+    monkeypatch.setattr(Image, "open", fail)
+
+    assert cache.load(jpeg) is first
+    assert first.size == (400, 300)
+    assert cache.stats()["hits"] == 1
+
+
+def test_changed_file_is_decoded_again(jpeg):
+    cache = SourceImageCache()
+    first = cache.load(jpeg)
+
+    Image.new("RGB", (200, 100), "blue").save(jpeg)
+    os.utime(jpeg, ns=(0, os.stat(jpeg).st_mtime_ns + 10 ** 9))
+
+    assert cache.load(jpeg).size == (200, 100)
+    assert cache.load(jpeg) is not first
+
+
+def test_draft_decodes_jpeg_smaller(jpeg):
+    cache = SourceImageCache()
+
+    draft = cache.load(jpeg, scale=2)
+
+    assert draft.size == (200, 150)
+    assert cache.load(jpeg).size == (400, 300)
+    assert cache.stats()["entries"] == 2
+
+
+def test_byte_budget_evicts_oldest(tmp_path):
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"camera{i}.jpg")
+        Image.new("RGB", (100, 100)).save(path)
+        paths.append(path)
+    cache = SourceImageCache(max_bytes=2 * 100 * 100 * 3)
+
+    images = [cache.load(p) for p in paths]
+
+    assert cache.stats()["entries"] == 2
+    assert cache.total_bytes == sum(image_bytes(i) for i in images[1:])
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SourceImageCache().load(str(tmp_path / "missing.jpg"))
+
+
+def test_draft_scale():
+    assert draft_scale(360, 160) == 2
+    assert draft_scale(320, 40) == 8
+    assert draft_scale(300, 160) == 1
+
+
+def test_small_camera_views_use_draft_source():
+    from device.device_camera import DeviceCamera
+    from device.source_cache import get_source_cache
+
+    camera = DeviceCamera()
+    camera.set_id(1)
+    full = camera.get_view()
+    small = camera.get_view(size=40, quality="bilinear")
+    camera.stop()
+
+    assert full.size == (500, 500)
+    assert small.size == (40, 40)
+    assert get_source_cache().stats()["entries"] == 2
@@ -0,0 +1,56 @@
+from bench import storage_bench
+from bench.common import compare_results, load_results, percentile
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_storage_bench_runs_every_backend(tmp_path):
+    output = tmp_path / "storage.json"
+
+    assert storage_bench.main(["--sizes", "5", "--output", str(output)]) == 0
+
+    saved = load_results(str(output))
+    seen = {(r["interface"], r["backend"]) for r in saved["results"]}
+    for name, target in storage_bench.TARGETS.items():
+        for backend in target.backends:
+            assert (name, backend) in seen
+
+    assert all(r["ops"] > 0 for r in saved["results"])
+
+
+def test_compare_results_reports_regressions():
+    baseline = {"results": [{"phase": "scan", "p50_ms": 1.0}, {"phase": "load", "p50_ms": 1.0}]}
+    current = [{"phase": "scan", "p50_ms": 1.1}, {"phase": "load", "p50_ms": 2.0}]
+
+    regressions = compare_results(baseline, current, ("phase",))
+
+    assert [r["phase"] for r in regressions] == ["load"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_compare_results_for_higher_is_better_metrics():
+    baseline = {"results": [{"phase": "scan", "ops_per_s": 100.0}, {"phase": "load", "ops_per_s": 100.0}]}
+    current = [{"phase": "scan", "ops_per_s": 200.0}, {"phase": "load", "ops_per_s": 50.0}]
+
+    regressions = compare_results(baseline, current, ("phase",), metric="ops_per_s")
+
+    assert [r["phase"] for r in regressions] == ["load"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_quiet_cameras_silences_missing_sources(capsys):
+    import device.device_camera as device_camera_module
+
+    camera = device_camera_module.DeviceCamera()
+    with storage_bench._quiet_cameras():
+        camera.set_id(999)
+    camera.close()
+
+    assert capsys.readouterr().out == ""
+    assert device_camera_module._file_error_handler is device_camera_module.show_file_error
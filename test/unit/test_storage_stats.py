@@ -0,0 +1,100 @@
+from storage.storage_sqlite import StorageManager
+from storage.storage_stats import StorageStats, normalize_statement
+from storage.camera_storage_sqlite import CameraSqliteDB
+from storage.log_storage_sqlite import LogSqliteDB
+from core.log.log import Log
+
+from datetime import datetime
+
+
+def test_normalize_statement():
+    query = """
+    SELECT *
+    FROM sensors
+    WHERE sensor_id = 3 AND name = 'x y'
+    """
+
+    assert normalize_statement(query) == "SELECT * FROM sensors WHERE sensor_id = ? AND name = ?"
+
+
+def test_stats_keyed_by_statement_and_backend():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+    storage_manager.reset_stats()
+
+    camera_db = CameraSqliteDB(storage_manager)
+    camera_db.get_all_cameras()
+    camera_db.get_all_cameras()
+    camera_db.get_camera_by_id(1)
+
+    stats = storage_manager.dump_stats()
+
+    assert stats["backends"]["CameraSqliteDB"]["calls"] == 3
+    assert stats["statements"]["SELECT * FROM cameras"]["calls"] == 2
+    assert stats["statements"]["SELECT * FROM cameras"]["rows"] == 6
+    assert stats["statements"]["SELECT * FROM cameras WHERE camera_id=?"]["rows"] == 1
+    assert sum(stats["backends"]["CameraSqliteDB"]["histogram"].values()) == 3
+
+
+def test_stats_for_insert():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+    storage_manager.reset_stats()
+
+    log = Log()
+    log.date_time = datetime.now()
+    log.description = "test"
+    LogSqliteDB(storage_manager).save_log(log)
+
+    stats = storage_manager.dump_stats()
+
+    assert stats["backends"]["LogSqliteDB"]["calls"] == 1
+    assert stats["backends"]["LogSqliteDB"]["rows"] == 1
+
+
+def test_stats_for_transaction_and_script():
+    storage_manager = StorageManager("src/init.sql", "safehome.db")
+    storage_manager.reset()
+    storage_manager.reset_stats()
+
+    camera_db = CameraSqliteDB(storage_manager)
+    camera_db.update_cameras(camera_db.get_all_cameras())
+    storage_manager.execute_script("CREATE TABLE IF NOT EXISTS stats_test (id INTEGER);")
+
+    stats = storage_manager.dump_stats()
+    update = stats["statements"][normalize_statement(CameraSqliteDB.UPDATE_QUERY)]
+
+    assert update["calls"] == 1
+    assert update["rows"] == 3
+    assert stats["statements"]["BEGIN"]["calls"] == 1
+    assert stats["statements"]["COMMIT"]["calls"] == 1
+    assert stats["statements"]["CREATE TABLE IF NOT EXISTS stats_test (id INTEGER);"]["calls"] == 1
+    assert stats["backends"]["CameraSqliteDB"]["calls"] == 4
+
+
+def test_slow_query_log_and_reset():
+    stats = StorageStats(slow_query_threshold=0.01, slow_query_log_size=2)
+
+    stats.record("SELECT 1", (), "A", 0.001, 1)
+    stats.record("SELECT 2", (), "A", 0.02, 1)
+    stats.record("SELECT 3", (), "B", 0.03, 1)
+    stats.record("SELECT 4", (), "B", 0.04, 1)
+
+    dump = stats.dump()
+    assert [q["elapsed_ms"] for q in dump["slow_queries"]] == [30.0, 40.0]
+    assert dump["statements"]["SELECT ?"]["calls"] == 4
+    assert dump["backends"]["B"]["max_ms"] == 40.0
+
+    stats.reset()
+    dump = stats.dump()
+    assert dump["statements"] == {}
+    assert dump["slow_queries"] == []
+
+
+def test_disabled_stats_record_nothing():
+    stats = StorageStats()
+    stats.enabled = False
+
+    stats.record("SELECT 1", (), "A", 1.0, 1)
+
+    assert stats.dump()["statements"] == {}
@@ -0,0 +1,17 @@
+from core.system import System
+from storage.storage_sqlite import StorageManager
+from storage.camera_storage_sqlite import CameraSqliteDB
+
+
+def test_shutdown_writes_buffered_camera_changes():
+    StorageManager("src/init.sql", "safehome.db").reset()
+    system = System(True)
+    pan_angle = system.camera_db.get_camera_by_id(1).pan_angle
+    assert system.current_camera_controller.pan_right(1)
+    assert system.camera_db.pending() == [1]
+
+    # Without turn_off, as when the window is closed
+    system.shutdown()
+
+    camera_db = CameraSqliteDB(StorageManager("src/init.sql", "safehome.db"))
+    assert camera_db.get_camera_by_id(1).pan_angle == pan_angle + 1
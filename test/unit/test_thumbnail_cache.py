@@ -0,0 +1,78 @@
+from PIL import Image
+
+from core.surveillance.thumbnail_cache import (
+    ThumbnailCache,
+    disabled_placeholder,
+    image_bytes,
+    locked_placeholder,
+)
+
+
+def thumb(color="white"):
+    return Image.new("RGB", (160, 160), color)
+
+
+def test_placeholders_are_built_once():
+    assert locked_placeholder() is locked_placeholder()
+    assert disabled_placeholder() is disabled_placeholder()
+    assert locked_placeholder() is not disabled_placeholder()
+    assert locked_placeholder().size == (160, 160)
+
+
+def test_get_matches_frame_version():
+    cache = ThumbnailCache()
+    image = thumb()
+    cache.put(1, 7, image)
+
+    assert cache.get(1, 7) is image
+    assert cache.get(1, 8) is None
+    assert cache.get(2, 7) is None
+
+
+def test_put_replaces_entry_and_tracks_bytes():
+    cache = ThumbnailCache()
+    cache.put(1, 1, thumb())
+    cache.put(1, 2, thumb("red"))
+
+    assert len(cache) == 1
+    assert cache.total_bytes == image_bytes(thumb())
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = ThumbnailCache(max_bytes=2 * image_bytes(thumb()))
+    cache.put(1, 0, thumb())
+    cache.put(2, 0, thumb())
+    cache.get(1, 0)
+    cache.put(3, 0, thumb())
+
+    assert cache.get(1, 0) is not None
+    assert cache.get(2, 0) is None
+    assert cache.get(3, 0) is not None
+
+    cache.set_max_bytes(image_bytes(thumb()))
+    assert len(cache) == 1
+    assert cache.get(3, 0) is not None
+
+
+def test_invalidate():
+    cache = ThumbnailCache()
+    cache.put(1, 0, thumb())
+    cache.put(2, 0, thumb())
+
+    cache.invalidate(1)
+    assert cache.get(1, 0) is None
+    assert cache.get(2, 0) is not None
+
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_peek_returns_outdated_entry():
+    cache = ThumbnailCache()
+    image = thumb()
+    cache.put(1, 7, image)
+
+    assert cache.peek(1) == (7, image)
+    assert cache.get(1, 8) is None
+    assert cache.peek(2) is None
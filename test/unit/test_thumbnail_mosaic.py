@@ -0,0 +1,84 @@
+import pytest
+from PIL import Image
+
+from core.surveillance.thumbnail_mosaic import ThumbnailMosaic
+
+
+def thumb(color="white", size=160):
+    return Image.new("RGB", (size, size), color)
+
+
+def test_layout_wraps_after_columns():
+    mosaic = ThumbnailMosaic(columns=2)
+    mosaic.update({cid: thumb() for cid in (1, 2, 3)})
+
+    assert mosaic.image.size == (2 * mosaic.cell_width, 2 * mosaic.cell_height)
+    assert mosaic.tiles[3][0] == mosaic.tiles[1][0]
+    assert mosaic.tiles[3][1] == mosaic.tiles[1][1] + mosaic.cell_height
+    assert mosaic.image.getpixel(mosaic.tiles[2][:2]) == (255, 255, 255)
+
+
+def test_only_changed_tiles_are_redrawn():
+    mosaic = ThumbnailMosaic()
+    images = {1: thumb("red"), 2: thumb("blue"), 3: thumb("green")}
+    mosaic.update(images)
+    buffer = mosaic.image
+    version = mosaic.version
+
+    assert mosaic.update(dict(images)) == []
+    assert mosaic.version == version
+
+    images[2] = thumb("yellow")
+    assert mosaic.update(images) == [mosaic.tiles[2]]
+    assert mosaic.image is buffer
+    assert mosaic.image.getpixel(mosaic.tiles[2][:2]) == (255, 255, 0)
+    assert mosaic.image.getpixel(mosaic.tiles[1][:2]) == (255, 0, 0)
+
+
+def test_reordered_cameras_redraw_their_cells():
+    mosaic = ThumbnailMosaic()
+    red, blue = thumb("red"), thumb("blue")
+    mosaic.update({1: red, 2: blue})
+    first_box = mosaic.tiles[1]
+
+    mosaic.update({2: blue, 1: red})
+
+    assert mosaic.tiles[2] == first_box
+    assert mosaic.image.getpixel(first_box[:2]) == (0, 0, 255)
+
+
+def test_removed_camera_cell_is_cleared():
+    mosaic = ThumbnailMosaic()
+    mosaic.update({1: thumb("red"), 2: thumb("blue")})
+    box = mosaic.tiles[2]
+
+    mosaic.update({1: thumb("red")})
+
+    assert 2 not in mosaic.tiles
+    assert mosaic.image.getpixel(box[:2]) != (0, 0, 255)
+
+
+def test_large_and_small_images_are_centered_in_tile():
+    mosaic = ThumbnailMosaic(tile_size=100)
+    mosaic.update({1: thumb("red", 1000), 2: thumb("blue", 50)})
+
+    left, top, right, bottom = mosaic.tiles[1]
+    assert mosaic.image.getpixel((right - 1, bottom - 1)) == (255, 0, 0)
+    left, top, _, _ = mosaic.tiles[2]
+    assert mosaic.image.getpixel((left, top)) != (0, 0, 255)
+    assert mosaic.image.getpixel((left + 50, top + 50)) == (0, 0, 255)
+
+
+def test_camera_at_maps_points_to_cameras():
+    mosaic = ThumbnailMosaic(columns=2)
+    mosaic.update({5: thumb(), 7: thumb(), 9: thumb()})
+
+    assert mosaic.camera_at(*mosaic.tiles[7][:2]) == 7
+    assert mosaic.camera_at(*mosaic.tiles[9][:2]) == 9
+    assert mosaic.camera_at(mosaic.cell_width + 1, mosaic.cell_height + 1) is None
+    assert mosaic.camera_at(-1, 0) is None
+
+
+def test_columns_must_be_positive():
+    with pytest.raises(ValueError):
+        ThumbnailMosaic(columns=0)
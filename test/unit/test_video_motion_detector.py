@@ -0,0 +1,173 @@
+import pytest
+from PIL import Image, ImageDraw
+
+pytest.importorskip("numpy")
+
+from core.log.log_manager import LogManager
+from core.security.security_manager import SecurityManager
+from core.security.security_memory_database import SecurityMemoryDatabase
+import device.device_video_motion_detector as video_motion_module
+from device.device_sensor_tester import DeviceSensorTester
+from device.device_video_motion_detector import DeviceVideoMotionDetector, analyze
+from storage.log_storage_memory import LogMemoryDB
+
+
+class FakeCamera:
+    def __init__(self):
+        self.pan = 0
+        self.zoom = 2
+        self.version = 0
+        self.image = Image.new("RGB", (160, 160), "gray")
+        self.requests = []
+
+    def show(self, image):
+        self.image = image
+        self.version += 1
+
+    def get_frame_version(self):
+        return self.version
+
+    def get_view(self, size=None, quality=None):
+        self.requests.append((size, quality))
+        return self.image
+
+
+def with_box(box, color="white"):
+    image = Image.new("RGB", (160, 160), "gray")
+    ImageDraw.Draw(image).rectangle(box, fill=color)
+    return image
+
+
+@pytest.fixture
+def camera():
+    return FakeCamera()
+
+
+@pytest.fixture
+def detector(camera):
+    detector = DeviceVideoMotionDetector(camera, (10, 10), fps=1e9)
+    detector.arm()
+    return detector
+
+
+def test_detects_motion(detector, camera):
+    assert not detector.read()
+
+    camera.show(with_box((40, 40, 120, 120)))
+    assert detector.read()
+
+    detector.release()
+    assert not detector.read()
+
+
+def test_reuses_thumbnail_view(detector, camera):
+    detector.read()
+
+    assert camera.requests == [(160, "bilinear")]
+
+    # Unchanged frame version: nothing is rendered or analyzed
+    detector.read()
+    assert len(camera.requests) == 1
+
+
+def test_small_changes_and_overlay_are_ignored(detector, camera):
+    detector.read()
+
+    camera.show(with_box((0, 0, 60, 6)))
+    assert not detector.read()
+
+    camera.show(with_box((100, 100, 102, 102)))
+    assert not detector.read()
+
+
+def test_region_mask(detector, camera):
+    detector.set_mask(regions=[(0.0, 0.5, 1.0, 1.0)])
+    detector.read()
+
+    camera.show(with_box((20, 20, 140, 70)))
+    assert not detector.read()
+
+    camera.show(with_box((20, 90, 140, 150)))
+    assert detector.read()
+
+
+def test_pan_resets_background(detector, camera):
+    detector.read()
+
+    camera.pan = 1
+    camera.show(with_box((40, 40, 120, 120)))
+    assert not detector.read()
+
+
+def test_disarmed_sensor_does_not_analyze(detector, camera):
+    detector.disarm()
+    camera.show(with_box((40, 40, 120, 120)))
+
+    assert not detector.read()
+    assert camera.requests == []
+
+
+def test_analyze_many_detectors_at_once():
+    cameras = [FakeCamera() for _ in range(3)]
+    detectors = [DeviceVideoMotionDetector(c, (0, 0)) for c in cameras]
+    analyze(detectors)
+
+    cameras[1].show(with_box((40, 40, 120, 120)))
+    cameras[2].show(with_box((40, 40, 120, 120), "gray"))
+    analyze(detectors)
+
+    assert [d.detected for d in detectors] == [False, True, False]
+
+
+def test_plugs_into_security_manager(detector, camera):
+    manager = SecurityManager(SecurityMemoryDatabase(), LogManager(LogMemoryDB()))
+    manager.add_sensor(detector, arm=True)
+    manager.update()
+
+    camera.show(with_box((40, 40, 120, 120)))
+    _, armed_detected = manager.update(True)
+
+    assert armed_detected == [detector]
+    assert not detector.detected
+
+
+def test_security_manager_polls_detectors_in_one_batch(monkeypatch):
+    cameras = [FakeCamera() for _ in range(3)]
+    detectors = [DeviceVideoMotionDetector(c, (0, 0)) for c in cameras]
+    manager = SecurityManager(SecurityMemoryDatabase(), LogManager(LogMemoryDB()))
+    for detector in detectors:
+        manager.add_sensor(detector, arm=True)
+    manager.update()
+    batches = []
+
+    def record_batch(batch):
+        batches.append(list(batch))
+        analyze(batch)
+
+    monkeypatch.setattr(video_motion_module, "analyze", record_batch)
+    cameras[1].show(with_box((40, 40, 120, 120)))
+    for detector in detectors:
+        # Due again, without waiting for the 2 fps interval
+        detector._last_analysis = float("-inf")
+    _, armed_detected = manager.update()
+
+    assert batches == [detectors]
+    assert armed_detected == [detectors[1]]
+
+
+def test_ids_follow_sensor_tester_sequence(camera):
+    detector = DeviceVideoMotionDetector(camera, (0, 0))
+
+    assert detector.get_id() == DeviceSensorTester.newIdSequence_VideoMotionDetector
+    assert DeviceVideoMotionDetector(camera, (0, 0)).get_id() == detector.get_id() + 1
+
+
+def test_analysis_fps_limits_reads(camera):
+    detector = DeviceVideoMotionDetector(camera, (0, 0), fps=0.001)
+    detector.arm()
+    detector.read()
+
+    camera.show(with_box((40, 40, 120, 120)))
+
+    assert not detector.read()
+    assert len(camera.requests) == 1